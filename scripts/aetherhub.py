@@ -1,4 +1,3 @@
-import cloudscraper
 from bs4 import BeautifulSoup
 import re
 import time
@@ -9,6 +8,8 @@ import argparse
 from datetime import datetime, timedelta
 import math
 
+from standings import calculate_standings
+
 # --- CONFIGURATION ---
 TOTAL_ROUNDS = 4 
 
@@ -22,14 +23,21 @@ DATA_DIR = os.path.join(WEBAPP_DIR, "public", "data")
 RAW_DIR = os.path.join(DATA_DIR, "raw")
 DB_PATH = os.path.join(DATA_DIR, "db.json")
 
-# Setup Scraper
-scraper = cloudscraper.create_scraper(
-    browser={
-        'browser': 'chrome',
-        'platform': 'windows',
-        'desktop': True
-    }
-)
+# Setup Scraper (created on first request, so importing this module stays cheap)
+_scraper = None
+
+def get_scraper():
+    global _scraper
+    if _scraper is None:
+        import cloudscraper
+        _scraper = cloudscraper.create_scraper(
+            browser={
+                'browser': 'chrome',
+                'platform': 'windows',
+                'desktop': True
+            }
+        )
+    return _scraper
 
 def clean_filename(name):
     return "".join([c for c in name if c.isalpha() or c.isdigit() or c in " ._-"]).strip()
@@ -41,11 +49,11 @@ def clean_name(name_str):
 
 def get_soup(url):
     try:
-        response = scraper.get(url)
+        response = get_scraper().get(url)
         if "Just a moment" in response.text:
             print("  !! Cloudflare Challenge Detected. Waiting 5s...")
             time.sleep(5)
-            response = scraper.get(url) 
+            response = get_scraper().get(url)
         
         if response.status_code == 200:
             return BeautifulSoup(response.text, 'html.parser')
@@ -140,118 +148,10 @@ def scrape_round(tourney_id, round_num):
             
     return matches
 
-class PlayerStats:
-    def __init__(self, name):
-        self.name = name
-        self.match_points = 0
-        self.matches_played = 0
-        self.game_points = 0
-        self.games_played = 0
-        self.opponents = [] 
-        self.m_wins = 0
-        self.m_losses = 0
-        self.m_draws = 0
-        
-    def add_match(self, points, opp_name, g_wins, g_losses, g_draws):
-        self.match_points += points
-        self.matches_played += 1
-        
-        if points == 3: self.m_wins += 1
-        elif points == 1: self.m_draws += 1
-        else: self.m_losses += 1
-        
-        self.game_points += (g_wins * 3) + (g_draws * 1)
-        self.games_played += (g_wins + g_losses + g_draws)
-        
-        if opp_name != "BYE":
-            self.opponents.append(opp_name)
-            
-    @property
-    def mw_pct(self):
-        if self.matches_played == 0: return 0.33
-        pct = self.match_points / (self.matches_played * 3.0)
-        return max(pct, 0.33)
-        
-    @property
-    def gw_pct(self):
-        if self.games_played == 0: return 0.33
-        pct = self.game_points / (self.games_played * 3.0)
-        return max(pct, 0.33)
-
-def calculate_standings(all_matches):
-    players = {}
-    
-    # 1. First Pass: Aggregate Stats
-    for r_matches in all_matches.values():
-        for m in r_matches:
-            p1 = m["p1"]
-            p2 = m["p2"]
-            
-            if p1 not in players: players[p1] = PlayerStats(p1)
-            if p2 != "BYE" and p2 not in players: players[p2] = PlayerStats(p2)
-            
-            p1_pts = 0
-            if m["p1_wins"] > m["p2_wins"]: p1_pts = 3
-            elif m["p2_wins"] > m["p1_wins"]: p1_pts = 0
-            else: p1_pts = 1
-            
-            players[p1].add_match(p1_pts, p2, m["p1_wins"], m["p2_wins"], m["draws"])
-            
-            if p2 != "BYE":
-                p2_pts = 0
-                if m["p2_wins"] > m["p1_wins"]: p2_pts = 3
-                elif m["p1_wins"] > m["p2_wins"]: p2_pts = 0
-                else: p2_pts = 1
-                
-                players[p2].add_match(p2_pts, p1, m["p2_wins"], m["p1_wins"], m["draws"])
-
-    final_standings = []
-    
-    for name, s in players.items():
-        opp_mw_sum = 0
-        opp_gw_sum = 0
-        valid_opps = 0
-        
-        for opp in s.opponents:
-            if opp in players:
-                opp_mw_sum += players[opp].mw_pct
-                opp_gw_sum += players[opp].gw_pct
-                valid_opps += 1
-                
-        omw = opp_mw_sum / valid_opps if valid_opps > 0 else 0.33
-        ogw = opp_gw_sum / valid_opps if valid_opps > 0 else 0.33
-        
-        s.omw = omw
-        s.ogw = ogw
-            
-        final_standings.append(s)
-
-    final_standings.sort(key=lambda x: (x.match_points, x.omw, x.gw_pct, x.ogw), reverse=True)
-    
-    results = []
-    for i, s in enumerate(final_standings):
-        results.append({
-            "rank": i + 1,
-            "name": s.name,
-            "deck": "", # Default empty
-            "points": s.match_points,
-            "record": f"{s.m_wins}-{s.m_losses}-{s.m_draws}",
-            "wins": s.m_wins,
-            "losses": s.m_losses,
-            "draws": s.m_draws,
-            "omw": s.omw, # No * 100
-            "gw": s.gw_pct,
-            "ogw": s.ogw,
-            "mw": s.mw_pct,
-            "payout": 0
-        })
-        
-    return results
-
 def get_user_tournaments(user_url):
     print(f"Scanning user profile: {user_url}...")
     try:
-        response = scraper.get(user_url)
+        response = get_scraper().get(user_url)
         if response.status_code != 200: return []
         soup = BeautifulSoup(response.text, 'html.parser')
         links = soup.find_all('a', href=re.compile(r'/Tourney/RoundTourney/\d+'))
@@ -291,48 +191,40 @@ def get_next_week_number():
             
     return next_week
 
-def main():
-    parser = argparse.ArgumentParser(description='Aetherhub Scraper')
-    parser.add_argument('target', nargs='?', help='Username, ID, or URL')
-    parser.add_argument('week', nargs='?', help='Week Number (Optional)')
-    args = parser.parse_args()
-    
-    print("\n=== Aetherhub to MTG League Import ===")
-
-    # Target
-    target = args.target
-    if not target:
-        target = input("Enter Username, Tournament ID or URL: ").strip()
-        
-    t_id = None
+def resolve_tournament_id(target):
+    """Tournament ID for a username, tournament ID or URL (the user's newest tournament), or None."""
     if target.isdigit():
-        t_id = target
-    elif "RoundTourney" in target:
+        return target
+    if "RoundTourney" in target:
         match = re.search(r"RoundTourney/(\d+)", target)
-        if match: t_id = match.group(1)
-    else:
-        user_url = target
-        if "aetherhub.com" not in target:
-            user_url = f"https://aetherhub.com/User/{target}"
-        recent_ids = get_user_tournaments(user_url)
-        if not recent_ids:
-            print("No tournaments found.")
-            return
-        t_id = recent_ids[0]
-        print(f"Auto-selecting newest tournament ID: {t_id}")
+        return match.group(1) if match else None
+
+    user_url = target
+    if "aetherhub.com" not in target:
+        user_url = f"https://aetherhub.com/User/{target}"
+    recent_ids = get_user_tournaments(user_url)
+    if not recent_ids:
+        return None
+    print(f"Auto-selecting newest tournament ID: {recent_ids[0]}")
+    return recent_ids[0]
 
+def scrape(target, week=None):
+    """
+    Scrape one tournament into week-<week>.json. *target* is a username (their
+    newest tournament), a tournament ID or a URL; *week* defaults to the week
+    after the last recorded one.
+    Returns {"path", "week", "tournament_id", "date", "players", "rounds"}.
+    Raises ValueError if no tournament or no rounds could be found.
+    """
+    t_id = resolve_tournament_id(str(target).strip())
     if not t_id:
-        print("Invalid ID.")
-        return
+        raise ValueError(f"No tournament found for '{target}'.")
 
     # Week
-    week_str = args.week
-    if not week_str:
-        week_str = str(get_next_week_number())
-        print(f"Auto-calculated Week: {week_str}")
-
-    if not week_str: week_str = "1" # Fallback
-    week_num = int(week_str)
+    if not week:
+        week = get_next_week_number()
+        print(f"Auto-calculated Week: {week}")
+    week_num = int(week)
 
     print(f"\nScraping Tournament {t_id} (Week {week_num})...")
     
@@ -362,8 +254,7 @@ def main():
         time.sleep(1)
         
     if not all_matches:
-        print("No data collected.")
-        return
+        raise ValueError(f"No rounds found for tournament {t_id}.")
 
     # Process
     standings = calculate_standings(all_matches)
@@ -401,6 +292,27 @@ def main():
         json.dump(output_data, f, indent=2)
         
     print(f"\nSuccess! Saved to: {filename}")
+    return {"path": filename, "week": week_num, "tournament_id": t_id, "date": final_date_str,
+            "players": len(standings), "rounds": total_rounds}
+
+def main():
+    parser = argparse.ArgumentParser(description='Aetherhub Scraper')
+    parser.add_argument('target', nargs='?', help='Username, ID, or URL')
+    parser.add_argument('week', nargs='?', help='Week Number (Optional)')
+    args = parser.parse_args()
+    
+    print("\n=== Aetherhub to MTG League Import ===")
+
+    # Target
+    target = args.target
+    if not target:
+        target = input("Enter Username, Tournament ID or URL: ").strip()
+
+    try:
+        scrape(target, args.week)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,178 @@
+"""
+analytics.py – Columnar view of the whole league history for ad-hoc analysis.
+
+Loads every standings row and every match side from the raw week files into
+two pandas DataFrames (once per process) with categorical player, deck and
+league columns, and exposes a small grouped-aggregate query API on top.
+
+Usage:
+    from analytics import load_frames
+    frames = load_frames()
+    frames.deck_win_rates(league="spring-2026")
+    frames.player_form("Tormod Lang", last_n=5)
+    frames.aggregate("standings", by="league", payout=("payout", "sum"))
+
+    python analytics.py [league]        # print deck win rates for a league
+"""
+
+import gc
+import argparse
+import functools
+
+import numpy as np
+import pandas as pd
+
+from convert_data import get_league_info
+from corpus_cache import RAW_DIR
+from models import load_models
+
+STANDING_COLUMNS = ["week", "league", "player", "deck", "rank", "points",
+                    "wins", "losses", "draws", "payout"]
+MATCH_COLUMNS = ["week", "league", "round", "player", "opponent", "deck", "opp_deck",
+                 "game_wins", "game_losses", "game_draws", "win", "loss", "draw"]
+CATEGORICAL = ("league", "player", "deck", "opponent", "opp_deck")
+
+
+def _frame(rows, names):
+    """Build a DataFrame from row tuples, with compact dtypes and categorical name columns."""
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    data = {}
+    for name, col in zip(names, columns):
+        if name in CATEGORICAL:
+            data[name] = pd.Categorical(col)
+        elif name in ("win", "loss", "draw"):
+            data[name] = np.fromiter(col, dtype=bool, count=len(col))
+        else:
+            data[name] = np.fromiter(col, dtype=np.int64, count=len(col))
+    return pd.DataFrame(data)
+
+
+class LeagueFrames:
+    """Standings and matches of every tournament as columnar DataFrames."""
+
+    def __init__(self, standings, matches):
+        self.standings = standings
+        self.matches = matches
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """Build the frames from [(week_num, path, data), ...] as returned by load_corpus() or load_models()."""
+        # Millions of short-lived row tuples would otherwise trigger repeated GC passes
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return cls._from_corpus(corpus)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @classmethod
+    def _from_corpus(cls, corpus):
+        s_rows = []
+        m_rows = []
+
+        for file_week, _path, data in corpus:
+            week = data.get("week_number") or file_week
+            league, _ = get_league_info(week)
+
+            decks = {}
+            for i, s in enumerate(data.get("standings", [])):
+                name = s.get("name", "")
+                deck = s.get("deck") or ""
+                decks[name] = deck
+                s_rows.append((week, league, name, deck, s.get("rank", i + 1), s.get("points") or 0,
+                               s.get("wins", 0), s.get("losses", 0), s.get("draws", 0),
+                               s.get("payout") or 0))
+
+            for rnd in data.get("rounds", []):
+                r = rnd.get("round", 0)
+                for m in rnd.get("matches", []):
+                    p1, p2 = m.get("p1", ""), m.get("p2", "")
+                    if p2 == "BYE" or not p2:
+                        continue
+                    g1, g2, gd = m.get("p1_wins", 0), m.get("p2_wins", 0), m.get("draws", 0)
+                    d1, d2 = decks.get(p1, ""), decks.get(p2, "")
+                    m_rows.append((week, league, r, p1, p2, d1, d2, g1, g2, gd, g1 > g2, g1 < g2, g1 == g2))
+                    m_rows.append((week, league, r, p2, p1, d2, d1, g2, g1, gd, g2 > g1, g2 < g1, g1 == g2))
+
+        return cls(_frame(s_rows, STANDING_COLUMNS), _frame(m_rows, MATCH_COLUMNS))
+
+    # ── Query API ───────────────────────────────────────────────────────
+
+    def select(self, table, where=None):
+        """Return *table* ("standings" or "matches") filtered by {column: value or [values]}."""
+        df = getattr(self, table)
+        if not where:
+            return df
+        mask = np.ones(len(df), dtype=bool)
+        for col, val in where.items():
+            if isinstance(val, (list, tuple, set)):
+                mask &= df[col].isin(list(val)).to_numpy()
+            else:
+                mask &= (df[col] == val).to_numpy()
+        return df[mask]
+
+    def aggregate(self, table, by, where=None, **metrics):
+        """
+        Grouped aggregate over *table*.
+        *metrics* use pandas named-aggregation syntax, e.g. wins=("win", "sum").
+        """
+        df = self.select(table, where)
+        return df.groupby(by, observed=True).agg(**metrics).reset_index()
+
+    # ── Common questions ────────────────────────────────────────────────
+
+    def deck_win_rates(self, league=None, min_matches=0):
+        """Match win rate per deck (draws count as half a win), most-played first."""
+        where = {"league": league} if league else None
+        df = self.aggregate("matches", "deck", where,
+                            matches=("win", "size"), wins=("win", "sum"),
+                            losses=("loss", "sum"), draws=("draw", "sum"))
+        df = df[(df["deck"] != "") & (df["matches"] >= min_matches)].copy()
+        df["win_rate"] = (df["wins"] + 0.5 * df["draws"]) / df["matches"]
+        return df.sort_values(["matches", "win_rate"], ascending=False, ignore_index=True)
+
+    def player_form(self, player, last_n=5):
+        """A player's last *last_n* results, newest first, with a rolling points average."""
+        df = self.select("standings", {"player": player}).sort_values("week")
+        df = df.assign(avg_points=df["points"].rolling(last_n, min_periods=1).mean())
+        return df.tail(last_n).iloc[::-1].reset_index(drop=True)
+
+    def league_totals(self, league=None):
+        """Points, record and tournaments played per player (all weeks counted)."""
+        where = {"league": league} if league else None
+        df = self.aggregate("standings", "player", where,
+                            points=("points", "sum"), wins=("wins", "sum"),
+                            losses=("losses", "sum"), draws=("draws", "sum"),
+                            tournaments_played=("week", "size"))
+        return df.sort_values("points", ascending=False, ignore_index=True)
+
+    def payouts(self, by="league"):
+        """Total prize money paid out, grouped by *by* (e.g. "league" or "player")."""
+        df = self.aggregate("standings", by, payout=("payout", "sum"),
+                            tournaments=("week", "nunique"))
+        return df.sort_values("payout", ascending=False, ignore_index=True)
+
+
+@functools.lru_cache(maxsize=None)
+def load_frames(raw_dir=RAW_DIR):
+    """Load the frames once per process (subsequent calls return the same object)."""
+    return LeagueFrames.from_corpus(load_models(raw_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print deck win rates from the columnar frames.")
+    parser.add_argument("league", nargs="?", default=None,
+                        help="League id (e.g. spring-2026). Defaults to all-time.")
+    parser.add_argument("--min-matches", type=int, default=8)
+    args = parser.parse_args()
+
+    frames = load_frames()
+    rates = frames.deck_win_rates(args.league, min_matches=args.min_matches)
+    print(f"Deck win rates — {args.league or 'all-time'} (min {args.min_matches} matches)\n")
+    for row in rates.itertuples():
+        print(f"  {row.deck:<30} {row.matches:>4} matches  {row.win_rate:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
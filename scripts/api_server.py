@@ -0,0 +1,303 @@
+"""
+api_server.py – Small read-only HTTP API over the league data (stdlib only).
+
+Serves slices of the db.json produced by convert_data.py, so a page can fetch
+just what it needs instead of the whole database:
+
+    GET /api/leagues                      league list (id, name, tournaments)
+    GET /api/leagues/<id>/standings       standings of one league
+    GET /api/tournaments/<id>             one tournament (e.g. week-91)
+    GET /api/players/<name>               player profile: league rows + results
+    GET /api/decks[?league=<id>]          deck stats (entries, players, match record)
+
+Every response carries a strong ETag and `Cache-Control: no-cache`, so clients
+revalidate cheaply and get `304 Not Modified` when nothing changed. Bodies are
+gzip-compressed when the client accepts it, and rendered responses are kept in
+an in-memory LRU keyed on the db.json version, the path and the query
+parameters the route actually reads. db.json is reloaded
+automatically when it changes on disk.
+
+Usage:
+    python api_server.py                    # http://127.0.0.1:8000
+    python api_server.py --port 9000 --host 0.0.0.0
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote, parse_qs
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DB_PATH = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "db.json")
+
+CACHE_SIZE = 256            # rendered responses kept in memory
+GZIP_MIN_BYTES = 1024       # don't bother compressing tiny bodies
+
+
+class NotFound(Exception):
+    pass
+
+
+class Rendered:
+    """A rendered response body with its gzip variant and strong ETags."""
+
+    __slots__ = ("body", "gz_body", "etag", "gz_etag")
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        # A different byte representation needs its own strong validator
+        self.gz_etag = f'"{digest}-gz"'
+        self.gz_body = gzip.compress(self.body, 6) if len(self.body) >= GZIP_MIN_BYTES else None
+
+
+class LeagueData:
+    """db.json plus lookup indexes, reloaded when the file changes."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.version = None
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # (version, *route key) → Rendered
+        self._load_if_changed()
+
+    def _load_if_changed(self):
+        st = os.stat(self.path)
+        version = (st.st_mtime_ns, st.st_size)
+        if version == self.version:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            db = json.load(f)
+        self.leagues = {l["id"]: l for l in db.get("leagues", [])}
+        self.tournaments = db.get("tournaments", {})
+        self.player_index = {}  # name → [tournament id, ...] oldest first
+        for t_id, t in sorted(self.tournaments.items(), key=lambda kv: _week_key(kv[0])):
+            for s in t.get("standings", []):
+                self.player_index.setdefault(s.get("name"), []).append(t_id)
+        self.version = version
+        self.cache.clear()
+
+    # ── Routing ─────────────────────────────────────────────────────────
+
+    def render(self, route, query):
+        """Return the Rendered response for *route*, using the LRU when possible."""
+        with self.lock:
+            self._load_if_changed()
+            route_key, build = self._route(route, query)
+            key = (self.version,) + route_key
+            hit = self.cache.get(key)
+            if hit is not None:
+                self.cache.move_to_end(key)
+                return hit
+
+            rendered = Rendered(build())
+            self.cache[key] = rendered
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+            return rendered
+
+    def _route(self, route, query):
+        """
+        (cache key, payload function) for *route*. The key holds the decoded path
+        and only the query parameters the route reads, so unused or cache-busting
+        parameters share one cache entry.
+        """
+        parts = [unquote(p) for p in route.strip("/").split("/")]
+        if parts[:1] != ["api"]:
+            raise NotFound(route)
+        parts = parts[1:]
+
+        if parts == ["leagues"]:
+            return ("leagues",), self._league_list
+        if len(parts) == 3 and parts[0] == "leagues" and parts[2] == "standings":
+            league = self.leagues.get(parts[1])
+            if league is None:
+                raise NotFound(route)
+            return ("standings", league["id"]), lambda: {
+                "id": league["id"], "name": league["name"],
+                "max_counted": league.get("max_counted"), "standings": league["standings"]}
+        if len(parts) == 2 and parts[0] == "tournaments":
+            t = self.tournaments.get(parts[1])
+            if t is None:
+                raise NotFound(route)
+            return ("tournament", parts[1]), lambda: t
+        if len(parts) == 2 and parts[0] == "players":
+            return ("player", parts[1]), lambda: self._player(parts[1])
+        if parts == ["decks"]:
+            league_id = query.get("league")
+            return ("decks", league_id), lambda: self._decks(league_id)
+        raise NotFound(route)
+
+    def _league_list(self):
+        return [
+            {"id": l["id"], "name": l["name"], "max_counted": l.get("max_counted"),
+             "tournaments": l.get("tournaments", [])}
+            for l in self.leagues.values()
+        ]
+
+    def _player(self, name):
+        t_ids = self.player_index.get(name)
+        if not t_ids:
+            raise NotFound(name)
+
+        leagues = []
+        for league in self.leagues.values():
+            row = next((s for s in league["standings"] if s["name"] == name), None)
+            if row is not None:
+                leagues.append({"id": league["id"], "name": league["name"], **row})
+
+        results = []
+        for t_id in t_ids:
+            t = self.tournaments[t_id]
+            row = next(s for s in t["standings"] if s.get("name") == name)
+            matches = [
+                {"round": rnd.get("round"), **m}
+                for rnd in t.get("rounds", [])
+                for m in rnd.get("matches", [])
+                if name in (m.get("p1"), m.get("p2"))
+            ]
+            results.append({
+                "tournament": t_id, "date": t.get("date"), "league_id": t.get("league_id"),
+                "rank": row.get("rank"), "deck": row.get("deck"), "points": row.get("points"),
+                "record": row.get("record"), "payout": row.get("payout", 0), "matches": matches,
+            })
+        return {"name": name, "leagues": leagues, "results": results}
+
+    def _decks(self, league_id=None):
+        if league_id is not None and league_id not in self.leagues:
+            raise NotFound(league_id)
+        t_ids = self.leagues[league_id]["tournaments"] if league_id else list(self.tournaments)
+
+        stats = {}
+        for t_id in t_ids:
+            t = self.tournaments[t_id]
+            deck_of = {s.get("name"): s.get("deck") or "" for s in t.get("standings", [])}
+            for s in t.get("standings", []):
+                deck = s.get("deck") or ""
+                if not deck:
+                    continue
+                d = stats.setdefault(deck, {"deck": deck, "entries": 0, "players": set(),
+                                            "matches": 0, "wins": 0, "losses": 0, "draws": 0})
+                d["entries"] += 1
+                d["players"].add(s.get("name"))
+            for rnd in t.get("rounds", []):
+                for m in rnd.get("matches", []):
+                    if m.get("p2") in (None, "", "BYE"):
+                        continue
+                    for me, mine, theirs in ((m["p1"], m["p1_wins"], m["p2_wins"]),
+                                             (m["p2"], m["p2_wins"], m["p1_wins"])):
+                        d = stats.get(deck_of.get(me, ""))
+                        if d is None:
+                            continue
+                        d["matches"] += 1
+                        if mine > theirs: d["wins"] += 1
+                        elif mine < theirs: d["losses"] += 1
+                        else: d["draws"] += 1
+
+        out = []
+        for d in stats.values():
+            d["players"] = len(d["players"])
+            d["win_rate"] = (d["wins"] + 0.5 * d["draws"]) / d["matches"] if d["matches"] else None
+            out.append(d)
+        out.sort(key=lambda d: (d["entries"], d["matches"]), reverse=True)
+        return out
+
+
+def _week_key(t_id):
+    try:
+        return int(t_id.split("-")[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+# ── HTTP ────────────────────────────────────────────────────────────────────
+
+class ApiHandler(BaseHTTPRequestHandler):
+    data = None  # LeagueData, set by serve()
+    server_version = "OsloLeagueAPI/1.0"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            rendered = self.data.render(url.path, query)
+        except NotFound:
+            return self._error(HTTPStatus.NOT_FOUND, "Not found")
+        except (OSError, json.JSONDecodeError) as e:
+            return self._error(HTTPStatus.SERVICE_UNAVAILABLE, f"db.json unavailable: {e}")
+
+        use_gzip = rendered.gz_body is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = rendered.gz_etag if use_gzip else rendered.etag
+        body = rendered.gz_body if use_gzip else rendered.body
+
+        client_tags = {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}
+        if "*" in client_tags or rendered.etag in client_tags or rendered.gz_etag in client_tags:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(etag)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+def serve(host="127.0.0.1", port=8000, db_path=DB_PATH):
+    ApiHandler.data = LeagueData(db_path)
+    httpd = ThreadingHTTPServer((host, port), ApiHandler)
+    print(f"Serving {db_path} on http://{host}:{port}/api/ — Ctrl-C to stop.")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve league data as a small JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
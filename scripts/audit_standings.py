@@ -0,0 +1,248 @@
+"""
+audit_standings.py – Re-derive every week's standings from its rounds and diff.
+
+Each raw week file stores both the match results (`rounds`) and the standings
+derived from them. Renames, bulk deck fixes and hand edits can make the two
+drift apart. This audit recomputes every week's standings with the same
+`calculate_standings` that imports new weeks (standings.py) and compares them
+field by field with what's stored.
+
+Differences are grouped by kind:
+    players    a name appears in only one of the two
+    results    points / wins / losses / draws / record differ (league points are wrong)
+    rank       same results, different order
+    tiebreak   omw / gw / ogw / mw differ
+
+Older weeks were scored with a 1/3 floor on win percentages rather than 0.33;
+a week's tiebreaks are accepted if they match under either floor.
+
+Weeks are audited in parallel worker processes once the history is large
+enough for that to pay off. The report is plain JSON.
+
+Players/results differences that were already in the history are listed in
+audit_baseline.json (written with --write-baseline). The exit status is 1 when
+any week has a players/results difference not in the baseline (`--strict`:
+any difference). weekly_update.py runs the audit before publishing, with the
+same baseline.
+
+Usage:
+    python audit_standings.py               # summary of every week
+    python audit_standings.py --week 47     # one week, every difference
+    python audit_standings.py --json        # machine-readable report
+    python audit_standings.py --strict      # non-zero exit on any difference
+    python audit_standings.py --no-baseline     # fail on known differences too
+    python audit_standings.py --write-baseline  # accept today's differences as known
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus_cache import RAW_DIR, SCRIPT_DIR
+from models import load_models
+from standings import MIN_PCT, calculate_standings, rounds_of
+
+BASELINE_FILE = os.path.join(SCRIPT_DIR, "audit_baseline.json")
+
+LEGACY_MIN_PCT = 1 / 3
+TOLERANCE = 1e-6
+PARALLEL_MIN_WEEKS = 500   # below this, worker start-up costs more than it saves
+
+RESULT_FIELDS = ("points", "wins", "losses", "draws", "record")
+TIEBREAK_FIELDS = ("omw", "gw", "ogw", "mw")
+ERROR_KINDS = ("players", "results")
+
+
+# ── Comparing ───────────────────────────────────────────────────────────────
+
+def diff_standings(stored, computed):
+    """
+    Compare stored and recomputed standings lists.
+    Returns [{"kind", "name", "field", "stored", "computed"}, ...].
+    """
+    diffs = []
+    by_name = {s.get("name"): s for s in stored}
+    calc = {s["name"]: s for s in computed}
+
+    for name in by_name.keys() - calc.keys():
+        diffs.append({"kind": "players", "name": name, "field": "name", "stored": name, "computed": None})
+    for name in calc.keys() - by_name.keys():
+        diffs.append({"kind": "players", "name": name, "field": "name", "stored": None, "computed": name})
+
+    for name in by_name.keys() & calc.keys():
+        s, c = by_name[name], calc[name]
+        for field in RESULT_FIELDS:
+            if s.get(field) != c[field]:
+                diffs.append({"kind": "results", "name": name, "field": field,
+                              "stored": s.get(field), "computed": c[field]})
+        if s.get("rank") != c["rank"]:
+            diffs.append({"kind": "rank", "name": name, "field": "rank",
+                          "stored": s.get("rank"), "computed": c["rank"]})
+        for field in TIEBREAK_FIELDS:
+            value = s.get(field)
+            if not isinstance(value, (int, float)) or abs(value - c[field]) > TOLERANCE:
+                diffs.append({"kind": "tiebreak", "name": name, "field": field,
+                              "stored": value, "computed": c[field]})
+    return diffs
+
+
+def audit_week(item):
+    """Audit one (week_num, data) pair. Returns a per-week report dict."""
+    week_num, data = item
+    rounds = rounds_of(data)
+    stored = data.get("standings", [])
+    best = None
+    for min_pct in (MIN_PCT, LEGACY_MIN_PCT):
+        diffs = diff_standings(stored, calculate_standings(rounds, min_pct))
+        if best is None or len(diffs) < len(best[1]):
+            best = (min_pct, diffs)
+        if not diffs:
+            break
+
+    min_pct, diffs = best
+    kinds = sorted({d["kind"] for d in diffs})
+    return {
+        "week": week_num,
+        "rounds": len(rounds),
+        "players": len(stored),
+        "floor": "legacy" if min_pct == LEGACY_MIN_PCT else "current",
+        "ok": not diffs,
+        "kinds": kinds,
+        "differences": sorted(diffs, key=lambda d: (d["kind"], d["name"], d["field"])),
+    }
+
+
+# ── Running ─────────────────────────────────────────────────────────────────
+
+def audit(corpus, jobs=None):
+    """
+    Audit [(week_num, path, data), ...]. *jobs* worker processes are used when
+    the corpus has at least PARALLEL_MIN_WEEKS weeks (jobs=1 forces serial).
+    Returns the report dict.
+    """
+    items = [(data.get("week_number") or wn, data) for wn, _path, data in corpus]
+    jobs = jobs or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    if jobs > 1 and len(items) >= PARALLEL_MIN_WEEKS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            weeks = list(pool.map(audit_week, items, chunksize=max(1, len(items) // (jobs * 4))))
+    else:
+        weeks = [audit_week(item) for item in items]
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    counts = {kind: sum(kind in w["kinds"] for w in weeks)
+              for kind in ERROR_KINDS + ("rank", "tiebreak")}
+    return {
+        "weeks": len(weeks),
+        "clean": sum(w["ok"] for w in weeks),
+        "weeks_with": counts,
+        "errors": any(counts[k] for k in ERROR_KINDS),
+        "elapsed_ms": round(elapsed, 1),
+        "results": weeks,
+    }
+
+
+# ── Baseline ────────────────────────────────────────────────────────────────
+
+def difference_key(week, d):
+    return (week, d["kind"], d["name"], d["field"], d["stored"], d["computed"])
+
+
+def load_baseline(path=BASELINE_FILE):
+    """The known differences in *path* as a set of difference_key() tuples (empty if there is no baseline)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {difference_key(d["week"], d) for d in json.load(f)}
+    except FileNotFoundError:
+        return set()
+
+
+def write_baseline(report, path=BASELINE_FILE):
+    """Store every players/results difference in *report* as known."""
+    known = [dict(d, week=w["week"]) for w in report["results"]
+             for d in w["differences"] if d["kind"] in ERROR_KINDS]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(known, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return len(known)
+
+
+def new_errors(report, known):
+    """[(week, difference), ...] for every players/results difference not in *known*."""
+    return [(w["week"], d) for w in report["results"] for d in w["differences"]
+            if d["kind"] in ERROR_KINDS and difference_key(w["week"], d) not in known]
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def print_report(report, verbose=False, known=frozenset()):
+    print(f"Audited {report['weeks']} weeks in {report['elapsed_ms']:.0f} ms: "
+          f"{report['clean']} match their rounds exactly.")
+    for kind, n in report["weeks_with"].items():
+        if n:
+            print(f"  {kind:<9} differences in {n} week(s)")
+
+    if report["clean"] < report["weeks"]:
+        print()
+    for w in report["results"]:
+        if w["ok"]:
+            continue
+        errors = [d for d in w["differences"] if d["kind"] in ERROR_KINDS]
+        if any(difference_key(w["week"], d) not in known for d in errors):
+            flag = "!!"
+        else:
+            flag = "· " if errors else "  "
+        print(f"{flag} week-{w['week']:<4} {', '.join(w['kinds'])} "
+              f"({len(w['differences'])} differences, {w['floor']} floor)")
+        shown = w["differences"] if verbose else [d for d in w["differences"] if d["kind"] in ERROR_KINDS]
+        for d in shown:
+            print(f"     {d['kind']:<9} {d['name']:<26} {d['field']:<7} stored {d['stored']!s:<20} "
+                  f"computed {d['computed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check stored standings against their rounds.")
+    parser.add_argument("--week", type=int, action="append", help="Only audit this week (repeatable).")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on any difference.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List rank and tiebreak differences too.")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Fail on the known differences in audit_baseline.json too.")
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Record every current players/results difference as known and exit.")
+    args = parser.parse_args()
+    if args.write_baseline and args.week:
+        parser.error("--write-baseline records the whole history; drop --week")
+
+    corpus = load_models(RAW_DIR)
+    if args.week:
+        corpus = [c for c in corpus if (c[2].get("week_number") or c[0]) in args.week]
+    report = audit(corpus, args.jobs)
+
+    if args.write_baseline:
+        n = write_baseline(report)
+        print(f"Wrote {n} known differences to {os.path.relpath(BASELINE_FILE)}")
+        return
+
+    known = frozenset() if args.no_baseline else load_baseline()
+    try:
+        if args.json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            print_report(report, verbose=args.verbose or bool(args.week), known=known)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Piped into e.g. head, which stopped reading: silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+    failed = report["clean"] < report["weeks"] if args.strict else new_errors(report, known)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
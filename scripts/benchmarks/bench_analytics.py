@@ -0,0 +1,81 @@
+"""
+bench_analytics.py – Loop-based aggregation (as in convert_data.py) versus
+the columnar frames in analytics.py on large synthetic histories.
+
+Two questions are answered both ways:
+  * league totals  – points / W-L-D / tournaments per player per league
+                     (convert_data.update_league_stats)
+  * deck win rates – match wins per deck across all rounds
+
+Usage:
+    python benchmarks/bench_analytics.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analytics import LeagueFrames
+from convert_data import get_league_info, update_league_stats
+from synthetic import make_history
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def loop_league_totals(corpus):
+    leagues = {}
+    for _wn, _path, data in corpus:
+        league_id, _ = get_league_info(data["week_number"])
+        league = leagues.setdefault(league_id, {"players": {}})
+        update_league_stats(league, data)
+    return leagues
+
+
+def loop_deck_win_rates(corpus):
+    stats = {}
+    for _wn, _path, data in corpus:
+        decks = {s["name"]: s["deck"] for s in data["standings"]}
+        for rnd in data["rounds"]:
+            for m in rnd["matches"]:
+                for me, opp, gw, gl in ((m["p1"], m["p2"], m["p1_wins"], m["p2_wins"]),
+                                        (m["p2"], m["p1"], m["p2_wins"], m["p1_wins"])):
+                    s = stats.setdefault(decks[me], [0, 0, 0])
+                    s[0] += 1
+                    s[1] += gw > gl
+                    s[2] += gw == gl
+    return {d: (w + 0.5 * dr) / n for d, (n, w, dr) in stats.items()}
+
+
+def main():
+    print(f"{'weeks':>7}  {'frame build':>11}  {'totals loop':>11}  {'totals frame':>12}  "
+          f"{'decks loop':>10}  {'decks frame':>11}")
+    for n_weeks in SIZES:
+        corpus = make_history(n_weeks)
+        frames, t_build = timed(lambda: LeagueFrames.from_corpus(corpus))
+
+        _, t_loop_totals = timed(lambda: loop_league_totals(corpus))
+        _, t_frame_totals = timed(lambda: frames.aggregate(
+            "standings", ["league", "player"], points=("points", "sum"), wins=("wins", "sum"),
+            losses=("losses", "sum"), draws=("draws", "sum"), tournaments_played=("week", "size")))
+
+        loop_rates, t_loop_decks = timed(lambda: loop_deck_win_rates(corpus))
+        frame_rates, t_frame_decks = timed(lambda: frames.deck_win_rates())
+
+        # Both paths must agree before their timings mean anything
+        assert all(abs(loop_rates[r.deck] - r.win_rate) < 1e-9 for r in frame_rates.itertuples())
+
+        print(f"{n_weeks:>7}  {t_build:>8.0f} ms  {t_loop_totals:>8.1f} ms  {t_frame_totals:>9.1f} ms  "
+              f"{t_loop_decks:>7.1f} ms  {t_frame_decks:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+bench_completer.py – Keystroke latency of verify_data.RapidFuzzyCompleter
+versus scoring every entry with _score() on each keystroke (the previous
+implementation), for 10k and 50k synthetic names.
+
+Each query is typed one character at a time, then erased again with
+backspace, and the per-keystroke latency is reported. Rankings from both
+paths are compared on every keystroke.
+
+Usage:
+    python benchmarks/bench_completer.py
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from verify_data import RapidFuzzyCompleter
+
+SIZES = (10_000, 50_000)
+QUERIES = ("moon stompy", "bjørnar", "erik", "tempo", "xq")
+LIMIT = 10
+
+FIRST = ["Anders", "Bjørnar", "Christopher", "Dante", "Eirik", "Erik", "Håvard", "Jørgen",
+         "Kenneth", "Manuel", "Ola", "Søren", "Tormod", "Viktor", "Moon", "Grixis"]
+LAST = ["Larsen", "Funderud", "Øvrum", "Forssberg", "Graff", "Sørli", "Lang", "Stompy",
+        "Tempo", "Hlavinka", "Aarseth", "Hübert", "Bergseth", "Christie", "Marnburg", "Au"]
+
+
+def make_items(n, seed=7):
+    rng = random.Random(seed)
+    return [f"{rng.choice(FIRST)} {rng.choice(LAST)} {i:05d}" for i in range(n)]
+
+
+def naive_rank(items, text, min_score=40, limit=LIMIT):
+    scored = [(item, RapidFuzzyCompleter._score(text, item)) for item in items]
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [(item, score) for item, score in scored[:limit] if score >= min_score]
+
+
+def keystrokes(query):
+    typed = [query[:n] for n in range(1, len(query) + 1)]
+    return typed + typed[-2::-1]
+
+
+def main():
+    print(f"{'items':>7}  {'naive / key':>12}  {'index / key':>12}  {'worst key':>10}")
+    for n in SIZES:
+        items = make_items(n)
+        completer = RapidFuzzyCompleter(items, limit=LIMIT)
+        naive_total = index_total = worst = 0.0
+        keys = 0
+        for query in QUERIES:
+            for text in keystrokes(query):
+                t0 = time.perf_counter()
+                expected = naive_rank(items, text)
+                naive_total += time.perf_counter() - t0
+
+                t0 = time.perf_counter()
+                got = [(item, score) for item, score in completer.rank(text) if score >= 40]
+                elapsed = time.perf_counter() - t0
+                index_total += elapsed
+                worst = max(worst, elapsed)
+                keys += 1
+
+                assert got == expected, (text, got, expected)
+
+        print(f"{n:>7}  {naive_total / keys * 1000:>9.2f} ms  {index_total / keys * 1000:>9.2f} ms  "
+              f"{worst * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
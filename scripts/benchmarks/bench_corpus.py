@@ -0,0 +1,73 @@
+"""
+bench_corpus.py – Startup cost of loading the raw corpus: json.load per file
+versus the binary parse cache in corpus_cache.py.
+
+The corpus is replicated ×1, ×4 and ×16 into a temp directory to check that
+warm cache loads scale linearly with corpus size.
+
+Usage:
+    python benchmarks/bench_corpus.py
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus_cache import RAW_DIR, load_corpus, scan_week_files
+
+SCALES = (1, 4, 16)
+REPEATS = 5
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def json_baseline(raw_dir):
+    for _wn, path, _st in scan_week_files(raw_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            json.load(f)
+
+
+def make_corpus(tmp, scale):
+    """Copy every raw week file *scale* times under fresh week numbers."""
+    raw_dir = os.path.join(tmp, f"raw-x{scale}")
+    os.makedirs(raw_dir)
+    sources = sorted(scan_week_files(RAW_DIR))
+    offset = max(wn for wn, _, _ in sources)
+    for copy in range(scale):
+        for wn, path, _st in sources:
+            shutil.copyfile(path, os.path.join(raw_dir, f"week-{wn + copy * offset}.json"))
+    return raw_dir, len(sources) * scale
+
+
+def main():
+    print(f"{'files':>7}  {'json.load':>11}  {'cold cache':>11}  {'warm cache':>11}  {'per file':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in SCALES:
+            raw_dir, n_files = make_corpus(tmp, scale)
+            cache_path = os.path.join(tmp, f"corpus-x{scale}.pickle")
+
+            baseline = best_of(lambda: json_baseline(raw_dir))
+
+            t0 = time.perf_counter()
+            load_corpus(raw_dir, cache_path)
+            cold = (time.perf_counter() - t0) * 1000
+
+            warm = best_of(lambda: load_corpus(raw_dir, cache_path))
+            print(f"{n_files:>7}  {baseline:>8.1f} ms  {cold:>8.1f} ms  {warm:>8.1f} ms  "
+                  f"{warm * 1000 / n_files:>6.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
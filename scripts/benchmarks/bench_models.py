@@ -0,0 +1,147 @@
+"""
+bench_models.py – Memory of a 100× history held as json.load dicts versus the
+slotted records of models.py.
+
+The synthetic history is serialised and parsed back week by week so that, as
+with real files, every name in it is a separate string object. Measured:
+  * traced     – bytes allocated for the loaded history (tracemalloc)
+  * load       – parsing every week (and building the models)
+  * RSS        – growth of a fresh process's resident size while loading
+  * round trip – to_dict() of every model equals the parsed dicts
+
+Then the same history is written out as week files and loaded warm the way
+the tooling does, in a fresh process each: corpus_cache.load_corpus (dicts)
+against models.load_models (records), followed by a check_data.check pass.
+Measured are the load time, the RSS growth while loading and the process's
+peak RSS. The models must take less than MAX_RSS_RATIO of the dicts' RSS.
+
+Usage:
+    python benchmarks/bench_models.py
+"""
+
+import os
+import sys
+import json
+import time
+import gc
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import check_data
+from corpus_cache import load_corpus
+from models import Tournament, load_models, traced_size
+from synthetic import make_history
+
+N_WEEKS = 10_600           # ~100× today's history
+MAX_RSS_RATIO = 0.75       # warm models load vs warm dicts load
+LOADERS = {"dicts": load_corpus, "models": load_models}
+
+
+def texts():
+    return [json.dumps(data) for _wn, _path, data in make_history(N_WEEKS)]
+
+
+def load(kind, week_texts):
+    if kind == "dicts":
+        return [json.loads(t) for t in week_texts]
+    return [Tournament.from_dict(json.loads(t)) for t in week_texts]
+
+
+def rss_mib():
+    """Current resident set size (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def rss_growth_mib(kind):
+    """RSS growth of a fresh process while it loads the history as *kind*."""
+    out = subprocess.run([sys.executable, __file__, "--rss", kind],
+                         capture_output=True, text=True, check=True).stdout
+    return float(out)
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process (Linux VmHWM, which unlike ru_maxrss starts afresh at exec)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def write_history(raw_dir):
+    for week_num, _path, data in make_history(N_WEEKS):
+        with open(os.path.join(raw_dir, f"week-{week_num}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+
+def warm_load(kind, raw_dir, cache_path):
+    """Warm *kind* load + check_data pass in a fresh process: (load ms, RSS growth, peak RSS)."""
+    out = subprocess.run([sys.executable, __file__, "--warm", kind, raw_dir, cache_path],
+                         capture_output=True, text=True, check=True).stdout
+    return tuple(float(x) for x in out.split())
+
+
+def main():
+    if sys.argv[1:2] == ["--rss"]:
+        week_texts = texts()
+        gc.collect()
+        baseline = rss_mib()
+        history = load(sys.argv[2], week_texts)  # noqa: F841 (kept alive for the reading)
+        print(rss_mib() - baseline)
+        return
+    if sys.argv[1:2] == ["--warm"]:
+        kind, raw_dir, cache_path = sys.argv[2:5]
+        baseline = rss_mib()
+        t0 = time.perf_counter()
+        corpus = LOADERS[kind](raw_dir, cache_path)
+        elapsed = (time.perf_counter() - t0) * 1000
+        growth = rss_mib() - baseline
+        check_data.check(corpus, raw_dir, references=False, jobs=1)
+        print(elapsed, growth, peak_rss_mib())
+        return
+
+    week_texts = texts()
+    rows = sum(t.count('"rank"') for t in week_texts)
+    print(f"{N_WEEKS:,} weeks, {rows:,} standings rows\n")
+
+    results = {}
+    for kind in ("dicts", "models"):
+        t0 = time.perf_counter()
+        load(kind, week_texts)
+        elapsed = (time.perf_counter() - t0) * 1000
+        history, size = traced_size(lambda: load(kind, week_texts))
+        results[kind] = (history, size)
+        print(f"  {kind:<7} traced {size / 2**20:7.1f} MiB   RSS +{rss_growth_mib(kind):7.1f} MiB   "
+              f"load {elapsed:6.0f} ms")
+
+    (dicts, dict_bytes), (models, model_bytes) = results["dicts"], results["models"]
+    assert [m.to_dict() for m in models] == dicts
+    print(f"\n  models take {model_bytes / dict_bytes:.0%} of the dicts' memory; round trip is lossless")
+    del results, dicts, models, history
+
+    print("\nWarm cache load + check_data, fresh process each:")
+    tmp = tempfile.mkdtemp(prefix="bench_models-")
+    try:
+        raw_dir = os.path.join(tmp, "raw")
+        os.mkdir(raw_dir)
+        write_history(raw_dir)
+        growth = {}
+        for kind, loader in LOADERS.items():
+            cache_path = os.path.join(tmp, f"{kind}.pickle")
+            loader(raw_dir, cache_path)                     # cold: parse and write the cache
+            elapsed, growth[kind], peak = warm_load(kind, raw_dir, cache_path)
+            print(f"  {kind:<7} load {elapsed:6.0f} ms   RSS +{growth[kind]:7.1f} MiB   peak {peak:7.1f} MiB")
+    finally:
+        shutil.rmtree(tmp)
+
+    ratio = growth["models"] / growth["dicts"]
+    print(f"\n  load_models takes {ratio:.0%} of load_corpus's RSS (limit {MAX_RSS_RATIO:.0%})")
+    assert ratio < MAX_RSS_RATIO, f"models RSS is {ratio:.0%} of the dicts', limit {MAX_RSS_RATIO:.0%}"
+
+
+if __name__ == "__main__":
+    main()
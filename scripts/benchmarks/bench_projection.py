@@ -0,0 +1,91 @@
+"""
+bench_projection.py – Time projection.simulate on synthetic leagues and check
+it against a straightforward sort-per-simulation reference.
+
+Each case simulates a league of the given size from its first week, so every
+week is still to be played (the slowest case). The reference sorts each
+player's scores to get the best-X total and ranks players with sorted(); both
+must agree on the position probabilities within Monte Carlo noise.
+
+Timings (best of a few runs) are reported against each case's target, the
+64-player league's being projection.py's "100k simulations under a second".
+Missing a target is only flagged, since timings vary with the machine and
+its load; the benchmark fails only past SLACK × the target, which catches a
+regression to e.g. a per-player Python loop.
+
+Usage:
+    python benchmarks/bench_projection.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from projection import LeagueState, league_weeks, simulate
+from synthetic import make_history
+
+LEAGUE = "spring-2024"          # 17 weeks, best 12 count
+PLAYER_COUNTS = (16, 32, 64)
+N_SIMS = 100_000
+REFERENCE_SIMS = 5_000
+TOLERANCE = 0.03                # max difference in any position probability
+TIME_TARGET = {16: 0.5, 32: 0.75, 64: 1.0}  # seconds for N_SIMS simulations
+SLACK = 3                                   # fail only beyond SLACK × the target
+REPEATS = 3
+
+
+def reference(state, n_sims, seed):
+    """Position probabilities by sorting every simulation in Python."""
+    rng = np.random.default_rng(seed)
+    cdf, outcome = state.outcome_table()
+    n, n_weeks = len(state.names), len(state.remaining_weeks)
+    best_x = state.best_x or (state.scores.shape[1] + n_weeks)
+    counts = np.zeros((n, n))
+    for _ in range(n_sims):
+        drawn = [np.minimum(np.searchsorted(cdf[i], rng.random(n_weeks), side="right"), cdf.shape[1] - 1)
+                 for i in range(n)]
+        keys = []
+        for i, idx in enumerate(drawn):
+            scores = sorted(list(state.scores[i]) + list(outcome["points"][idx]), reverse=True)
+            keys.append((sum(scores[:best_x]),
+                         state.four_ohs[i] + outcome["four_oh"][idx].sum(),
+                         state.three_ohs[i] + outcome["three_oh"][idx].sum(),
+                         state.three_ones[i] + outcome["three_one"][idx].sum(),
+                         state.played[i] + outcome["played"][idx].sum()))
+        for pos, i in enumerate(sorted(range(n), key=lambda i: keys[i], reverse=True)):
+            counts[i, pos] += 1
+    return counts / n_sims
+
+
+def main():
+    first_week = min(league_weeks(LEAGUE))
+    print(f"{'players':>7}  {'weeks left':>10}  {f'{N_SIMS:,} sims':>12}  {'target':>7}  {'max |Δp|':>9}")
+    for n_players in PLAYER_COUNTS:
+        corpus = make_history(first_week - 1, n_players=n_players, per_week=n_players)
+        state = LeagueState(corpus, LEAGUE)
+
+        elapsed = float("inf")
+        for _ in range(REPEATS):
+            t0 = time.perf_counter()
+            counts, _mean_points = simulate(state, N_SIMS, seed=1)
+            elapsed = min(elapsed, time.perf_counter() - t0)
+
+        # Both paths must agree before the timing means anything
+        delta = np.abs(counts / N_SIMS - reference(state, REFERENCE_SIMS, seed=2)).max()
+        assert delta < TOLERANCE, f"simulate and reference disagree by {delta:.3f}"
+
+        target = TIME_TARGET[n_players]
+        flag = "" if elapsed < target else "  (over target)"
+        print(f"{n_players:>7}  {len(state.remaining_weeks):>10}  {elapsed * 1000:>9.0f} ms  "
+              f"{target * 1000:>4.0f} ms  {delta:>9.3f}{flag}")
+        assert elapsed < SLACK * target, \
+            f"{n_players} players took {elapsed:.2f} s, over {SLACK} × the {target} s target"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+bench_ratings.py – Full replay versus checkpointed updates of the Elo engine
+in ratings.py on a synthetic 10,000-week history.
+
+Measured:
+  * full replay    – rating every week from scratch
+  * checkpoint     – saving / loading the per-week state snapshot
+  * add week       – rating one new week on top of the loaded state
+  * fix old week   – undoing and replaying the last 100 weeks after an edit
+
+Usage:
+    python benchmarks/bench_ratings.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus_cache import read_snapshot
+from ratings import STATE_VERSION, RatingEngine
+from synthetic import make_history
+
+N_WEEKS = 10_000
+REPLAY_WEEKS = 100
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def replay(corpus):
+    engine = RatingEngine()
+    for wn, _path, data in corpus:
+        engine.apply_week(wn, data)
+    return engine
+
+
+def main():
+    corpus = make_history(N_WEEKS + 1)
+    history, new_week = corpus[:-1], corpus[-1]
+    n_matches = sum(len(r["matches"]) for _wn, _p, d in history for r in d["rounds"])
+    print(f"{N_WEEKS:,} weeks, {n_matches:,} matches\n")
+
+    engine, t_full = timed(lambda: replay(history))
+    print(f"  full replay          {t_full:>9.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ratings.pickle")
+        _, t_save = timed(lambda: engine.save(path))
+        payload, t_load = timed(lambda: read_snapshot(path, STATE_VERSION))
+    print(f"  checkpoint save      {t_save:>9.1f} ms")
+    print(f"  checkpoint load      {t_load:>9.1f} ms")
+
+    loaded = RatingEngine()
+    loaded.ratings, loaded.matches, loaded.weeks = payload["ratings"], payload["matches"], payload["weeks"]
+    _, t_add = timed(lambda: loaded.apply_week(new_week[0], new_week[2]))
+    print(f"  add week             {t_add:>9.3f} ms")
+
+    def fix_old_week():
+        first = corpus[-REPLAY_WEEKS][0]
+        loaded.rollback(first)
+        for wn, _path, data in corpus[-REPLAY_WEEKS:]:
+            loaded.apply_week(wn, data)
+    _, t_fix = timed(fix_old_week)
+    print(f"  fix old week         {t_fix:>9.1f} ms   (undo + replay {REPLAY_WEEKS} weeks)")
+
+    # Checkpointed updates must land exactly where a full replay does
+    reference = replay(corpus)
+    assert loaded.ratings == reference.ratings and loaded.matches == reference.matches
+    print(f"\n  add week is {t_full / t_add:,.0f}× faster than a full replay")
+
+
+if __name__ == "__main__":
+    main()
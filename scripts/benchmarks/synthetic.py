@@ -0,0 +1,69 @@
+"""
+synthetic.py – Generator for large synthetic league histories in the raw
+week-*.json schema, shared by the benchmarks in this folder.
+"""
+
+import random
+
+
+def make_week(week, rng, players, decks, per_week=16, rounds=4):
+    """Return one week's tournament dict with random pairings and results."""
+    entrants = rng.sample(players, per_week)
+    deck_of = {p: rng.choice(decks) for p in entrants}
+    tally = {p: [0, 0, 0] for p in entrants}  # wins, losses, draws
+
+    rounds_out = []
+    for r in range(1, rounds + 1):
+        order = entrants[:]
+        rng.shuffle(order)
+        matches = []
+        for p1, p2 in zip(order[::2], order[1::2]):
+            roll = rng.random()
+            if roll < 0.05:
+                g1, g2, d = 1, 1, 1
+                tally[p1][2] += 1
+                tally[p2][2] += 1
+            elif roll < 0.525:
+                g1, g2, d = 2, rng.randint(0, 1), 0
+                tally[p1][0] += 1
+                tally[p2][1] += 1
+            else:
+                g1, g2, d = rng.randint(0, 1), 2, 0
+                tally[p1][1] += 1
+                tally[p2][0] += 1
+            matches.append({"p1": p1, "p2": p2, "p1_wins": g1, "p2_wins": g2, "draws": d})
+        rounds_out.append({"round": r, "matches": matches})
+
+    ranked = sorted(entrants, key=lambda p: (3 * tally[p][0] + tally[p][2]), reverse=True)
+    standings = []
+    for i, p in enumerate(ranked):
+        w, l, d = tally[p]
+        standings.append({
+            "rank": i + 1, "name": p, "deck": deck_of[p], "points": 3 * w + d,
+            "record": f"{w}-{l}-{d}", "wins": w, "losses": l, "draws": d,
+            "omw": 0.5, "gw": 0.5, "ogw": 0.5, "mw": max(w / rounds, 0.33),
+            "payout": 0,
+        })
+
+    return {
+        "id": f"week-{week}",
+        "name": f"Week {week}",
+        "date": "2026-01-01",
+        "week_number": week,
+        "metadata": {"aetherhub_id": str(100000 + week), "players": per_week, "rounds": rounds,
+                     "prize_pool": 105 * (per_week - 1), "top_cut": 0, "to_playing": 1,
+                     "event_cut": 0, "cutoff_points": 9},
+        "standings": standings,
+        "rounds": rounds_out,
+    }
+
+
+def make_history(n_weeks, n_players=300, n_decks=80, per_week=16, rounds=4, seed=1):
+    """Return [(week_num, path, data), ...] shaped like corpus_cache.load_corpus()."""
+    rng = random.Random(seed)
+    players = [f"Player {i:05d}" for i in range(n_players)]
+    decks = [f"Deck {i:03d}" for i in range(n_decks)]
+    return [
+        (wk, f"week-{wk}.json", make_week(wk, rng, players, decks, per_week, rounds))
+        for wk in range(1, n_weeks + 1)
+    ]
@@ -0,0 +1,268 @@
+"""
+check_data.py – Fast whole-corpus integrity check, run before publishing.
+
+One pass over the cached history (models.load_models) checks every week file
+on its own and then the corpus as a whole:
+
+  errors
+    unreadable     a week file that doesn't parse
+    week_number    week_number / id disagree with the file name
+    metadata       metadata.rounds or metadata.players disagree with the data
+    duplicate      a player listed twice in one week's standings
+    record         record string or wins+losses+draws beyond metadata.rounds, or
+                   wins/losses/draws that aren't whole numbers
+    matches        a match player missing from the week's standings
+    player         a name missing from Players.txt
+    deck           a deck missing from Decklist.txt ("unknown" is allowed)
+    aetherhub_id   the same AetherHub tournament stored in two weeks
+  warnings
+    week_number    week_number missing (the file name is used instead)
+    record         fewer results than rounds (usually a drop)
+
+Per-file checks run in worker processes once the history is large enough for
+that to pay off; on today's history the whole check takes a few tens of
+milliseconds.
+
+Errors already present in the history are listed in check_data_baseline.json
+(written with --write-baseline) and don't fail the check; exit status is 1 on
+any error not in the baseline (`--strict`: on any warning too).
+weekly_update.py runs it at the start of each step with the same baseline.
+
+Usage:
+    python check_data.py             # summary + every error
+    python check_data.py --warnings  # list warnings too
+    python check_data.py --json      # machine-readable report
+    python check_data.py --strict
+    python check_data.py --no-baseline     # fail on known errors too
+    python check_data.py --write-baseline  # accept today's errors as known
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import functools
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus_cache import RAW_DIR, SCRIPT_DIR, scan_week_files
+from models import load_models
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+PLAYERS_FILE = os.path.join(SCRIPT_DIR, "Players.txt")
+DECKLIST_FILE = os.path.join(SCRIPT_DIR, "Decklist.txt")
+BASELINE_FILE = os.path.join(SCRIPT_DIR, "check_data_baseline.json")
+
+PARALLEL_MIN_WEEKS = 500   # below this, worker start-up costs more than it saves
+
+
+def load_reference(path):
+    """
+    Non-empty lines of Players.txt / Decklist.txt without the header row, as a set.
+    Same format as verify_data.load_lines, read here directly so the check
+    doesn't pay for verify_data's interactive imports.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [l.strip() for l in f]
+    except FileNotFoundError:
+        return set()
+    if lines and lines[0].lower() in ("name", "deck"):
+        lines = lines[1:]
+    return {l for l in lines if l}
+
+
+def issue_key(issue):
+    return (issue["week"], issue["check"], issue["message"])
+
+
+def load_baseline(path=BASELINE_FILE):
+    """The known errors in *path* as a set of issue_key() tuples (empty if there is no baseline)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {issue_key(issue) for issue in json.load(f)}
+    except FileNotFoundError:
+        return set()
+
+
+def write_baseline(errors, path=BASELINE_FILE):
+    """Store *errors* as the known errors."""
+    known = [{"week": e["week"], "check": e["check"], "message": e["message"]} for e in errors]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(known, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+# ── Per-week checks ─────────────────────────────────────────────────────────
+
+def check_week(item, players=frozenset(), decks=frozenset(), references=True):
+    """
+    Check one (week_num, path, data). Returns a list of
+    {"level", "week", "check", "message"} issues.
+    """
+    week_num, path, data = item
+    issues = []
+
+    def add(level, check, message):
+        issues.append({"level": level, "week": week_num, "check": check, "message": message})
+
+    stored_week = data.get("week_number")
+    if stored_week is None:
+        add("warning", "week_number", "week_number missing")
+    elif stored_week != week_num:
+        add("error", "week_number", f"week_number {stored_week} in {os.path.basename(path)}")
+    if data.get("id") not in (None, f"week-{week_num}"):
+        add("error", "week_number", f"id '{data.get('id')}' in {os.path.basename(path)}")
+
+    meta = data.get("metadata") or {}
+    rounds = data.get("rounds") or []
+    standings = data.get("standings") or []
+    n_rounds = meta.get("rounds")
+    if n_rounds is not None and rounds and n_rounds != len(rounds):
+        add("error", "metadata", f"metadata.rounds is {n_rounds} but {len(rounds)} rounds are stored")
+    if meta.get("players") is not None and meta["players"] != len(standings):
+        add("error", "metadata", f"metadata.players is {meta['players']} but {len(standings)} standings rows")
+
+    names = set()
+    for s in standings:
+        name = s.get("name") or ""
+        if name in names:
+            add("error", "duplicate", f"'{name}' appears twice in the standings")
+        names.add(name)
+
+        w, l, d = s.get("wins", 0), s.get("losses", 0), s.get("draws", 0)
+        whole = all(type(v) is int for v in (w, l, d))   # not isinstance: True is bad data too
+        if not whole:
+            add("error", "record", f"{name}: wins/losses/draws {w!r}/{l!r}/{d!r} aren't whole numbers")
+        elif s.get("record") is not None and s["record"] != f"{w}-{l}-{d}":
+            add("error", "record", f"{name}: record '{s['record']}' but {w}-{l}-{d}")
+        if whole and type(n_rounds) is int:
+            played = w + l + d
+            if played > n_rounds:
+                add("error", "record", f"{name}: {w}-{l}-{d} is more than {n_rounds} rounds")
+            elif played < n_rounds:
+                add("warning", "record", f"{name}: {w}-{l}-{d} in a {n_rounds}-round event")
+
+        if references:
+            if name not in players:
+                add("error", "player", f"'{name}' is not in Players.txt")
+            deck = (s.get("deck") or "").strip()
+            if deck and deck.lower() != "unknown" and deck not in decks:
+                add("error", "deck", f"{name}: deck '{deck}' is not in Decklist.txt")
+
+    missing = set()
+    for rnd in rounds:
+        for m in rnd.get("matches", []):
+            for side in (m.get("p1"), m.get("p2")):
+                if side and side != "BYE" and side not in names:
+                    missing.add(side)
+    for name in sorted(missing):
+        add("error", "matches", f"'{name}' plays in the rounds but isn't in the standings")
+
+    return issues
+
+
+# ── Whole corpus ────────────────────────────────────────────────────────────
+
+def check(corpus=None, raw_dir=RAW_DIR, references=True, jobs=None, players=None, decks=None):
+    """
+    Check the whole corpus. *references*=False skips the Players.txt /
+    Decklist.txt checks (e.g. before a new week has been verified); *players*
+    and *decks* are sets to use instead of reading those files.
+    Returns {"weeks", "errors", "warnings", "elapsed_ms"}.
+    """
+    t0 = time.perf_counter()
+    if corpus is None:
+        corpus = load_models(raw_dir)
+    if not references:
+        players = decks = frozenset()
+    if players is None:
+        players = load_reference(PLAYERS_FILE)
+    if decks is None:
+        decks = load_reference(DECKLIST_FILE)
+    worker = functools.partial(check_week, players=players, decks=decks, references=references)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(corpus) >= PARALLEL_MIN_WEEKS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            per_week = list(pool.map(worker, corpus, chunksize=max(1, len(corpus) // (jobs * 4))))
+    else:
+        per_week = [worker(item) for item in corpus]
+    issues = [issue for week in per_week for issue in week]
+
+    # Cross-file checks
+    loaded = {path for _wn, path, _data in corpus}
+    for wn, path, _st in scan_week_files(raw_dir):
+        if path not in loaded:
+            issues.append({"level": "error", "week": wn, "check": "unreadable",
+                           "message": f"{os.path.basename(path)} could not be read as JSON"})
+
+    by_id = defaultdict(list)
+    for wn, _path, data in corpus:
+        aetherhub_id = (data.get("metadata") or {}).get("aetherhub_id")
+        if aetherhub_id:
+            by_id[str(aetherhub_id)].append(wn)
+    for aetherhub_id, weeks in by_id.items():
+        if len(weeks) > 1:
+            issues.append({"level": "error", "week": weeks[-1], "check": "aetherhub_id",
+                           "message": f"AetherHub tournament {aetherhub_id} is stored in weeks "
+                                      f"{', '.join(map(str, weeks))}"})
+
+    issues.sort(key=lambda i: (i["week"], i["check"]))
+    return {
+        "weeks": len(corpus),
+        "errors": [i for i in issues if i["level"] == "error"],
+        "warnings": [i for i in issues if i["level"] == "warning"],
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def print_report(report, show_warnings=False, known=frozenset()):
+    n_known = sum(issue_key(e) in known for e in report["errors"])
+    print(f"Checked {report['weeks']} weeks in {report['elapsed_ms']:.0f} ms: "
+          f"{len(report['errors'])} errors ({n_known} known), {len(report['warnings'])} warnings.")
+    shown = report["errors"] + (report["warnings"] if show_warnings else [])
+    for issue in sorted(shown, key=lambda i: (i["week"], i["level"], i["check"])):
+        if issue["level"] == "error":
+            mark = "·" if issue_key(issue) in known else "✗"
+        else:
+            mark = "!"
+        print(f"  {mark} week-{issue['week']:<4} {issue['check']:<12} {issue['message']}")
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the raw week files for broken data.")
+    parser.add_argument("--warnings", action="store_true", help="List warnings as well as errors.")
+    parser.add_argument("--no-references", action="store_true",
+                        help="Skip the Players.txt / Decklist.txt checks.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--strict", action="store_true", help="Exit non-zero on warnings too.")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Fail on the known errors in check_data_baseline.json too.")
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Record every current error as known and exit.")
+    args = parser.parse_args()
+
+    report = check(references=not args.no_references, jobs=args.jobs)
+    if args.write_baseline:
+        write_baseline(report["errors"])
+        print(f"Wrote {len(report['errors'])} known errors to {os.path.relpath(BASELINE_FILE)}")
+        return
+
+    known = frozenset() if args.no_baseline else load_baseline()
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, show_warnings=args.warnings, known=known)
+
+    new_errors = [e for e in report["errors"] if issue_key(e) not in known]
+    failed = new_errors or (args.strict and report["warnings"])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,79 @@
-import os
-import sys
+"""
+cleanup_decks.py – Rename a deck, or merge it into another, across all weeks.
 
-# Define paths
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-RAW_DATA_DIR = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "raw")
+Looks the deck up in the league_db deck index, so only week files that
+actually play it are opened, and only their `deck` fields are changed; player
+names and longer deck names that merely contain the text are left alone.
+Decklist.txt is updated at the same time: the old name is dropped, and the new
+one is added if it isn't listed yet (a rename) or kept as is (a merge).
 
-def main():
-    if len(sys.argv) != 3:
-        print(f"Usage: python {os.path.basename(__file__)} <search> <replace>")
-        print(f"Example: python {os.path.basename(__file__)} Stiflenought Dreadnought")
-        sys.exit(1)
+Usage:
+    python cleanup_decks.py <old> <new> [--dry-run]
+    python cleanup_decks.py Stiflenought Dreadnought
+"""
+
+import argparse
+
+import league_db
+from verify_data import DECKLIST_FILE, load_lines, save_lines
+from week_tx import WeekTransaction
 
-    search = sys.argv[1]
-    replace = sys.argv[2]
 
-    print(f"Scanning {RAW_DATA_DIR} for '{search}' → '{replace}'...")
+def rename_deck(old, new, dry_run=False):
+    """
+    Replace deck *old* with *new* in every standings row and in Decklist.txt.
+    Returns [(week, player), ...] for the rows that changed.
+    """
+    conn = league_db.open_store()
+    rows = league_db.deck_rows(conn, old)
+    conn.close()
 
-    modified_count = 0
-    files = [f for f in os.listdir(RAW_DATA_DIR) if f.endswith(".json")]
+    tx = WeekTransaction()
+    changed = []
+    for path, row, week, player in rows:
+        data = tx.load(path)
+        entry = data["standings"][row]
+        # The index is synced on open, but never trust it over the file itself
+        if (entry.get("deck") or "").strip() != old.strip() or entry.get("name") != player:
+            print(f"  !! week-{week} row {row} no longer matches the index — skipped")
+            continue
+        entry["deck"] = new
+        tx.stage(path, data)
+        changed.append((week, player))
 
-    for filename in files:
-        filepath = os.path.join(RAW_DATA_DIR, filename)
+    decks = load_lines(DECKLIST_FILE)
+    merge = new in decks
+    new_decks = [d for d in decks if d != old] + ([] if merge else [new])
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
+    if dry_run:
+        print(tx.diff(), end="")
+    else:
+        tx.commit()
+        if sorted(set(new_decks)) != sorted(set(decks)):
+            save_lines(DECKLIST_FILE, None, new_decks)
+    return changed, merge
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename or merge a deck across all raw week files.")
+    parser.add_argument("old", help="Deck name to replace (exact, surrounding spaces ignored)")
+    parser.add_argument("new", help="Deck name to use instead")
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff, write nothing.")
+    args = parser.parse_args()
 
-            if search in content:
-                print(f"Modifying {filename}...")
-                new_content = content.replace(search, replace)
+    if args.old.strip() == args.new.strip():
+        parser.error("old and new deck names are the same")
 
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+    changed, merge = rename_deck(args.old, args.new, dry_run=args.dry_run)
 
-                modified_count += 1
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
+    verb = "Would change" if args.dry_run else "Changed"
+    weeks = {week for week, _player in changed}
+    print(f"{verb} {len(changed)} entries in {len(weeks)} week files: '{args.old}' → '{args.new}'")
+    for week, player in changed:
+        print(f"  week-{week:<4} {player}")
+    action = "merged into existing" if merge else "renamed to"
+    print(f"Decklist.txt: '{args.old}' {action} '{args.new}'" + (" (dry run)" if args.dry_run else ""))
 
-    print(f"Done. Modified {modified_count} files.")
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,13 @@
-import pandas as pd
 import json
 import os
-import re
-import glob
 from datetime import datetime
 import math
+import time
+import argparse
+
+from corpus_cache import WEEK_FILE_RE, load_corpus, scan_week_files
+import ratings
+import win_rates
 
 # --- CONFIGURATION ---
 # Determine Project Root (Parent of 'scripts' folder)
@@ -17,6 +20,9 @@ DATA_DIR = os.path.join(WEBAPP_DIR, "public", "data")
 RAW_DIR = os.path.join(DATA_DIR, "raw")
 DB_PATH = os.path.join(DATA_DIR, "db.json")
 
+# Reference lists written by verify_data.py alongside the raw files (watched in --watch mode)
+WATCH_EXTRA = [os.path.join(SCRIPT_DIR, "Players.txt"), os.path.join(SCRIPT_DIR, "Decklist.txt")]
+
 # Best X results count for each league
 LEAGUE_RULES = {
     "spring-2026": 7,
@@ -83,10 +89,11 @@ def update_league_stats(league, t_data):
         if w == 3 and l == 0 and d == 0:  stats["three_ohs"] += 1
         if w == 3 and l == 1 and d == 0:  stats["three_ones"] += 1
 
-def main():
-    print(f"Converting Excel data to Single DB...")
-    ensure_dirs()
-    
+def build_db(corpus, verbose=True):
+    """
+    Aggregate [(week_num, path, data), ...] (sorted by week) into the db.json structure.
+    Tournament dicts are normalized in place.
+    """
     # --- RESET DB STATES ---
     tournaments = {}
     leagues = {}
@@ -101,73 +108,55 @@ def main():
     }
 
     # --- INGEST NEW JSON FILES ---
-    if os.path.exists(RAW_DIR):
-        # Sort files by week number ensuring correct order
-        json_files = glob.glob(f"{RAW_DIR}/*.json")
-        
-        def get_week_num(filename):
-            try:
-                # Use simplified regex to be safer slightly
-                return int(re.search(r'week-(\d+)', filename).group(1))
-            except:
-                return 0
-        
-        # Sort by week number ASCENDING
-        json_files.sort(key=get_week_num)
+    # Parsed files come from the binary corpus cache, already sorted by week number ASCENDING
+    for file_week, jf, t_data in corpus:
+        if verbose: print(f"Reading JSON {jf}...")
+        try:
+            # Ensure minimal schema matching
+            week_num = t_data.get("week_number", 0)
+            if week_num == 0:
+                week_num = file_week
 
-        for jf in json_files:
-            print(f"Reading JSON {jf}...")
-            try:
-                with open(jf, "r", encoding="utf-8") as f:
-                    t_data = json.load(f)
-                    
-                    # Ensure minimal schema matching
-                    week_num = t_data.get("week_number", 0)
-                    if week_num == 0:
-                         try:
-                             week_num = int(re.search(r'week-(\d+)', jf).group(1))
-                         except: pass
-
-                    league_id, league_name = get_league_info(week_num)
-                    t_data["league_id"] = league_id
-                    
-                    # Normalize standings keys if needed (already matches mostly)
-                    # output from scraper: {name, points, w, l, d...}
-                    # target: {rank, name, deck, points, record, wins, losses, draws...}
-                    
-                    for i, p in enumerate(t_data["standings"]):
-                        if "rank" not in p: p["rank"] = i + 1
-                        if "deck" not in p: p["deck"] = ""
-                        if "record" not in p: p["record"] = f"{p.get('w',0)}-{p.get('l',0)}-{p.get('d',0)}"
-                        # Map keys if slightly different
-                        if "wins" not in p: p["wins"] = p.get("w", 0)
-                        if "losses" not in p: p["losses"] = p.get("l", 0)
-                        if "draws" not in p: p["draws"] = p.get("d", 0)
-                    
-                    t_id = t_data["id"]
-                    tournaments[t_id] = t_data
-
-                    # Add to Leagues
-                    if league_id != "off-season":
-                        if league_id not in leagues:
-                             leagues[league_id] = {
-                                "id": league_id,
-                                "name": league_name,
-                                "tournaments": [],
-                                "players": {},
-                                "is_all_time": False
-                            }
-                        if t_id not in leagues[league_id]["tournaments"]:
-                            leagues[league_id]["tournaments"].append(t_id)
-                            update_league_stats(leagues[league_id], t_data)
-                    
-                    # All-time
-                    if t_id not in leagues["all-time"]["tournaments"]:
-                         leagues["all-time"]["tournaments"].append(t_id)
-                         update_league_stats(leagues["all-time"], t_data)
-                         
-            except Exception as e:
-                print(f"Error reading JSON {jf}: {e}")
+            league_id, league_name = get_league_info(week_num)
+            t_data["league_id"] = league_id
+
+            # Normalize standings keys if needed (already matches mostly)
+            # output from scraper: {name, points, w, l, d...}
+            # target: {rank, name, deck, points, record, wins, losses, draws...}
+
+            for i, p in enumerate(t_data["standings"]):
+                if "rank" not in p: p["rank"] = i + 1
+                if "deck" not in p: p["deck"] = ""
+                if "record" not in p: p["record"] = f"{p.get('w',0)}-{p.get('l',0)}-{p.get('d',0)}"
+                # Map keys if slightly different
+                if "wins" not in p: p["wins"] = p.get("w", 0)
+                if "losses" not in p: p["losses"] = p.get("l", 0)
+                if "draws" not in p: p["draws"] = p.get("d", 0)
+
+            t_id = t_data["id"]
+            tournaments[t_id] = t_data
+
+            # Add to Leagues
+            if league_id != "off-season":
+                if league_id not in leagues:
+                     leagues[league_id] = {
+                        "id": league_id,
+                        "name": league_name,
+                        "tournaments": [],
+                        "players": {},
+                        "is_all_time": False
+                    }
+                if t_id not in leagues[league_id]["tournaments"]:
+                    leagues[league_id]["tournaments"].append(t_id)
+                    update_league_stats(leagues[league_id], t_data)
+
+            # All-time
+            if t_id not in leagues["all-time"]["tournaments"]:
+                 leagues["all-time"]["tournaments"].append(t_id)
+                 update_league_stats(leagues["all-time"], t_data)
+
+        except Exception as e:
+            print(f"Error reading JSON {jf}: {e}")
 
     # Finalize Leagues (Sort standings with rules)
     final_leagues = []
@@ -253,15 +242,154 @@ def main():
     final_leagues.sort(key=lambda x: (1 if x["id"] != "all-time" else 0, league_sorter(x)), reverse=True)
 
     # Output DB
-    db = {
+    return {
         "leagues": final_leagues,
         "tournaments": tournaments
     }
-    
-    with open(DB_PATH, "w") as out:
+
+def write_db(db, path=DB_PATH, corpus=None):
+    """
+    Write db.json atomically so readers (e.g. the Vite dev server) never see a
+    partial file, and bring ratings.json and stats.json next to it up to date
+    (from *corpus* if the caller has the raw files loaded already).
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w") as out:
         json.dump(db, out, indent=2)
+    os.replace(tmp, path)
+    ratings.update(os.path.join(os.path.dirname(path), "ratings.json"))
+    win_rates.update(os.path.join(os.path.dirname(path), "stats.json"), corpus=corpus)
+
+def rebuild(changed_paths=None, db_path=DB_PATH, verbose=False, corpus=None):
+    """
+    Rebuild db.json from every raw week file (or *corpus*, [(week_num, path,
+    data), ...], if the caller has it loaded). The corpus cache only re-parses
+    files that changed, so a full rebuild is cheap. *changed_paths* (raw week
+    files just written) only decide which leagues are reported as affected:
+    each file's league before and after the edit, plus all-time.
+    Returns {"tournaments": n, "leagues": [affected league ids]}.
+    """
+    old_leagues = {}
+    if changed_paths is not None:
+        try:
+            with open(db_path, "r", encoding="utf-8") as f:
+                old_leagues = {t_id: t.get("league_id") for t_id, t in json.load(f)["tournaments"].items()}
+        except (OSError, json.JSONDecodeError, KeyError):
+            pass
+
+    if corpus is None:
+        corpus = load_corpus(RAW_DIR)
+    new_db = build_db(corpus, verbose=verbose)
+    write_db(new_db, db_path, corpus)
+
+    if changed_paths is None:
+        affected = {l["id"] for l in new_db["leagues"]}
+    else:
+        by_path = {path: data for _wn, path, data in corpus}
+        affected = {"all-time"}
+        for path in changed_paths:
+            data = by_path.get(os.path.abspath(path), {})
+            t_ids = {f"week-{WEEK_FILE_RE.search(path).group(1)}", data.get("id")}
+            affected |= {old_leagues.get(t_id) for t_id in t_ids}   # league it left
+            affected.add(data.get("league_id"))                     # league it's in now
+    return {"tournaments": len(new_db["tournaments"]),
+            "leagues": sorted(affected - {None, "off-season"})}
+
+# --- WATCH MODE ---
+def watched_files():
+    """Return {path: (mtime_ns, size)} for every input the watch mode reacts to."""
+    sigs = {}
+    for _wn, path, st in scan_week_files(RAW_DIR):
+        sigs[path] = (st.st_mtime_ns, st.st_size)
+    for path in WATCH_EXTRA:
+        try:
+            st = os.stat(path)
+            sigs[path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+    return sigs
+
+def watch(interval=0.1, debounce=0.3):
+    """
+    Poll the raw folder, Players.txt and Decklist.txt. Once a burst of writes has
+    been quiet for *debounce* seconds, re-parse only the changed week files and
+    atomically rewrite db.json (skipped when the output didn't change).
+    """
+    corpus = {path: (wn, data) for wn, path, data in load_corpus(RAW_DIR)}
+    sigs = watched_files()
+    last_output = None
+
+    def _on_change(changed):
+        nonlocal last_output
+        for path in changed:
+            if not path.startswith(os.path.abspath(RAW_DIR)):
+                continue
+            if path not in sigs:
+                corpus.pop(path, None)
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    corpus[path] = (int(WEEK_FILE_RE.search(path).group(1)), json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                # Most likely caught mid-save; the next write will trigger another rebuild
+                print(f"Error reading JSON {path}: {e}")
+                corpus.pop(path, None)
+
+        ordered = sorted(((wn, path, data) for path, (wn, data) in corpus.items()), key=lambda x: x[0])
+        db = build_db(ordered, verbose=False)
+        output = json.dumps(db, indent=2)
+        if output == last_output:
+            return False
+        write_db(db)
+        last_output = output
+        return True
+
+    t0 = time.perf_counter()
+    _on_change([])
+    print(f"Watching {RAW_DIR} (+ Players.txt, Decklist.txt) — built db.json in "
+          f"{(time.perf_counter() - t0) * 1000:.0f} ms. Ctrl-C to stop.")
+
+    pending = set()
+    last_change = 0.0
+    try:
+        while True:
+            time.sleep(interval)
+            current = watched_files()
+            changed = {p for p in set(current) | set(sigs) if current.get(p) != sigs.get(p)}
+            sigs = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+                continue
+            if pending and time.monotonic() - last_change >= debounce:
+                t0 = time.perf_counter()
+                names = ", ".join(sorted(os.path.basename(p) for p in pending))
+                wrote = _on_change(pending)
+                status = "rebuilt db.json" if wrote else "no changes to db.json"
+                print(f"[{datetime.now():%H:%M:%S}] {names} → {status} "
+                      f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+                pending = set()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild db.json from the raw week files.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild whenever raw files, Players.txt or Decklist.txt change.")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="Seconds of quiet after a burst of writes before rebuilding (watch mode).")
+    args = parser.parse_args()
+
+    ensure_dirs()
+    if args.watch:
+        watch(debounce=args.debounce)
+        return
+
+    print(f"Converting Excel data to Single DB...")
+    db = build_db(load_corpus(RAW_DIR))
+    write_db(db)
 
-    print(f"Success! Rebuilt db.json with {len(tournaments)} tournaments and {len(final_leagues)} leagues.")
+    print(f"Success! Rebuilt db.json with {len(db['tournaments'])} tournaments and {len(db['leagues'])} leagues.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,180 @@
+"""
+corpus_cache.py – Binary parse cache for the raw week-*.json corpus.
+
+Parsing 100+ JSON files is most of the startup time of every script that needs
+history. This module keeps a pickled snapshot of the parsed corpus in
+`.cache/corpus.pickle` and validates each entry against the file's
+mtime/size (and, if those changed, its content hash), so only stale files are
+re-parsed and the whole corpus loads with a single read.
+
+The cache file is replaced atomically (unique temp file + os.replace), so
+concurrent writers can never leave a half-written snapshot behind; the worst
+case is a lost update, which just means a file gets re-parsed next time.
+
+Usage:
+    from corpus_cache import load_corpus
+    for week_num, path, data in load_corpus():
+        ...
+
+    python corpus_cache.py            # refresh the cache and print timings
+    python corpus_cache.py --clear    # delete the cache
+"""
+
+import gc
+import os
+import re
+import json
+import time
+import pickle
+import hashlib
+import argparse
+import tempfile
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RAW_DIR = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "raw")
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+CACHE_PATH = os.path.join(CACHE_DIR, "corpus.pickle")
+
+CACHE_VERSION = 2
+WEEK_FILE_RE = re.compile(r"week-(\d+)\.json$")
+
+
+# ── Pickle snapshots ────────────────────────────────────────────────────────
+
+def read_snapshot(path, version):
+    """Return the payload of a pickled snapshot, or None if missing, corrupt or outdated."""
+    # Unpickling allocates many small containers; pausing the cyclic GC keeps
+    # it from rescanning the half-built graph and makes load time linear.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.loads(f.read())
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if not isinstance(snapshot, dict) or snapshot.get("version") != version:
+        return None
+    return snapshot.get("payload")
+
+
+def write_snapshot(path, version, payload):
+    """Atomically replace *path* with a pickled snapshot of *payload*."""
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(path) + "-", suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": version, "payload": payload}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only or contended cache dir must never break the caller
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ── Loading ─────────────────────────────────────────────────────────────────
+
+def scan_week_files(raw_dir=RAW_DIR):
+    """Return [(week_num, path, stat_result), ...] for every week-*.json in *raw_dir*."""
+    found = []
+    try:
+        with os.scandir(raw_dir) as it:
+            for entry in it:
+                m = WEEK_FILE_RE.match(entry.name)
+                if m and entry.is_file():
+                    found.append((int(m.group(1)), os.path.abspath(entry.path), entry.stat()))
+    except FileNotFoundError:
+        pass
+    return found
+
+
+def load_corpus(raw_dir=RAW_DIR, cache_path=CACHE_PATH, version=CACHE_VERSION, convert=None):
+    """
+    Return [(week_num, path, data), ...] for every raw week file, sorted by week.
+
+    Entries whose mtime/size match the snapshot are served from the cache; the
+    rest are read, hashed, and only re-parsed if the content actually changed.
+    Files that fail to parse are reported and left out.
+
+    *convert*, if given, turns each parsed dict into what is cached and
+    returned instead (models.load_models keeps slotted records this way, in
+    its own *cache_path* and *version*).
+    """
+    # {path: (mtime_ns, size, digest, data)}
+    cached = read_snapshot(cache_path, version) or {}
+    entries = {}
+    corpus = []
+    dirty = False
+
+    for week_num, path, st in scan_week_files(raw_dir):
+        hit = cached.get(path)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            entries[path] = hit
+            corpus.append((week_num, path, hit[3]))
+            continue
+
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Error reading JSON {path}: {e}")
+            continue
+
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if hit and hit[2] == digest:
+            data = hit[3]
+        else:
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                print(f"Error reading JSON {path}: {e}")
+                continue
+            if convert is not None:
+                data = convert(data)
+
+        entries[path] = (st.st_mtime_ns, st.st_size, digest, data)
+        corpus.append((week_num, path, data))
+        dirty = True
+
+    if dirty or len(entries) != len(cached):
+        write_snapshot(cache_path, version, entries)
+
+    corpus.sort(key=lambda x: x[0])
+    return corpus
+
+
+def clear_cache(cache_path=CACHE_PATH):
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the binary parse cache of raw week files.")
+    parser.add_argument("--clear", action="store_true", help="Delete the cache file.")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+        print(f"Removed {CACHE_PATH}")
+        return
+
+    t0 = time.perf_counter()
+    corpus = load_corpus()
+    t1 = time.perf_counter()
+    load_corpus()
+    t2 = time.perf_counter()
+    print(f"Cache: {CACHE_PATH}")
+    print(f"  {len(corpus)} week files  |  refresh: {(t1 - t0) * 1000:.1f} ms  |  "
+          f"warm load: {(t2 - t1) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
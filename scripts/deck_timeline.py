@@ -0,0 +1,244 @@
+"""
+deck_timeline.py – Persisted, incrementally maintained player → deck timeline.
+
+Keeps a {player: [(week, deck), ...]} index sorted by week in
+`.cache/deck_timeline.pickle`, so deck suggestions and unknown-deck lookups
+don't need to rebuild it from the whole corpus on every run.
+
+Writers call `record_week(path, data)` after saving a week file (or
+`record_weeks` for a batch, saving the index once); the index only replaces
+those weeks' entries. On open, any week file whose mtime/size no
+longer matches the index (hand edits, git pulls) is refreshed the same way.
+
+Queries are binary searches over each player's sorted weeks:
+    timeline.deck_at_or_before("Tormod Lang", 90)   → (89, "Cephalid Breakfast")
+    timeline.deck_after("Tormod Lang", 90)          → (92, "...")
+    timeline.recent_decks("Tormod Lang", count=3)   → ["...", "...", "..."]
+
+Usage:
+    python deck_timeline.py "Player Name"   # print a player's timeline
+"""
+
+import os
+import json
+import argparse
+from bisect import bisect_left, bisect_right
+
+from corpus_cache import (
+    CACHE_DIR, RAW_DIR, WEEK_FILE_RE,
+    load_corpus, read_snapshot, write_snapshot, scan_week_files,
+)
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+TIMELINE_PATH = os.path.join(CACHE_DIR, "deck_timeline.pickle")
+
+TIMELINE_VERSION = 1
+
+
+def is_known_deck(deck):
+    """A deck counts as known if it's set and isn't the "unknown" placeholder."""
+    return bool(deck) and deck.strip().lower() != "unknown"
+
+
+class _PlayerLine:
+    """Parallel, week-sorted lists for one player (all entries + known decks only)."""
+
+    __slots__ = ("weeks", "decks", "known_weeks", "known_decks")
+
+    def __init__(self):
+        self.weeks, self.decks = [], []
+        self.known_weeks, self.known_decks = [], []
+
+    @staticmethod
+    def _insert(weeks, decks, week, deck):
+        i = bisect_right(weeks, week)
+        weeks.insert(i, week)
+        decks.insert(i, deck)
+
+    @staticmethod
+    def _remove(weeks, decks, week):
+        lo, hi = bisect_left(weeks, week), bisect_right(weeks, week)
+        del weeks[lo:hi]
+        del decks[lo:hi]
+
+    def add(self, week, deck):
+        self._insert(self.weeks, self.decks, week, deck)
+        if is_known_deck(deck):
+            self._insert(self.known_weeks, self.known_decks, week, deck)
+
+    def remove_week(self, week):
+        self._remove(self.weeks, self.decks, week)
+        self._remove(self.known_weeks, self.known_decks, week)
+
+
+class DeckTimeline:
+    def __init__(self):
+        self.players = {}   # name → _PlayerLine
+        self.weeks = {}     # week → {"path", "sig", "entries": [(name, deck), ...]}
+        self.dirty = False
+
+    # ── Maintenance ─────────────────────────────────────────────────────
+
+    def remove_week(self, week):
+        """Drop every entry recorded for *week*."""
+        info = self.weeks.pop(week, None)
+        if info is None:
+            return
+        for name in {name for name, _deck in info["entries"]}:
+            line = self.players.get(name)
+            if line is None:
+                continue
+            line.remove_week(week)
+            if not line.weeks:
+                del self.players[name]
+        self.dirty = True
+
+    def update_week(self, week, data, path=None, sig=None):
+        """Replace the entries for *week* with the standings in *data*."""
+        self.remove_week(week)
+        entries = []
+        for entry in data.get("standings", []):
+            name = entry.get("name")
+            if not name:
+                continue
+            deck = (entry.get("deck") or "").strip()
+            entries.append((name, deck))
+            self.players.setdefault(name, _PlayerLine()).add(week, deck)
+        self.weeks[week] = {"path": path, "sig": sig, "entries": entries}
+        self.dirty = True
+
+    def refresh(self, raw_dir=RAW_DIR):
+        """Re-index week files that changed on disk since they were last recorded."""
+        on_disk = {wn: (path, (st.st_mtime_ns, st.st_size)) for wn, path, st in scan_week_files(raw_dir)}
+        stale = {wn for wn, (_path, sig) in on_disk.items()
+                 if self.weeks.get(wn, {}).get("sig") != sig}
+
+        for wn in set(self.weeks) - set(on_disk):
+            self.remove_week(wn)
+
+        if stale:
+            for wn, path, data in load_corpus(raw_dir):
+                if wn in stale:
+                    self.update_week(wn, data, path, on_disk[wn][1])
+
+    def save(self, path=TIMELINE_PATH):
+        if self.dirty:
+            write_snapshot(path, TIMELINE_VERSION, {"players": self.players, "weeks": self.weeks})
+            self.dirty = False
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def history(self, player):
+        """Return [(week, deck), ...] for a player, oldest first (including unknown/empty decks)."""
+        line = self.players.get(player)
+        return list(zip(line.weeks, line.decks)) if line else []
+
+    def deck_at_or_before(self, player, week):
+        """Latest known (week, deck) for *player* at or before *week*, or None."""
+        line = self.players.get(player)
+        if not line:
+            return None
+        i = bisect_right(line.known_weeks, week)
+        return (line.known_weeks[i - 1], line.known_decks[i - 1]) if i else None
+
+    def deck_before(self, player, week):
+        """Latest known (week, deck) for *player* strictly before *week*, or None."""
+        return self.deck_at_or_before(player, week - 1)
+
+    def deck_after(self, player, week):
+        """Earliest known (week, deck) for *player* strictly after *week*, or None."""
+        line = self.players.get(player)
+        if not line:
+            return None
+        i = bisect_right(line.known_weeks, week)
+        return (line.known_weeks[i], line.known_decks[i]) if i < len(line.known_weeks) else None
+
+    def recent_decks(self, player, count=3, exclude_week=None):
+        """Up to *count* most recent distinct non-empty decks for a player, newest first."""
+        line = self.players.get(player)
+        if not line:
+            return []
+        seen = set()
+        recent = []
+        for week, deck in zip(reversed(line.weeks), reversed(line.decks)):
+            if week == exclude_week or not deck or deck in seen:
+                continue
+            seen.add(deck)
+            recent.append(deck)
+            if len(recent) >= count:
+                break
+        return recent
+
+
+# ── Public helpers ──────────────────────────────────────────────────────────
+
+def open_timeline(path=TIMELINE_PATH, raw_dir=RAW_DIR):
+    """Load the persisted timeline, bring it up to date with the raw files and save it."""
+    timeline = DeckTimeline()
+    payload = read_snapshot(path, TIMELINE_VERSION)
+    if payload:
+        timeline.players = payload["players"]
+        timeline.weeks = payload["weeks"]
+    timeline.refresh(raw_dir)
+    timeline.save(path)
+    return timeline
+
+
+def week_of(path):
+    """Week number of a raw file path (e.g. .../week-89.json → 89)."""
+    m = WEEK_FILE_RE.search(os.path.basename(path))
+    return int(m.group(1)) if m else 0
+
+
+def record_week(path, data=None, timeline_path=TIMELINE_PATH):
+    """
+    Update the persisted timeline after *path* has been written.
+    Call this from any script that saves a raw week file.
+    """
+    record_weeks([(path, data)], timeline_path)
+
+
+def record_weeks(items, timeline_path=TIMELINE_PATH):
+    """
+    record_week() for many files at once: [(path, data or None), ...] are
+    applied to one loaded timeline, which is saved once.
+    """
+    items = [(path, data) for path, data in items if week_of(path)]
+    if not items:
+        return
+
+    timeline = DeckTimeline()
+    payload = read_snapshot(timeline_path, TIMELINE_VERSION)
+    if payload is None:
+        # No index yet — build it in full on next open instead
+        return
+    timeline.players = payload["players"]
+    timeline.weeks = payload["weeks"]
+
+    for path, data in items:
+        if data is None:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        st = os.stat(path)
+        timeline.update_week(week_of(path), data, os.path.abspath(path), (st.st_mtime_ns, st.st_size))
+    timeline.save(timeline_path)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a player's deck timeline.")
+    parser.add_argument("player", help="Player name as it appears in Players.txt")
+    args = parser.parse_args()
+
+    timeline = open_timeline()
+    entries = timeline.history(args.player)
+    if not entries:
+        print(f"No entries for \"{args.player}\".")
+        return
+    for week, deck in entries:
+        print(f"  week-{week:<4} {deck or '(none)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,82 +4,7 @@ show the player's last known and next known deck, and allow
 interactive replacement.
 """
 
-import json
-import os
-import re
-import sys
-
-RAW_DIR = os.path.join(os.path.dirname(__file__), "..", "webapp", "public", "data", "raw")
-
-def load_all_weeks():
-    """Load all week JSON files sorted by week number."""
-    weeks = []
-    for fname in os.listdir(RAW_DIR):
-        m = re.match(r"week-(\d+)\.json", fname)
-        if m:
-            week_num = int(m.group(1))
-            path = os.path.join(RAW_DIR, fname)
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            weeks.append((week_num, fname, path, data))
-    weeks.sort(key=lambda x: x[0])
-    return weeks
-
-def build_player_timeline(weeks):
-    """Build a dict: player_name -> list of (week_num, deck) sorted by week."""
-    timeline = {}
-    for week_num, fname, path, data in weeks:
-        for entry in data.get("standings", []):
-            name = entry.get("name")
-            deck = entry.get("deck", "unknown")
-            if name:
-                if name not in timeline:
-                    timeline[name] = []
-                timeline[name].append((week_num, deck))
-    for name in timeline:
-        timeline[name].sort(key=lambda x: x[0])
-    return timeline
-
-def find_unknown_entries(weeks, timeline):
-    """
-    For each unknown deck entry, find last and next known deck for that player.
-    Returns list of dicts with context info.
-    """
-    results = []
-    for week_num, fname, path, data in weeks:
-        for i, entry in enumerate(data.get("standings", [])):
-            name = entry.get("name")
-            deck = entry.get("deck", "unknown")
-            if deck.lower() == "unknown":
-                # Find prev/next known deck in that player's timeline
-                player_history = timeline.get(name, [])
-                prev_deck = None
-                next_deck = None
-                for (wn, dk) in player_history:
-                    if wn < week_num and dk.lower() != "unknown":
-                        prev_deck = (wn, dk)
-                for (wn, dk) in player_history:
-                    if wn > week_num and dk.lower() != "unknown":
-                        next_deck = (wn, dk)
-                        break
-                results.append({
-                    "week_num": week_num,
-                    "fname": fname,
-                    "path": path,
-                    "standing_index": i,
-                    "player": name,
-                    "prev_deck": prev_deck,  # (week_num, deck) or None
-                    "next_deck": next_deck,  # (week_num, deck) or None
-                })
-    return results
-
-def apply_replacement(entry, new_deck):
-    """Write the new deck value into the JSON file."""
-    with open(entry["path"], "r", encoding="utf-8") as f:
-        data = json.load(f)
-    data["standings"][entry["standing_index"]]["deck"] = new_deck
-    with open(entry["path"], "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from unknown_resolver import StopResolving, find_unknowns, resolve, apply_changes
 
 def color(text, code):
     """ANSI color helper."""
@@ -87,9 +12,7 @@ def color(text, code):
 
 def run_interactive():
     print(color("Loading week files...", "36"))
-    weeks = load_all_weeks()
-    timeline = build_player_timeline(weeks)
-    unknowns = find_unknown_entries(weeks, timeline)
+    unknowns = find_unknowns()
 
     if not unknowns:
         print(color("No unknown decks found!", "32"))
@@ -103,9 +26,10 @@ def run_interactive():
     print(color("  [c] = type a CUSTOM deck name", "35"))
     print(color("  [q] = quit (saves progress so far)\n", "31"))
 
-    changes = []
+    counter = iter(range(1, len(unknowns) + 1))
 
-    for idx, entry in enumerate(unknowns):
+    def ask(entry):
+        """Interactive strategy: prompt for one entry."""
         prev = entry["prev_deck"]
         next_ = entry["next_deck"]
 
@@ -113,7 +37,7 @@ def run_interactive():
         next_str = color(f"Week {next_[0]}: {next_[1]}", "34") if next_ else color("(none)", "90")
 
         print(f"─" * 60)
-        print(f"[{idx+1}/{len(unknowns)}] {color(entry['player'], '1')}  ─  {color('Week ' + str(entry['week_num']), '33')}")
+        print(f"[{next(counter)}/{len(unknowns)}] {color(entry['player'], '1')}  ─  {color('Week ' + str(entry['week_num']), '33')}")
         print(f"  PREV: {prev_str}")
         print(f"  NEXT: {next_str}")
 
@@ -130,11 +54,7 @@ def run_interactive():
 
             if choice == "q":
                 print(color("\nQuitting. Applying all decisions made so far...", "31"))
-                for c in changes:
-                    apply_replacement(c["entry"], c["new_deck"])
-                    print(f"  ✓ {c['entry']['player']} week-{c['entry']['week_num']} → {c['new_deck']}")
-                print(color(f"\nDone. Applied {len(changes)} change(s).", "32"))
-                sys.exit(0)
+                raise StopResolving
             elif choice == "p" and prev:
                 new_deck = prev[1]
                 break
@@ -142,8 +62,8 @@ def run_interactive():
                 new_deck = next_[1]
                 break
             elif choice == "k":
-                new_deck = "unknown"
-                break
+                print(f"  {color('→ kept unknown', '33')}\n")
+                return None
             elif choice == "c":
                 new_deck = input("  Enter deck name: ").strip()
                 if new_deck:
@@ -152,20 +72,17 @@ def run_interactive():
             else:
                 print(color("  Invalid choice, try again.", "31"))
 
-        changes.append({"entry": entry, "new_deck": new_deck})
-        action = color(f"→ {new_deck}", "32") if new_deck != "unknown" else color("→ kept unknown", "33")
-        print(f"  {action}\n")
+        print(f"  {color(f'→ {new_deck}', '32')}\n")
+        return new_deck, choice
+
+    changes, _kept = resolve(unknowns, ask)
 
     print(color("─" * 60, "90"))
-    print(color(f"All {len(unknowns)} entries reviewed. Applying changes...", "36"))
-    applied = 0
-    for c in changes:
-        if c["new_deck"] != "unknown" or True:  # always write (even if keeping unknown, no change needed)
-            if c["new_deck"] != "unknown":
-                apply_replacement(c["entry"], c["new_deck"])
-                print(f"  ✓ {c['entry']['player']} week-{c['entry']['week_num']} → {c['new_deck']}")
-                applied += 1
-    print(color(f"\nDone. Applied {applied} change(s).", "32"))
+    print(color("Applying changes...", "36"))
+    apply_changes(changes)
+    for entry, new_deck, _choice in changes:
+        print(f"  ✓ {entry['player']} week-{entry['week_num']} → {new_deck}")
+    print(color(f"\nDone. Applied {len(changes)} change(s).", "32"))
 
 if __name__ == "__main__":
     run_interactive()
@@ -0,0 +1,274 @@
+"""
+league_db.py – Optional SQLite index over the raw week-*.json files.
+
+The raw JSON files stay the source of truth. This module mirrors them into a
+local SQLite database (tournaments, standings, matches) indexed on player,
+deck, week and league, so tools can answer questions like "which week files
+mention player X" with an indexed lookup instead of parsing the whole corpus.
+
+The store is kept in sync lazily: every `open_store()` stats the raw files
+and re-ingests only those whose mtime/size changed since the last sync.
+
+Usage:
+    python league_db.py              # sync the store and print a summary
+    python league_db.py --rebuild    # drop the store and rebuild from scratch
+"""
+
+import os
+import re
+import glob
+import json
+import sqlite3
+import argparse
+
+from convert_data import get_league_info
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RAW_DIR = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "raw")
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+STORE_PATH = os.path.join(CACHE_DIR, "league.sqlite")
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path      TEXT PRIMARY KEY,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id            TEXT PRIMARY KEY,
+    path          TEXT NOT NULL,
+    week          INTEGER NOT NULL,
+    league        TEXT NOT NULL,
+    name          TEXT,
+    date          TEXT,
+    aetherhub_id  TEXT,
+    players       INTEGER,
+    rounds        INTEGER,
+    prize_pool    INTEGER
+);
+CREATE TABLE IF NOT EXISTS standings (
+    tournament_id  TEXT NOT NULL,
+    path           TEXT NOT NULL,
+    week           INTEGER NOT NULL,
+    league         TEXT NOT NULL,
+    row            INTEGER NOT NULL,
+    rank           INTEGER,
+    player         TEXT NOT NULL,
+    deck           TEXT,
+    points         INTEGER,
+    wins           INTEGER,
+    losses         INTEGER,
+    draws          INTEGER,
+    omw            REAL,
+    gw             REAL,
+    ogw            REAL,
+    mw             REAL,
+    payout         INTEGER
+);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id  TEXT NOT NULL,
+    path           TEXT NOT NULL,
+    week           INTEGER NOT NULL,
+    league         TEXT NOT NULL,
+    round          INTEGER NOT NULL,
+    row            INTEGER NOT NULL,
+    p1             TEXT,
+    p2             TEXT,
+    p1_wins        INTEGER,
+    p2_wins        INTEGER,
+    draws          INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tournaments_week   ON tournaments(week);
+CREATE INDEX IF NOT EXISTS idx_tournaments_league ON tournaments(league);
+CREATE INDEX IF NOT EXISTS idx_standings_player   ON standings(player, week);
+CREATE INDEX IF NOT EXISTS idx_standings_deck     ON standings(deck, week);
+CREATE INDEX IF NOT EXISTS idx_standings_deck_key ON standings(TRIM(deck));
+CREATE INDEX IF NOT EXISTS idx_standings_week     ON standings(week);
+CREATE INDEX IF NOT EXISTS idx_standings_league   ON standings(league);
+CREATE INDEX IF NOT EXISTS idx_standings_path     ON standings(path);
+CREATE INDEX IF NOT EXISTS idx_matches_p1         ON matches(p1, week);
+CREATE INDEX IF NOT EXISTS idx_matches_p2         ON matches(p2, week);
+CREATE INDEX IF NOT EXISTS idx_matches_week       ON matches(week);
+CREATE INDEX IF NOT EXISTS idx_matches_path       ON matches(path);
+"""
+
+
+# ── Helpers ─────────────────────────────────────────────────────────────────
+
+def week_num_from_path(path):
+    """Extract week number from filename (e.g. week-89.json → 89)."""
+    m = re.search(r"week-(\d+)\.json$", path)
+    return int(m.group(1)) if m else 0
+
+
+def list_week_files(raw_dir=RAW_DIR):
+    """Return absolute paths of all raw week-*.json files."""
+    return [os.path.abspath(p) for p in glob.glob(os.path.join(raw_dir, "week-*.json"))]
+
+
+# ── Sync ────────────────────────────────────────────────────────────────────
+
+def _drop_file(conn, path):
+    for table in ("tournaments", "standings", "matches", "files"):
+        conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+
+
+def _ingest_file(conn, path, st):
+    """(Re)load one raw week file into the store."""
+    _drop_file(conn, path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  !! Skipping {os.path.basename(path)}: {e}")
+        return
+
+    week = data.get("week_number") or week_num_from_path(path)
+    league_id, _ = get_league_info(week)
+    t_id = data.get("id") or f"week-{week}"
+    meta = data.get("metadata", {})
+
+    conn.execute(
+        "INSERT OR REPLACE INTO tournaments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (t_id, path, week, league_id, data.get("name"), data.get("date"),
+         meta.get("aetherhub_id"), meta.get("players"), meta.get("rounds"),
+         meta.get("prize_pool")),
+    )
+    conn.executemany(
+        "INSERT INTO standings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (t_id, path, week, league_id, i, s.get("rank"), s.get("name", ""), s.get("deck"),
+             s.get("points"), s.get("wins"), s.get("losses"), s.get("draws"),
+             s.get("omw"), s.get("gw"), s.get("ogw"), s.get("mw"), s.get("payout"))
+            for i, s in enumerate(data.get("standings", []))
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (t_id, path, week, league_id, rnd.get("round", r_idx + 1), i,
+             m.get("p1"), m.get("p2"), m.get("p1_wins"), m.get("p2_wins"), m.get("draws"))
+            for r_idx, rnd in enumerate(data.get("rounds", []))
+            for i, m in enumerate(rnd.get("matches", []))
+        ],
+    )
+    conn.execute("INSERT INTO files VALUES (?, ?, ?)", (path, st.st_mtime_ns, st.st_size))
+
+
+def sync(conn, raw_dir=RAW_DIR):
+    """
+    Bring the store in line with the raw files on disk.
+    Only new or modified files are re-parsed; deleted files are dropped.
+    Returns the number of files (re)ingested or removed.
+    """
+    known = {path: (mtime, size) for path, mtime, size in conn.execute("SELECT * FROM files")}
+    on_disk = set()
+    touched = 0
+
+    with conn:
+        for path in list_week_files(raw_dir):
+            on_disk.add(path)
+            st = os.stat(path)
+            if known.get(path) == (st.st_mtime_ns, st.st_size):
+                continue
+            _ingest_file(conn, path, st)
+            touched += 1
+
+        for path in set(known) - on_disk:
+            _drop_file(conn, path)
+            touched += 1
+
+    return touched
+
+
+def open_store(path=STORE_PATH, raw_dir=RAW_DIR, rebuild=False):
+    """Open (creating if needed) the SQLite store and sync it with the raw files."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if rebuild and os.path.exists(path):
+        os.remove(path)
+
+    conn = sqlite3.connect(path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS tournaments;"
+            "DROP TABLE IF EXISTS standings; DROP TABLE IF EXISTS matches;"
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    sync(conn, raw_dir)
+    return conn
+
+
+# ── Queries ─────────────────────────────────────────────────────────────────
+
+def deck_rows(conn, deck):
+    """Return [(path, row, week, player), ...] for every standings row playing *deck*."""
+    rows = conn.execute(
+        """
+        SELECT path, row, week, player FROM standings
+        WHERE TRIM(deck) = ?
+        ORDER BY week, row
+        """,
+        (deck.strip(),),
+    )
+    return rows.fetchall()
+
+
+def player_refs(conn, player):
+    """
+    Return [(path, week, role), ...] for every place *player* appears:
+    role is "standing" for a standings row, "p1"/"p2" for a match side.
+    """
+    rows = conn.execute(
+        """
+        SELECT path, week, 'standing' FROM standings WHERE player = ?
+        UNION ALL
+        SELECT path, week, 'p1' FROM matches WHERE p1 = ?
+        UNION ALL
+        SELECT path, week, 'p2' FROM matches WHERE p2 = ?
+        ORDER BY 2
+        """,
+        (player, player, player),
+    )
+    return rows.fetchall()
+
+
+def shared_weeks(conn, player_a, player_b):
+    """Weeks in which both players have a standings row."""
+    rows = conn.execute(
+        """
+        SELECT week FROM standings WHERE player IN (?, ?)
+        GROUP BY path HAVING COUNT(DISTINCT player) = 2
+        ORDER BY week
+        """,
+        (player_a, player_b),
+    )
+    return [week for (week,) in rows]
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the SQLite index of raw week files.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Delete the store and rebuild it from scratch.")
+    args = parser.parse_args()
+
+    conn = open_store(rebuild=args.rebuild)
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("tournaments", "standings", "matches")
+    }
+    conn.close()
+    print(f"Store: {STORE_PATH}")
+    print(f"  {counts['tournaments']} tournaments, {counts['standings']} standings rows, "
+          f"{counts['matches']} matches.")
+
+
+if __name__ == "__main__":
+    main()
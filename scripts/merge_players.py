@@ -0,0 +1,116 @@
+"""
+merge_players.py – Rename a player, or merge two identities, across all weeks.
+
+Finds every standings row and match side of the old name through the
+league_db player index, so only the week files the player appears in are
+opened. Those are rewritten in one transaction (see week_tx.py). Players.txt
+and the alias table are updated to match: the old name is learned as an alias
+of the new one, and aliases that pointed at the old name are re-pointed. Finally,
+db.json is rebuilt in full (convert_data.rebuild) and the leagues the renamed
+weeks belong to are reported.
+
+A merge is refused if both names played in the same week, since that would
+leave two standings rows for one player.
+
+Usage:
+    python merge_players.py "<old name>" "<new name>" [--dry-run] [--no-rebuild]
+    python merge_players.py "Bjornar F" "Bjørnar Funderud"
+"""
+
+import sys
+import argparse
+from collections import Counter
+
+import league_db
+import convert_data
+from verify_data import (
+    PLAYERS_FILE, load_lines, save_lines, load_aliases, save_aliases,
+    learn_aliases, apply_renames,
+)
+from week_tx import WeekTransaction
+
+
+def merge_player(old, new, dry_run=False, rebuild=True):
+    """
+    Replace *old* with *new* everywhere. Returns a summary dict with the
+    per-role counts, the weeks touched and the db.json rebuild result.
+    Raises ValueError if both names appear in the same week or *old* appears nowhere.
+    """
+    conn = league_db.open_store()
+    refs = league_db.player_refs(conn, old)
+    clashes = league_db.shared_weeks(conn, old, new)
+    conn.close()
+
+    if clashes:
+        raise ValueError(f"'{old}' and '{new}' both played in week(s) {', '.join(map(str, clashes))}")
+    if not refs:
+        raise ValueError(f"'{old}' doesn't appear in any week file")
+
+    tx = WeekTransaction()
+    for path in sorted({path for path, _week, _role in refs}):
+        data = tx.load(path)
+        apply_renames(data, {old: new})
+        tx.stage(path, data)
+
+    summary = {
+        "roles": Counter(role for _path, _week, role in refs),
+        "weeks": sorted({week for _path, week, _role in refs}),
+        "rebuild": None,
+    }
+    if dry_run:
+        print(tx.diff(), end="")
+        return summary
+
+    written = tx.commit()
+
+    names = load_lines(PLAYERS_FILE)
+    new_names = [n for n in names if n != old] + ([] if new in names else [new])
+    if sorted(set(new_names)) != sorted(set(names)):
+        save_lines(PLAYERS_FILE, "Name", new_names)
+
+    aliases = load_aliases()
+    changed = learn_aliases(aliases, {old: new})
+    for alias, target in list(aliases.items()):
+        if target == old:
+            aliases[alias] = new
+            changed = True
+        if alias == aliases[alias]:
+            del aliases[alias]
+            changed = True
+    if changed:
+        save_aliases(aliases)
+
+    if rebuild and written:
+        summary["rebuild"] = convert_data.rebuild(written)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename or merge a player across all raw week files.")
+    parser.add_argument("old", help="Player name to replace")
+    parser.add_argument("new", help="Player name to keep")
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff, write nothing.")
+    parser.add_argument("--no-rebuild", action="store_true", help="Don't rebuild db.json afterwards.")
+    args = parser.parse_args()
+
+    if args.old == args.new:
+        parser.error("old and new names are the same")
+
+    try:
+        summary = merge_player(args.old, args.new, dry_run=args.dry_run, rebuild=not args.no_rebuild)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    roles = summary["roles"]
+    verb = "Would rename" if args.dry_run else "Renamed"
+    print(f"{verb} '{args.old}' → '{args.new}' in {len(summary['weeks'])} week(s): "
+          f"{roles['standing']} standings rows, {roles['p1'] + roles['p2']} match sides.")
+    print(f"  weeks: {', '.join(map(str, summary['weeks']))}")
+    if summary["rebuild"]:
+        print(f"  db.json rebuilt ({summary['rebuild']['tournaments']} tournaments); "
+              f"leagues affected: {', '.join(summary['rebuild']['leagues'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+models.py – Compact typed records for the raw week-*.json schema.
+
+`json.load` gives every standings row a 13-key dict and a fresh string object
+for every name, deck and record it contains, so the same player name exists
+once per appearance. These classes hold the same data in `__slots__` with
+names, decks and record strings interned (one object per distinct value), and
+share each distinct key order between records.
+
+Conversion is lossless: `Tournament.from_dict(d).to_dict() == d`, with keys in
+their original order, absent keys still absent and unknown keys kept.
+
+    Tournament   id, name, date, week_number, league_id, metadata, standings, rounds
+    Standing     rank, name, deck, points, record, wins, losses, draws, omw, gw, ogw, mw, payout
+    Round        round, matches
+    Match        p1, p2, p1_wins, p2_wins, draws
+
+A field that's absent from the JSON reads as None.
+
+Records also answer the dict reads the tooling uses on week data – `get()`,
+`[key]` and `in` over the JSON keys – so code written for json.load dicts
+takes either. load_models() keeps the converted records in their own parse
+cache (`.cache/models.pickle`), so the dicts are never built on a warm load.
+check_data.py, audit_standings.py, win_rates.py, ratings.py and analytics.py
+load the history this way.
+
+Usage:
+    from models import Tournament, load_models
+    for week_num, path, t in load_models():
+        for s in t.standings:
+            print(s.name, s.deck, s.points)
+
+    python models.py        # memory of the current history as dicts vs models
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+from corpus_cache import CACHE_DIR, RAW_DIR, load_corpus
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+MODELS_CACHE_PATH = os.path.join(CACHE_DIR, "models.pickle")
+MODELS_CACHE_VERSION = 1    # bump when the record classes change
+
+_intern = sys.intern
+_key_orders = {}
+
+
+def _shared(keys):
+    """One tuple object per distinct key order."""
+    return _key_orders.setdefault(keys, keys)
+
+
+class _Record:
+    __slots__ = ("_order", "_extra")
+    FIELDS = ()
+    INTERNED = ()           # string fields stored through sys.intern
+    NESTED = {}             # field → record class for lists of records
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+        cls._plain = tuple(f for f in cls.FIELDS if f not in cls.INTERNED and f not in cls.NESTED)
+        cls._state = cls.FIELDS + ("_order", "_extra")
+        if cls.FIELDS:
+            cls._define_pickling()
+
+    @classmethod
+    def _define_pickling(cls):
+        """
+        Pickle each record as one flat tuple rather than the default {slot: value}
+        dict: a smaller cache file, and a load that runs one generated tuple
+        unpack per record (as namedtuple builds its methods) instead of a setattr
+        loop – faster than unpickling the dicts themselves.
+        """
+        attrs = ", ".join(f"self.{f}" for f in cls._state)
+        namespace = {}
+        exec(f"def __getstate__(self):\n    return ({attrs},)\n"
+             f"def __setstate__(self, state):\n    {attrs}, = state\n", namespace)
+        cls.__getstate__ = namespace["__getstate__"]
+        cls.__setstate__ = namespace["__setstate__"]
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls.__new__(cls)
+        get = d.get
+        for field in cls._plain:
+            setattr(obj, field, get(field))
+        for field in cls.INTERNED:
+            value = get(field)
+            setattr(obj, field, _intern(value) if type(value) is str else value)
+        for field, item_cls in cls.NESTED.items():
+            value = get(field)
+            setattr(obj, field, None if value is None else [item_cls.from_dict(item) for item in value])
+        obj._order = _shared(tuple(d))
+        obj._extra = None if cls._field_set.issuperset(d) else \
+            {k: v for k, v in d.items() if k not in cls._field_set}
+        return obj
+
+    def to_dict(self):
+        out = {}
+        for key in self._order:
+            if key in self._field_set:
+                value = getattr(self, key)
+                if key in self.NESTED and value is not None:
+                    value = [item.to_dict() for item in value]
+                out[key] = value
+            else:
+                out[key] = self._extra[key]
+        return out
+
+    # ── Dict-style reads ──
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is not None or key in self._order:
+                return value
+            return default
+        return self._extra.get(key, default) if self._extra else default
+
+    def __getitem__(self, key):
+        if key not in self._order:
+            raise KeyError(key)
+        return getattr(self, key) if key in self._field_set else self._extra[key]
+
+    def __contains__(self, key):
+        return key in self._order
+
+    def __eq__(self, other):
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        shown = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS[:3])
+        return f"{type(self).__name__}({shown}, …)"
+
+
+class Match(_Record):
+    FIELDS = ("p1", "p2", "p1_wins", "p2_wins", "draws")
+    INTERNED = ("p1", "p2")
+    __slots__ = FIELDS
+
+    @property
+    def is_bye(self):
+        return not self.p2 or self.p2 == "BYE"
+
+
+class Round(_Record):
+    FIELDS = ("round", "matches")
+    NESTED = {"matches": Match}
+    __slots__ = FIELDS
+
+
+class Standing(_Record):
+    FIELDS = ("rank", "name", "deck", "points", "record", "wins", "losses", "draws",
+              "omw", "gw", "ogw", "mw", "payout")
+    INTERNED = ("name", "deck", "record")
+    __slots__ = FIELDS
+
+
+class Tournament(_Record):
+    FIELDS = ("id", "name", "league_id", "date", "week_number", "metadata", "standings", "rounds")
+    INTERNED = ("league_id", "date")
+    NESTED = {"standings": Standing, "rounds": Round}
+    __slots__ = FIELDS
+
+
+def load_models(raw_dir=RAW_DIR, cache_path=MODELS_CACHE_PATH):
+    """
+    [(week_num, path, Tournament), ...] for every raw week file, sorted by week,
+    like load_corpus() but cached as records: only changed files are parsed
+    (and converted), and the rest load straight from `.cache/models.pickle`.
+    """
+    return load_corpus(raw_dir, cache_path, MODELS_CACHE_VERSION, convert=Tournament.from_dict)
+
+
+# ── Measuring ───────────────────────────────────────────────────────────────
+
+def traced_size(build):
+    """Bytes still allocated by *build*() once it returns (the result is kept alive)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    import json
+    texts = [json.dumps(data) for _wn, _path, data in load_corpus()]
+
+    t0 = time.perf_counter()
+    dicts, dict_bytes = traced_size(lambda: [json.loads(t) for t in texts])
+    t_dicts = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    models, model_bytes = traced_size(lambda: [Tournament.from_dict(json.loads(t)) for t in texts])
+    t_models = time.perf_counter() - t0
+    assert [m.to_dict() for m in models] == dicts
+
+    print(f"{len(texts)} weeks as dicts:  {dict_bytes / 1024:8.0f} KiB  ({t_dicts * 1000:.0f} ms)")
+    print(f"{len(texts)} weeks as models: {model_bytes / 1024:8.0f} KiB  ({t_models * 1000:.0f} ms)  "
+          f"= {model_bytes / dict_bytes:.0%}")
+    print("Round trip is lossless.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+name_index.py – Normalised lookup of player names ahead of fuzzy matching.
+
+AetherHub names often differ from Players.txt only by accents, Nordic letters,
+case or spacing ("bjornar  funderud" vs "Bjørnar Funderud"). Folding both
+sides to a normalised key and looking it up in a dict resolves those in O(1),
+so only genuinely different spellings reach the (slower) fuzzy scorer.
+
+Usage:
+    from name_index import NameIndex, normalize_name
+    index = NameIndex(load_lines(PLAYERS_FILE))
+    index.resolve("Bjornar Funderud")     → "Bjørnar Funderud"
+    normalize_name("  ØYVIND  Ås ")       → "oyvind as"
+
+    python name_index.py "Some Name"      # show the key and matches
+"""
+
+import re
+import argparse
+import unicodedata
+
+# Letters NFKD leaves alone: map them to their usual ASCII spelling
+TRANSLITERATE = str.maketrans({
+    "ø": "o", "Ø": "o",
+    "æ": "ae", "Æ": "ae",
+    "å": "a", "Å": "a",
+    "ð": "d", "Ð": "d",
+    "þ": "th", "Þ": "th",
+    "ß": "ss",
+    "ł": "l", "Ł": "l",
+    "đ": "d", "Đ": "d",
+})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_name(name):
+    """Fold *name* to a comparison key: no accents, ASCII Nordic letters, lowercase, single spaces."""
+    name = name.translate(TRANSLITERATE)
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    return _WHITESPACE_RE.sub(" ", name.casefold()).strip()
+
+
+class NameIndex:
+    """Hash index from normalised key → canonical names sharing that key."""
+
+    def __init__(self, names=()):
+        self._index = {}
+        self.add(*names)
+
+    def add(self, *names):
+        for name in names:
+            canon = self._index.setdefault(normalize_name(name), [])
+            if name not in canon:
+                canon.append(name)
+
+    def lookup(self, name):
+        """All canonical names whose key equals *name*'s key (usually zero or one)."""
+        return list(self._index.get(normalize_name(name), ()))
+
+    def resolve(self, name):
+        """The single canonical name matching *name*, or None if there is none or it's ambiguous."""
+        canon = self._index.get(normalize_name(name))
+        return canon[0] if canon and len(canon) == 1 else None
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    from verify_data import PLAYERS_FILE, load_lines
+
+    parser = argparse.ArgumentParser(description="Look up a name in the normalised player index.")
+    parser.add_argument("name")
+    args = parser.parse_args()
+
+    index = NameIndex(load_lines(PLAYERS_FILE))
+    print(f"  key:     {normalize_name(args.name)!r}")
+    print(f"  matches: {', '.join(index.lookup(args.name)) or '(none)'}")
+
+
+if __name__ == "__main__":
+    main()
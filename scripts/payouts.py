@@ -0,0 +1,216 @@
+"""
+payouts.py – Prize pool and payout engine driven by a versioned rules table.
+
+The prize pool is the entry fee times the number of paying players. It is split
+in shares by record: going undefeated, or one match short of it with a draw or
+a loss, earns shares, and everyone else gets nothing. The fee, the share table
+and the rounding policy live in RULES; a new version takes effect from its
+`from_week`.
+
+Payouts for any number of weeks are computed in one vectorised pass over all
+standings rows, so re-auditing every season takes a few milliseconds. The audit
+compares the formula with the payouts stored in the raw files and flags bonuses
+(differences of 40 kr or more) and smaller rounding differences.
+
+Usage:
+    from payouts import prize_pool, week_payouts
+    pool = prize_pool(week_num, paying_players)
+    for entry, payout in zip(standings, week_payouts(week_data, pool)):
+        entry["payout"] = payout
+
+    python payouts.py               # audit every week against the formula
+    python payouts.py --week 91     # audit one week
+    python payouts.py --json        # machine-readable report
+"""
+
+import json
+import time
+import argparse
+
+import numpy as np
+
+from corpus_cache import RAW_DIR, load_corpus
+
+# ── Rules ───────────────────────────────────────────────────────────────────
+# Ordered by from_week; the last entry whose from_week <= week applies.
+RULES = [
+    {
+        "version": 1,
+        "from_week": 0,
+        "entry_fee": 105,
+        "shares": {"undefeated": 4, "one_draw": 3, "one_loss": 2},
+        "rounding": "floor",
+    },
+    {
+        "version": 2,
+        "from_week": 104,
+        "entry_fee": 110,
+        "shares": {"undefeated": 4, "one_draw": 3, "one_loss": 2},
+        "rounding": "floor",
+    },
+]
+
+BONUS_THRESHOLD = 40  # kr; smaller differences are rounding, not a bonus
+
+_ROUNDING = {"floor": np.floor, "round": np.round, "ceil": np.ceil}
+
+
+def rules_for(week_num):
+    """The rules version in force for *week_num*."""
+    current = RULES[0]
+    for rules in RULES:
+        if rules["from_week"] <= week_num:
+            current = rules
+    return current
+
+
+def entry_fee(week_num):
+    return rules_for(week_num)["entry_fee"]
+
+
+def prize_pool(week_num, paying_players):
+    return entry_fee(week_num) * max(0, paying_players)
+
+
+# ── Engine ──────────────────────────────────────────────────────────────────
+
+class PayoutTable:
+    """Formula payouts for every standings row of a set of weeks, as flat arrays."""
+
+    def __init__(self, weeks):
+        """*weeks* is [(week_num, data), ...]; each data's metadata.prize_pool is used."""
+        week_col, row_col, wins, losses, draws, rounds, existing = [], [], [], [], [], [], []
+        self.names = []
+        pools, versions = [], []
+
+        for w_idx, (week_num, data) in enumerate(weeks):
+            meta = data.get("metadata", {})
+            n_rounds = meta.get("rounds") or 4
+            pools.append(meta.get("prize_pool") or 0)
+            versions.append(RULES.index(rules_for(week_num)))
+            for i, s in enumerate(data.get("standings", [])):
+                week_col.append(w_idx)
+                row_col.append(i)
+                wins.append(s.get("wins", 0))
+                losses.append(s.get("losses", 0))
+                draws.append(s.get("draws", 0))
+                rounds.append(n_rounds)
+                existing.append(s.get("payout") or 0)
+                self.names.append(s.get("name", ""))
+
+        self.week_nums = np.array([wn for wn, _data in weeks], dtype=np.int64)
+        self.pools = np.array(pools, dtype=np.float64)
+        self.week_idx = np.array(week_col, dtype=np.int64)
+        self.row = np.array(row_col, dtype=np.int64)
+        self.existing = np.array(existing, dtype=np.int64)
+        self.shares = self._shares(np.array(wins), np.array(losses), np.array(draws),
+                                   np.array(rounds), np.array(versions, dtype=np.int64))
+        self.formula = self._payouts(np.array(versions, dtype=np.int64))
+
+    def _shares(self, wins, losses, draws, rounds, versions):
+        # Share values per row, looked up from each row's rules version
+        table = np.array([[r["shares"]["undefeated"], r["shares"]["one_draw"], r["shares"]["one_loss"]]
+                          for r in RULES], dtype=np.int64)
+        per_row = table[versions[self.week_idx]] if len(self.week_idx) else np.zeros((0, 3), np.int64)
+        one_short = wins == rounds - 1
+        return np.select(
+            [wins == rounds, one_short & (draws > 0), one_short & (losses > 0)],
+            [per_row[:, 0], per_row[:, 1], per_row[:, 2]],
+            default=0,
+        )
+
+    def _payouts(self, versions):
+        total_shares = np.bincount(self.week_idx, weights=self.shares, minlength=len(self.pools))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_share = np.where(total_shares > 0, self.pools / total_shares, 0.0)
+        raw = self.shares * per_share[self.week_idx]
+        out = np.zeros(len(raw), dtype=np.int64)
+        for v, rules in enumerate(RULES):
+            mask = versions[self.week_idx] == v
+            out[mask] = _ROUNDING[rules["rounding"]](raw[mask]).astype(np.int64)
+        out[self.shares == 0] = 0
+        return out
+
+    def week_rows(self, w_idx):
+        return np.flatnonzero(self.week_idx == w_idx)
+
+    # ── Audit ───────────────────────────────────────────────────────────
+
+    def audit(self, threshold=BONUS_THRESHOLD):
+        """
+        Compare stored payouts with the formula. Returns a report dict with one
+        summary per week and every row whose payout differs.
+        """
+        paid = np.bincount(self.week_idx, weights=self.existing, minlength=len(self.pools))
+        formula_paid = np.bincount(self.week_idx, weights=self.formula, minlength=len(self.pools))
+        diff = self.existing - self.formula
+
+        rows = []
+        for i in np.flatnonzero(diff):
+            rows.append({
+                "week": int(self.week_nums[self.week_idx[i]]),
+                "name": self.names[i],
+                "shares": int(self.shares[i]),
+                "existing": int(self.existing[i]),
+                "formula": int(self.formula[i]),
+                "diff": int(diff[i]),
+                "kind": "bonus" if abs(diff[i]) >= threshold else "rounding",
+            })
+
+        weeks = [
+            {"week": int(wn), "prize_pool": int(self.pools[w]), "paid": int(paid[w]),
+             "formula_paid": int(formula_paid[w]), "unpaid": not paid[w] and bool(formula_paid[w])}
+            for w, wn in enumerate(self.week_nums)
+        ]
+        return {"weeks": weeks, "discrepancies": rows}
+
+
+def week_payouts(data, pool=None, week_num=None):
+    """Formula payouts for one week's standings, in standings order."""
+    if week_num is None:
+        week_num = data.get("week_number", 0)
+    if pool is not None:
+        data = {**data, "metadata": {**data.get("metadata", {}), "prize_pool": pool}}
+    return [int(p) for p in PayoutTable([(week_num, data)]).formula]
+
+
+def load_table(raw_dir=RAW_DIR, weeks=None):
+    """PayoutTable over the whole corpus (or only *weeks*)."""
+    corpus = [(data.get("week_number") or wn, data) for wn, _path, data in load_corpus(raw_dir)
+              if weeks is None or wn in weeks]
+    return PayoutTable(corpus)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit stored payouts against the payout rules.")
+    parser.add_argument("--week", type=int, action="append", help="Only audit this week (repeatable).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    table = load_table(weeks=set(args.week) if args.week else None)
+    t0 = time.perf_counter()
+    report = table.audit()
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    unpaid = [w["week"] for w in report["weeks"] if w["unpaid"]]
+    print(f"Audited {len(report['weeks'])} weeks, {len(table.formula)} standings rows "
+          f"in {elapsed:.1f} ms.")
+    if unpaid:
+        print(f"  No payouts stored for weeks: {', '.join(map(str, unpaid))}")
+    for kind in ("bonus", "rounding"):
+        rows = [r for r in report["discrepancies"] if r["kind"] == kind]
+        if rows:
+            print(f"\n{kind.capitalize()} differences ({len(rows)}):")
+            for r in rows:
+                print(f"  week-{r['week']:<4} {r['name']:<26} stored {r['existing']:>5}  "
+                      f"formula {r['formula']:>5}  ({r['diff']:+d})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+projection.py – Monte Carlo projection of a league's final standings.
+
+Simulates the league's remaining weeks many times and reports, per player, how
+likely each finishing position is. Each simulated week, every player either
+stays home or plays a full event. Attendance comes from the player's recent
+turnout. Each round is a win, draw or loss with the player's historical
+(shrunk) match rates.
+
+Final standings follow convert_data.py exactly. Only the best X scores count
+(LEAGUE_RULES), and ties are broken by 4-0s, then 3-0s, then 3-1s, then
+tournaments played.
+
+All simulations run as NumPy array operations in chunks, over every player
+at once. Two weeks' results are one lookup of a random number in the player's
+inverse-CDF table over every pair of possible (wins, draws, losses) records.
+Best-X totals and tiebreaks are summed from packed byte counters instead of
+sorting, so 100k simulations of even a 64-player league take under a second
+(benchmarks/bench_projection.py).
+
+Usage:
+    from projection import project
+    result = project("spring-2026", n_sims=100_000)
+
+    python projection.py                        # current league
+    python projection.py spring-2026 --as-of 95 # as it looked after week 95
+    python projection.py --sims 20000 --top 8 --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+
+from convert_data import LEAGUE_RULES, get_league_info
+from corpus_cache import RAW_DIR, load_corpus
+
+ATTENDANCE_WINDOW = 12   # recent weeks used to estimate turnout
+RATE_PRIOR = 10          # pseudo-matches pulling win/draw rates toward the field average
+CHUNK = 1_000            # simulations per vectorised chunk (keeps the buffers in cache)
+MAX_WEEK = 1000          # upper bound when enumerating a league's weeks
+
+
+def league_weeks(league_id):
+    """All week numbers assigned to *league_id* by get_league_info()."""
+    return [w for w in range(1, MAX_WEEK) if get_league_info(w)[0] == league_id]
+
+
+def current_league(corpus):
+    """The league of the most recent week that belongs to one."""
+    for wn, _path, data in reversed(corpus):
+        league_id = get_league_info(data.get("week_number") or wn)[0]
+        if league_id != "off-season":
+            return league_id
+    raise ValueError("no league weeks found")
+
+
+def _records(rounds):
+    """Every (wins, draws, losses) with wins + draws + losses == rounds."""
+    return np.array([(w, d, rounds - w - d) for w in range(rounds + 1) for d in range(rounds + 1 - w)])
+
+
+class LeagueState:
+    """Played results of one league plus per-player model parameters."""
+
+    def __init__(self, corpus, league_id, as_of=None):
+        self.league_id = league_id
+        self.best_x = LEAGUE_RULES.get(league_id)
+        weeks = [(data.get("week_number") or wn, data) for wn, _path, data in corpus]
+        if as_of is not None:
+            weeks = [(wn, d) for wn, d in weeks if wn <= as_of]
+
+        all_league = league_weeks(league_id)
+        played = [(wn, d) for wn, d in weeks if wn in set(all_league)]
+        last = max((wn for wn, _d in played), default=min(all_league) - 1)
+        self.played_weeks = [wn for wn, _d in played]
+        self.remaining_weeks = [w for w in all_league if w > last]
+
+        round_counts = Counter((d.get("metadata", {}).get("rounds") or 4) for _wn, d in (played or weeks[-ATTENDANCE_WINDOW:]))
+        self.rounds = round_counts.most_common(1)[0][0] if round_counts else 4
+
+        # Players: everyone with a league result or a recent appearance
+        recent = weeks[-ATTENDANCE_WINDOW:]
+        names = []
+        for _wn, d in played + recent:
+            for s in d.get("standings", []):
+                if s.get("name") and s["name"] not in names:
+                    names.append(s["name"])
+        self.names = names
+        idx = {n: i for i, n in enumerate(names)}
+        n = len(names)
+
+        # Played league scores (columns = played weeks, 0 when absent) and tiebreak counts
+        self.scores = np.zeros((n, len(played)), dtype=np.int64)
+        self.four_ohs = np.zeros(n, dtype=np.int64)
+        self.three_ohs = np.zeros(n, dtype=np.int64)
+        self.three_ones = np.zeros(n, dtype=np.int64)
+        self.played = np.zeros(n, dtype=np.int64)
+        for col, (_wn, d) in enumerate(played):
+            for s in d.get("standings", []):
+                i = idx.get(s.get("name"))
+                if i is None:
+                    continue
+                w, l, dr = s.get("wins", 0), s.get("losses", 0), s.get("draws", 0)
+                self.scores[i, col] = s.get("points") or 0
+                self.four_ohs[i] += w == 4 and l == 0
+                self.three_ohs[i] += w == 3 and l == 0 and dr == 0
+                self.three_ones[i] += w == 3 and l == 1 and dr == 0
+                self.played[i] += 1
+
+        # Attendance over the recent window (Laplace-smoothed)
+        seen = np.zeros(n)
+        for _wn, d in recent:
+            for s in d.get("standings", []):
+                if s.get("name") in idx:
+                    seen[idx[s["name"]]] += 1
+        self.attendance = (seen + 1) / (len(recent) + 2)
+
+        # Match rates over all history, shrunk toward the field average
+        wdl = np.zeros((n, 3))
+        for _wn, d in weeks:
+            for s in d.get("standings", []):
+                i = idx.get(s.get("name"))
+                if i is not None:
+                    wdl[i] += (s.get("wins", 0), s.get("draws", 0), s.get("losses", 0))
+        field = wdl.sum(axis=0) / max(wdl.sum(), 1)
+        self.rates = (wdl + RATE_PRIOR * field) / (wdl.sum(axis=1, keepdims=True) + RATE_PRIOR)
+
+    def outcome_table(self):
+        """
+        Per-player cumulative probabilities over [absent] + every possible record,
+        and the points / tiebreak flags of each outcome.
+        """
+        recs = _records(self.rounds)
+        w, d, l = recs[:, 0], recs[:, 1], recs[:, 2]
+        fact = np.array([np.prod(np.arange(1, k + 1)) for k in range(self.rounds + 1)], dtype=np.float64)
+        coef = fact[self.rounds] / (fact[w] * fact[d] * fact[l])
+        pw, pd, pl = self.rates[:, :1], self.rates[:, 1:2], self.rates[:, 2:]
+        pmf = coef * pw ** w * pd ** d * pl ** l                      # (players, records)
+        probs = np.hstack([1 - self.attendance[:, None], self.attendance[:, None] * pmf])
+        cdf = np.cumsum(probs, axis=1)
+        cdf[:, -1] = 1.0
+
+        absent = np.zeros(1, dtype=np.int64)
+        outcome = {
+            "points": np.concatenate([absent, 3 * w + d]),
+            "four_oh": np.concatenate([absent, (w == 4) & (l == 0)]).astype(np.int64),
+            "three_oh": np.concatenate([absent, (w == 3) & (l == 0) & (d == 0)]).astype(np.int64),
+            "three_one": np.concatenate([absent, (w == 3) & (l == 1) & (d == 0)]).astype(np.int64),
+            "played": np.concatenate([absent, np.ones(len(recs), dtype=np.int64)]),
+        }
+        return cdf, outcome
+
+
+LANES = 8                   # one-byte counters per packed uint64 word
+SAMPLE_BITS = 16            # resolution of the per-player inverse-CDF lookup tables (draws are uint16)
+BYTE_SUM = np.uint64(0x0101010101010101)   # × word: top byte = sum of all 8 lanes
+
+
+def _pack_fields(fields):
+    """Pack (n_fields, ...) small counters into (n_words, ...) uint64 words, one byte each."""
+    fields = np.asarray(fields, dtype=np.uint64)
+    words = np.zeros((-(-len(fields) // LANES),) + fields.shape[1:], dtype=np.uint64)
+    for k, f in enumerate(fields):
+        words[k // LANES] |= f << np.uint64(8 * (k % LANES))
+    return words
+
+
+def _random_u16(rng, shape):
+    """Uniform 16-bit integers, four from each raw 64-bit output of *rng*."""
+    size = int(np.prod(shape))
+    return rng.bit_generator.random_raw(-(-size // 4)).view(np.uint16)[:size].reshape(shape)
+
+
+def _pair_table(first, second, q):
+    """
+    Inverse-CDF lookup table for two weeks at once, flattened over players:
+    entry [i * q + u] is the outcome pair (a * outcomes + b) player i gets for
+    the 16-bit random number u, given per-player outcome probabilities
+    *first* and *second*.
+    """
+    p = (first[:, :, None] * second[:, None, :]).reshape(len(first), -1)
+    # Entries u with (u + 0.5) / q below the pair's CDF map to it or an earlier pair
+    bounds = np.clip(np.ceil(np.cumsum(p, axis=1) * q - 0.5), 0, q).astype(np.intp)
+    bounds[:, -1] = q
+    dtype = np.uint8 if p.shape[1] <= 256 else np.uint16
+    pairs = np.tile(np.arange(p.shape[1], dtype=dtype), len(p))
+    return np.repeat(pairs, np.diff(bounds, axis=1, prepend=0).ravel())
+
+
+def simulate(state, n_sims=100_000, seed=None, chunk=CHUNK):
+    """
+    Run *n_sims* simulations. Returns (position_counts, mean_points) where
+    position_counts[i, k] is how often player i finished in position k + 1.
+
+    Every outcome (absent or a record) is packed into one-byte counters: for
+    each points threshold t = 1, 2, … whether the week scored >= t, then the
+    four tiebreak counts. One random number draws two weeks from a per-player
+    pair table, and two draws index one table of summed four-week words, so
+    adding the looked-up words counts everything at once. The best-X total
+    then follows without sorting, layer-cake style: the sum over t of
+    min(X, weeks scoring >= t), taken on every lane of every player at once.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(state.names)
+    n_weeks = len(state.remaining_weeks)
+    best_x = state.best_x or (state.scores.shape[1] + n_weeks)
+    if best_x * LANES > 255:
+        raise ValueError(f"can't count more than {255 // LANES} weeks per player")
+    cdf, outcome = state.outcome_table()
+    probs = np.diff(cdf, axis=1, prepend=0)
+    q = 1 << SAMPLE_BITS
+
+    # Threshold lanes first; the tiebreaks take the top four lanes of the last word,
+    # least significant first, so that word >> 32 is the whole tiebreak key
+    thresholds = np.arange(1, max(outcome["points"].max(), state.scores.max(initial=0)) + 1)
+    padding = [0] * (-(len(thresholds) + 4) % LANES)
+    fields = [outcome["points"] >= t for t in thresholds] + padding
+    fields += [outcome["played"], outcome["three_one"], outcome["three_oh"], outcome["four_oh"]]
+    words = _pack_fields(fields)                                     # (n_words, outcomes)
+    pair_words = (words[:, :, None] + words[:, None, :]).reshape(len(words), -1)
+    quad_words = (pair_words[:, :, None] + pair_words[:, None, :]).reshape(len(words), -1)
+    n_pairs = np.intp(pair_words.shape[1])
+    base = _pack_fields([(state.scores >= t).sum(axis=1) for t in thresholds] + padding
+                        + [state.played, state.three_ones, state.three_ohs, state.four_ohs])
+
+    # One pair table per two remaining weeks; an odd last week is paired with an absence
+    absent = np.zeros_like(probs)
+    absent[:, 0] = 1
+    tables = [_pair_table(probs, probs, q)] * (n_weeks // 2)
+    if n_weeks % 2:
+        tables.append(_pair_table(probs, absent, q))
+    offsets = (np.arange(n, dtype=np.intp) * q)[:, None]
+
+    counts = np.zeros(n * n, dtype=np.int64)
+    points_total = np.zeros(n)
+    # Player order breaks any remaining tie, like the stable sort in convert_data
+    order_key = (n - 1 - np.arange(n))[:, None]
+
+    # Arrays are laid out (word, player, simulation); the buffers are reused across chunks
+    summed = np.empty((len(words), n, chunk), dtype=np.uint64)
+    looked_up = np.empty((n, chunk), dtype=np.uint64)
+    index = np.empty((n, chunk), dtype=np.intp)
+    quad = np.empty((n, chunk), dtype=np.intp)
+    drawn = np.empty((n, chunk), dtype=np.uint8 if n_pairs <= 256 else np.uint16)
+    for start in range(0, n_sims, chunk):
+        s = min(chunk, n_sims - start)
+        if s < chunk:
+            summed, looked_up, index, quad, drawn = (a[..., :s] for a in (summed, looked_up, index, quad, drawn))
+        r = _random_u16(rng, (len(tables), n, s))
+        summed[...] = base[:, :, None]
+        for j in range(0, len(tables), 2):
+            np.add(r[j], offsets, out=index)
+            np.take(tables[j], index, out=drawn, mode="clip")   # always in range; "clip" is the cheap mode
+            if j + 1 < len(tables):
+                np.multiply(drawn, n_pairs, out=quad)
+                np.add(r[j + 1], offsets, out=index)
+                np.take(tables[j + 1], index, out=drawn, mode="clip")
+                quad += drawn
+                table_words = quad_words
+            else:
+                quad[...] = drawn
+                table_words = pair_words
+            for k, word in enumerate(table_words):
+                np.take(word, quad, out=looked_up, mode="clip")
+                summed[k] += looked_up
+
+        # min(X, weeks >= t) on every threshold lane, then each word's lanes summed by one multiply
+        capped = np.minimum(summed.view(np.uint8), best_x).view(np.uint64)
+        capped[-1] &= np.uint64(0xFFFFFFFF)                 # not the tiebreak lanes
+        capped *= BYTE_SUM
+        capped >>= np.uint64(56)
+        points = capped.sum(axis=0, dtype=np.int64)
+
+        key = (summed[-1] >> np.uint64(32)).astype(np.int64)
+        key |= points << 32
+        key *= n
+        key += order_key
+        ranking = np.argsort(-key.T, axis=-1)                # (sims, players), best first
+        counts += np.bincount((ranking * n + np.arange(n)).ravel(), minlength=n * n)
+        points_total += points.sum(axis=1)
+
+    return counts.reshape(n, n), points_total / n_sims
+
+
+def project(league_id=None, n_sims=100_000, as_of=None, seed=None, raw_dir=RAW_DIR):
+    """Simulate a league's remaining weeks. Returns a report dict, players ordered by expected position."""
+    corpus = load_corpus(raw_dir)
+    if as_of is not None:
+        corpus = [c for c in corpus if (c[2].get("week_number") or c[0]) <= as_of]
+    league_id = league_id or current_league(corpus)
+    state = LeagueState(corpus, league_id, as_of)
+    counts, mean_points = simulate(state, n_sims, seed)
+
+    probs = counts / n_sims
+    expected = probs @ np.arange(1, len(state.names) + 1)
+    players = [
+        {
+            "name": name,
+            "expected_position": float(expected[i]),
+            "expected_points": float(mean_points[i]),
+            "positions": [float(p) for p in probs[i]],
+        }
+        for i, name in enumerate(state.names)
+    ]
+    players.sort(key=lambda p: p["expected_position"])
+    return {
+        "league": league_id,
+        "best_x": state.best_x,
+        "played_weeks": state.played_weeks,
+        "remaining_weeks": state.remaining_weeks,
+        "simulations": n_sims,
+        "players": players,
+    }
+
+
+def print_report(report, top, elapsed, as_json=False):
+    if as_json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{report['league']} — best {report['best_x']} count — {len(report['played_weeks'])} played, "
+          f"{len(report['remaining_weeks'])} to go — {report['simulations']:,} simulations in {elapsed:.2f} s\n")
+    print(f"  {'Player':<28} {'E[pos]':>6} {'E[pts]':>7} {'P(1st)':>7} {f'P(top {top})':>10}")
+    for p in report["players"]:
+        p_top = sum(p["positions"][:top])
+        if p["positions"][0] < 0.0005 and p_top < 0.0005:
+            continue
+        print(f"  {p['name']:<28} {p['expected_position']:>6.1f} {p['expected_points']:>7.1f} "
+              f"{p['positions'][0]:>7.1%} {p_top:>10.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Project final league standings by simulation.")
+    parser.add_argument("league", nargs="?", default=None, help="League id (default: current league).")
+    parser.add_argument("--sims", type=int, default=100_000)
+    parser.add_argument("--as-of", type=int, default=None, help="Ignore results after this week.")
+    parser.add_argument("--top", type=int, default=8, help="Show P(top N) for this N.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    report = project(args.league, args.sims, args.as_of, args.seed)
+    elapsed = time.perf_counter() - t0
+
+    try:
+        print_report(report, args.top, elapsed, as_json=args.json)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Piped into e.g. head, which stopped reading: silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+if __name__ == "__main__":
+    main()
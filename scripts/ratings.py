@@ -0,0 +1,239 @@
+"""
+ratings.py – Incremental Elo ratings over the match history.
+
+Every match in `rounds[].matches` is rated in week and round order. A match
+won on games counts as a win and level games count as a draw; byes are skipped.
+New players start at 1500 and move faster (K = 40) over their first 15
+matches, then settle to K = 20.
+
+The engine's state is checkpointed after each week in `.cache/ratings.pickle`.
+Each checkpoint stores the file's mtime/size plus the ratings its players had
+before and after the week. Adding a new week therefore costs only that week's
+matches. When an older week changes (a rename, a fixed result), the engine
+undoes the checkpoints back to it and replays from there, not from week 1.
+
+Current ratings and each player's rating history are written to
+`ratings.json` next to db.json; convert_data.py does this whenever it
+rebuilds db.json.
+
+Usage:
+    from ratings import open_engine
+    engine = open_engine()
+    engine.ratings["Tormod Lang"]
+
+    python ratings.py              # update ratings.json, print the top 20
+    python ratings.py --top 50
+    python ratings.py --full       # drop the checkpoints and replay everything
+"""
+
+import os
+import json
+import time
+import argparse
+
+from corpus_cache import CACHE_DIR, RAW_DIR, read_snapshot, write_snapshot, scan_week_files
+from models import load_models
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+STATE_PATH = os.path.join(CACHE_DIR, "ratings.pickle")
+RATINGS_PATH = os.path.join(os.path.dirname(RAW_DIR), "ratings.json")
+
+STATE_VERSION = 1
+
+# ── Rating model ────────────────────────────────────────────────────────────
+INITIAL_RATING = 1500.0
+K_FACTOR = 20
+K_PROVISIONAL = 40
+PROVISIONAL_MATCHES = 15
+
+
+def expected_score(rating, opponent):
+    return 1.0 / (1.0 + 10 ** ((opponent - rating) / 400.0))
+
+
+def match_score(m):
+    """p1's score (1, 0.5 or 0) for a match, or None for a bye."""
+    p1, p2 = m.get("p1"), m.get("p2")
+    if not p1 or not p2 or p2 == "BYE":
+        return None
+    g1, g2 = m.get("p1_wins", 0), m.get("p2_wins", 0)
+    return 1.0 if g1 > g2 else 0.0 if g1 < g2 else 0.5
+
+
+class RatingEngine:
+    def __init__(self):
+        self.ratings = {}   # name → rating
+        self.matches = {}   # name → matches rated
+        self.weeks = {}     # week → {"sig", "before": {name: (rating, matches) or None}, "after": {name: rating}}
+        self.dirty = False
+
+    @property
+    def last_week(self):
+        return max(self.weeks, default=0)
+
+    # ── Maintenance ─────────────────────────────────────────────────────
+
+    def _k(self, name):
+        return K_PROVISIONAL if self.matches.get(name, 0) < PROVISIONAL_MATCHES else K_FACTOR
+
+    def apply_week(self, week, data, sig=None):
+        """Rate every match of *week*. Weeks must be applied in increasing order."""
+        if week <= self.last_week:
+            raise ValueError(f"week {week} is not after the last rated week ({self.last_week})")
+        ratings, matches = self.ratings, self.matches
+        before = {}
+
+        for rnd in sorted(data.get("rounds", []), key=lambda r: r.get("round", 0)):
+            for m in rnd.get("matches", []):
+                score = match_score(m)
+                if score is None:
+                    continue
+                p1, p2 = m["p1"], m["p2"]
+                for name in (p1, p2):
+                    if name not in before:
+                        before[name] = (ratings[name], matches[name]) if name in ratings else None
+                r1 = ratings.get(p1, INITIAL_RATING)
+                r2 = ratings.get(p2, INITIAL_RATING)
+                e1 = expected_score(r1, r2)
+                k1, k2 = self._k(p1), self._k(p2)
+                ratings[p1] = r1 + k1 * (score - e1)
+                ratings[p2] = r2 + k2 * (e1 - score)
+                matches[p1] = matches.get(p1, 0) + 1
+                matches[p2] = matches.get(p2, 0) + 1
+
+        self.weeks[week] = {
+            "sig": sig,
+            "before": before,
+            "after": {name: ratings[name] for name in before},
+        }
+        self.dirty = True
+
+    def rollback(self, week):
+        """Undo every week >= *week*, newest first."""
+        for wn in sorted((w for w in self.weeks if w >= week), reverse=True):
+            for name, prev in self.weeks.pop(wn)["before"].items():
+                if prev is None:
+                    self.ratings.pop(name, None)
+                    self.matches.pop(name, None)
+                else:
+                    self.ratings[name], self.matches[name] = prev
+            self.dirty = True
+
+    def refresh(self, raw_dir=RAW_DIR):
+        """
+        Bring the state up to date with the raw files. Returns the number of
+        weeks (re)rated.
+        """
+        on_disk = {wn: (path, (st.st_mtime_ns, st.st_size)) for wn, path, st in scan_week_files(raw_dir)}
+        changed = {wn for wn, (_path, sig) in on_disk.items() if self.weeks.get(wn, {}).get("sig") != sig}
+        changed |= set(self.weeks) - set(on_disk)
+        if not changed:
+            return 0
+
+        first = min(changed)
+        self.rollback(first)
+        replay = sorted(wn for wn in on_disk if wn >= first)
+        if len(replay) == 1:
+            path = on_disk[replay[0]][0]
+            with open(path, "r", encoding="utf-8") as f:
+                corpus = [(replay[0], path, json.load(f))]
+        else:
+            corpus = [c for c in load_models(raw_dir) if c[0] >= first]
+        for wn, _path, data in corpus:
+            self.apply_week(wn, data, on_disk[wn][1])
+        return len(corpus)
+
+    def save(self, path=STATE_PATH):
+        if self.dirty:
+            write_snapshot(path, STATE_VERSION,
+                           {"ratings": self.ratings, "matches": self.matches, "weeks": self.weeks})
+            self.dirty = False
+
+    # ── Output ──────────────────────────────────────────────────────────
+
+    def history(self):
+        """{name: [(week, rating after that week), ...]} for every rated player."""
+        hist = {}
+        for wn in sorted(self.weeks):
+            for name, rating in self.weeks[wn]["after"].items():
+                hist.setdefault(name, []).append((wn, rating))
+        return hist
+
+    def to_dict(self):
+        """The ratings.json structure: players sorted by rating, plus per-player history."""
+        hist = self.history()
+        players = [
+            {
+                "name": name,
+                "rating": round(rating, 1),
+                "peak": round(max(r for _wn, r in hist[name]), 1),
+                "matches": self.matches[name],
+                "provisional": self.matches[name] < PROVISIONAL_MATCHES,
+                "last_week": hist[name][-1][0],
+            }
+            for name, rating in self.ratings.items()
+        ]
+        players.sort(key=lambda p: (-p["rating"], p["name"]))
+        return {
+            "through_week": self.last_week,
+            "players": players,
+            "history": {name: [[wn, round(r, 1)] for wn, r in entries]
+                        for name, entries in sorted(hist.items())},
+        }
+
+
+# ── Public helpers ──────────────────────────────────────────────────────────
+
+def open_engine(path=STATE_PATH, raw_dir=RAW_DIR):
+    """Load the checkpointed state, bring it up to date with the raw files and save it."""
+    engine = RatingEngine()
+    payload = read_snapshot(path, STATE_VERSION)
+    if payload:
+        engine.ratings = payload["ratings"]
+        engine.matches = payload["matches"]
+        engine.weeks = payload["weeks"]
+    engine.refresh(raw_dir)
+    engine.save(path)
+    return engine
+
+
+def write_ratings(engine, path=RATINGS_PATH):
+    """Write ratings.json atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as out:
+        json.dump(engine.to_dict(), out, indent=2)
+    os.replace(tmp, path)
+
+
+def update(path=RATINGS_PATH, raw_dir=RAW_DIR):
+    """Refresh the ratings and rewrite ratings.json. Returns the engine."""
+    engine = open_engine(raw_dir=raw_dir)
+    write_ratings(engine, path)
+    return engine
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Update Elo ratings and write ratings.json.")
+    parser.add_argument("--top", type=int, default=20, help="Number of players to print.")
+    parser.add_argument("--full", action="store_true", help="Discard the checkpoints and replay all weeks.")
+    args = parser.parse_args()
+
+    if args.full and os.path.exists(STATE_PATH):
+        os.remove(STATE_PATH)
+
+    t0 = time.perf_counter()
+    engine = update()
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    print(f"Rated {len(engine.weeks)} weeks through week {engine.last_week} in {elapsed:.0f} ms "
+          f"→ {os.path.relpath(RATINGS_PATH)}\n")
+    for i, p in enumerate(engine.to_dict()["players"][:args.top], 1):
+        flag = " (provisional)" if p["provisional"] else ""
+        print(f"  {i:>3}. {p['name']:<28} {p['rating']:>7.1f}  peak {p['peak']:>7.1f}  "
+              f"{p['matches']:>4} matches{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+stages.py – Content-hashed stage records and run state for weekly_update.py.
+
+A stage declares the files and folders it reads (inputs) and writes
+(outputs). When a stage completes, a SHA-256 over the contents of both is
+recorded in `.cache/weekly_state.json`. The next time round, the stage is
+*fresh* – and can be skipped – if its inputs still hash to what they were
+when it last completed and its outputs haven't been changed or deleted since.
+
+Folders are hashed recursively (skipping node_modules and dot-folders), with
+every file's path relative to the project root, so a renamed or deleted file
+changes the hash as well as an edited one.
+
+The same file holds the state of an update in progress (`run`): the TO, the
+tournament, the week, the non-payer count and the stages completed so far,
+so `weekly_update.py --resume` can carry on where an interrupted run stopped.
+
+Usage:
+    from stages import Stage, StageCache
+    cache = StageCache()
+    build = Stage("build", inputs=["webapp/src"], outputs=["docs"])
+    if not cache.is_fresh(build):
+        ...  # run it
+        cache.record(build)
+
+    python stages.py           # list the recorded stages and any unfinished run
+    python stages.py --clear   # forget every stage and the unfinished run
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import tempfile
+
+from corpus_cache import CACHE_DIR, PROJECT_ROOT
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+STATE_PATH = os.path.join(CACHE_DIR, "weekly_state.json")
+
+SKIP_DIRS = {"node_modules", "__pycache__"}
+
+
+# ── Hashing ─────────────────────────────────────────────────────────────────
+
+def _files(path):
+    """Every file under *path* (or *path* itself), sorted."""
+    if os.path.isfile(path):
+        return [path]
+    found = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
+        found.extend(os.path.join(root, f) for f in files)
+    return sorted(found)
+
+
+def fingerprint(paths):
+    """SHA-256 hex digest over the names and contents of every file in *paths*."""
+    h = hashlib.sha256()
+    for path in paths:
+        path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(path):
+            h.update(b"missing\0" + os.path.relpath(path, PROJECT_ROOT).encode() + b"\0")
+            continue
+        for file in _files(path):
+            h.update(os.path.relpath(file, PROJECT_ROOT).replace(os.sep, "/").encode() + b"\0")
+            with open(file, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+# ── Stages ──────────────────────────────────────────────────────────────────
+
+class Stage:
+    """A named pipeline step with declared input and output paths (relative to the project root)."""
+
+    def __init__(self, name, inputs, outputs=()):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    def hashes(self):
+        return {"inputs": fingerprint(self.inputs), "outputs": fingerprint(self.outputs)}
+
+
+class StageCache:
+    """The recorded hashes of completed stages and the current run, persisted in STATE_PATH."""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        if not isinstance(state, dict):
+            state = {}
+        self.stages = state.get("stages", {})
+        self.run = state.get("run")
+
+    def is_fresh(self, stage):
+        """True if *stage* completed before and neither its inputs nor its outputs changed since."""
+        recorded = self.stages.get(stage.name)
+        return recorded is not None and recorded == stage.hashes()
+
+    def record(self, stage):
+        """Remember *stage* as completed with its current inputs and outputs."""
+        self.stages[stage.name] = stage.hashes()
+        self.save()
+
+    def forget(self, name=None):
+        """Drop one stage's record (or every record)."""
+        if name is None:
+            self.stages.clear()
+        else:
+            self.stages.pop(name, None)
+        self.save()
+
+    # ── Run state ──
+
+    def start_run(self, **fields):
+        """Begin a new run with *fields* (replacing any unfinished one)."""
+        self.run = dict(fields, completed=[])
+        self.save()
+
+    def update_run(self, **fields):
+        self.run.update(fields)
+        self.save()
+
+    def done(self, step):
+        """True if *step* completed in the current run."""
+        return self.run is not None and step in self.run["completed"]
+
+    def complete(self, step):
+        """Mark *step* completed in the current run."""
+        if not self.done(step):
+            self.run["completed"].append(step)
+            self.save()
+
+    def end_run(self):
+        self.run = None
+        self.save()
+
+    def save(self):
+        """Write the state file atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".weekly_state-", suffix=".tmp", dir=os.path.dirname(self.path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.stages, "run": self.run}, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or clear the weekly update's stage records.")
+    parser.add_argument("--clear", action="store_true", help="Forget every recorded stage.")
+    args = parser.parse_args()
+
+    cache = StageCache()
+    if args.clear:
+        cache.run = None
+        cache.forget()
+        print(f"Cleared {os.path.relpath(STATE_PATH)}")
+        return
+    if not cache.stages:
+        print("No stages recorded yet.")
+    for name, recorded in cache.stages.items():
+        print(f"  {name:<10} inputs {recorded['inputs'][:12]}  outputs {recorded['outputs'][:12]}")
+    if cache.run:
+        print("\nUnfinished run:")
+        for key, value in cache.run.items():
+            print(f"  {key:<14} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+standings.py – Standings and tiebreaks from a tournament's match results.
+
+Shared by aetherhub.py (new imports) and audit_standings.py (re-deriving the
+stored standings). Pure computation: no network or file access.
+
+Usage:
+    from standings import calculate_standings, rounds_of
+    standings = calculate_standings(rounds_of(week_data))
+"""
+
+# Lowest match / game win percentage counted in tiebreaks
+MIN_PCT = 0.33
+
+
+def rounds_of(data):
+    """{round: [match, ...]} from a raw week dict, the shape calculate_standings takes."""
+    return {r["round"]: r["matches"] for r in data.get("rounds", [])}
+
+
+class PlayerStats:
+    def __init__(self, name, min_pct=MIN_PCT):
+        self.name = name
+        self.min_pct = min_pct
+        self.match_points = 0
+        self.matches_played = 0
+        self.game_points = 0
+        self.games_played = 0
+        self.opponents = [] 
+        self.m_wins = 0
+        self.m_losses = 0
+        self.m_draws = 0
+        
+    def add_match(self, points, opp_name, g_wins, g_losses, g_draws):
+        self.match_points += points
+        self.matches_played += 1
+        
+        if points == 3: self.m_wins += 1
+        elif points == 1: self.m_draws += 1
+        else: self.m_losses += 1
+        
+        self.game_points += (g_wins * 3) + (g_draws * 1)
+        self.games_played += (g_wins + g_losses + g_draws)
+        
+        if opp_name != "BYE":
+            self.opponents.append(opp_name)
+            
+    @property
+    def mw_pct(self):
+        if self.matches_played == 0: return self.min_pct
+        pct = self.match_points / (self.matches_played * 3.0)
+        return max(pct, self.min_pct)
+        
+    @property
+    def gw_pct(self):
+        if self.games_played == 0: return self.min_pct
+        pct = self.game_points / (self.games_played * 3.0)
+        return max(pct, self.min_pct)
+
+def calculate_standings(all_matches, min_pct=MIN_PCT):
+    """
+    Standings from {round: [match, ...]}: points, record and the omw / gw / ogw /
+    mw tiebreaks (each floored at *min_pct*), sorted and ranked.
+    """
+    players = {}
+    
+    # 1. First Pass: Aggregate Stats
+    for r_matches in all_matches.values():
+        for m in r_matches:
+            p1 = m["p1"]
+            p2 = m["p2"]
+            
+            if p1 not in players: players[p1] = PlayerStats(p1, min_pct)
+            if p2 != "BYE" and p2 not in players: players[p2] = PlayerStats(p2, min_pct)
+            
+            p1_pts = 0
+            if m["p1_wins"] > m["p2_wins"]: p1_pts = 3
+            elif m["p2_wins"] > m["p1_wins"]: p1_pts = 0
+            else: p1_pts = 1
+            
+            players[p1].add_match(p1_pts, p2, m["p1_wins"], m["p2_wins"], m["draws"])
+            
+            if p2 != "BYE":
+                p2_pts = 0
+                if m["p2_wins"] > m["p1_wins"]: p2_pts = 3
+                elif m["p1_wins"] > m["p2_wins"]: p2_pts = 0
+                else: p2_pts = 1
+                
+                players[p2].add_match(p2_pts, p1, m["p2_wins"], m["p1_wins"], m["draws"])
+
+    final_standings = []
+    
+    for name, s in players.items():
+        opp_mw_sum = 0
+        opp_gw_sum = 0
+        valid_opps = 0
+        
+        for opp in s.opponents:
+            if opp in players:
+                opp_mw_sum += players[opp].mw_pct
+                opp_gw_sum += players[opp].gw_pct
+                valid_opps += 1
+                
+        omw = opp_mw_sum / valid_opps if valid_opps > 0 else min_pct
+        ogw = opp_gw_sum / valid_opps if valid_opps > 0 else min_pct
+        
+        s.omw = omw
+        s.ogw = ogw
+            
+        final_standings.append(s)
+
+    final_standings.sort(key=lambda x: (x.match_points, x.omw, x.gw_pct, x.ogw), reverse=True)
+    
+    results = []
+    for i, s in enumerate(final_standings):
+        results.append({
+            "rank": i + 1,
+            "name": s.name,
+            "deck": "", # Default empty
+            "points": s.match_points,
+            "record": f"{s.m_wins}-{s.m_losses}-{s.m_draws}",
+            "wins": s.m_wins,
+            "losses": s.m_losses,
+            "draws": s.m_draws,
+            "omw": s.omw, # No * 100
+            "gw": s.gw_pct,
+            "ogw": s.ogw,
+            "mw": s.mw_pct,
+            "payout": 0
+        })
+        
+    return results
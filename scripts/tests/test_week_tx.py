@@ -0,0 +1,63 @@
+"""
+test_week_tx.py – Crash recovery of week_tx.py's journalled commits.
+
+Usage:
+    python -m unittest discover scripts/tests
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from week_tx import TMP_SUFFIX, WeekTransaction, recover
+
+
+class TornJournalTest(unittest.TestCase):
+    """A crash while the journal was being written: nothing was replaced yet."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="week_tx-")
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.journal = os.path.join(self.dir, "week_tx.journal")
+        self.weeks = [os.path.join(self.dir, f"week-{n}.json") for n in (1, 2)]
+        for path in self.weeks:
+            self.write(path, '{"week_number": 0}')
+            self.write(path + TMP_SUFFIX, '{"week_number": 1}')
+        self.write(self.journal, '{"files": ["' + self.weeks[0].replace("\\", "\\\\"))
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def assert_rolled_back(self):
+        self.assertFalse(os.path.exists(self.journal))
+        self.assertEqual(sorted(os.listdir(self.dir)), ["week-1.json", "week-2.json"])
+        for path in self.weeks:
+            self.assertEqual(self.read(path), '{"week_number": 0}')
+
+    def test_recover_rolls_back_and_deletes_temps(self):
+        self.assertEqual(recover(self.journal, self.dir), [])
+        self.assert_rolled_back()
+
+    def test_opening_a_transaction_recovers(self):
+        WeekTransaction(self.journal, self.dir)
+        self.assert_rolled_back()
+
+    def test_no_journal_leaves_temps_alone(self):
+        # Temps without a journal may belong to a commit still in progress
+        os.remove(self.journal)
+        self.assertEqual(recover(self.journal, self.dir), [])
+        for path in self.weeks:
+            self.assertTrue(os.path.exists(path + TMP_SUFFIX))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+unknown_resolver.py – Find and fill in "unknown" deck entries in one pass.
+
+Every unknown entry gets the player's previous and next known deck through
+binary searches on the persisted deck timeline (see deck_timeline.py), instead
+of scanning the player's whole history per entry. A *strategy* decides what
+each entry becomes; the built-in ones match the old one-off scripts:
+
+    easy      prev deck == next deck → use it
+    closest   whichever known deck is nearest in weeks (tie → prev)
+
+find_unknown_decks.py plugs in an interactive strategy. Decisions are grouped
+per week file and committed through week_tx, so each file is written once,
+atomically.
+
+Usage:
+    from unknown_resolver import find_unknowns, resolve, apply_changes, easy
+    changes, skipped = resolve(find_unknowns(), easy)
+    apply_changes(changes)
+
+    python unknown_resolver.py                 # list unknowns with prev/next
+    python unknown_resolver.py --apply easy    # apply a strategy
+    python unknown_resolver.py --apply closest
+    python unknown_resolver.py --apply closest --dry-run   # show the diff only
+"""
+
+import os
+import argparse
+
+from corpus_cache import RAW_DIR, load_corpus
+from deck_timeline import open_timeline
+from week_tx import WeekTransaction
+
+
+class StopResolving(Exception):
+    """Raised by a strategy to stop early; decisions made so far are kept."""
+
+
+# ── Finding ─────────────────────────────────────────────────────────────────
+
+def is_unknown(entry):
+    """A deck of "Unknown" (or no deck key at all). Blank decks are left alone."""
+    deck = entry.get("deck", "unknown")
+    return isinstance(deck, str) and deck.strip().lower() == "unknown"
+
+
+def find_unknowns(raw_dir=RAW_DIR, timeline=None):
+    """
+    Return every unknown deck entry, oldest week first, as dicts with
+    week_num, fname, path, standing_index, player, prev_deck and next_deck
+    (the last two are (week, deck) or None).
+    """
+    if timeline is None:
+        timeline = open_timeline(raw_dir=raw_dir)
+
+    results = []
+    for week_num, path, data in load_corpus(raw_dir):
+        for i, entry in enumerate(data.get("standings", [])):
+            if not is_unknown(entry):
+                continue
+            name = entry.get("name")
+            results.append({
+                "week_num": week_num,
+                "fname": os.path.basename(path),
+                "path": path,
+                "standing_index": i,
+                "player": name,
+                "prev_deck": timeline.deck_before(name, week_num),
+                "next_deck": timeline.deck_after(name, week_num),
+            })
+    return results
+
+
+# ── Strategies ──────────────────────────────────────────────────────────────
+# A strategy takes an unknown entry and returns (new_deck, label), or None to
+# leave the entry as it is.
+
+def easy(entry):
+    """Previous and next known deck agree."""
+    prev, next_ = entry["prev_deck"], entry["next_deck"]
+    if prev and next_ and prev[1] == next_[1]:
+        return prev[1], "same"
+    return None
+
+
+def closest(entry):
+    """Nearest known deck in weeks; ties go to the previous one."""
+    prev, next_ = entry["prev_deck"], entry["next_deck"]
+    wn = entry["week_num"]
+    if prev and next_:
+        if wn - prev[0] <= next_[0] - wn:
+            return prev[1], "prev"
+        return next_[1], "next"
+    if prev:
+        return prev[1], "prev"
+    if next_:
+        return next_[1], "next"
+    return None
+
+
+STRATEGIES = {"easy": easy, "closest": closest}
+
+
+def resolve(unknowns, strategy):
+    """
+    Run *strategy* over *unknowns*.
+    Returns (changes, skipped): changes are (entry, new_deck, label) tuples.
+    """
+    changes, skipped = [], []
+    for entry in unknowns:
+        try:
+            decision = strategy(entry)
+        except StopResolving:
+            break
+        if decision and decision[0] and not is_unknown({"deck": decision[0]}):
+            changes.append((entry, decision[0], decision[1]))
+        else:
+            skipped.append(entry)
+    return changes, skipped
+
+
+# ── Writing ─────────────────────────────────────────────────────────────────
+
+def apply_changes(changes, tx=None):
+    """
+    Write *changes* back, touching each week file once. Pass a WeekTransaction
+    to stage them without committing (e.g. to show a dry-run diff).
+    """
+    own_tx = tx is None
+    if own_tx:
+        tx = WeekTransaction()
+    for entry, new_deck, _label in changes:
+        data = tx.load(entry["path"])
+        data["standings"][entry["standing_index"]]["deck"] = new_deck
+        tx.stage(entry["path"], data)
+    return tx.commit() if own_tx else tx.changed
+
+
+# ── Reporting ───────────────────────────────────────────────────────────────
+
+def format_unknown(entry):
+    prev, next_ = entry["prev_deck"], entry["next_deck"]
+    prev_str = f"{prev[1]} (w{prev[0]})" if prev else "---"
+    next_str = f"{next_[1]} (w{next_[0]})" if next_ else "---"
+    return f"{entry['week_num']:<6} {entry['player']:<26} {prev_str:<40} {next_str}"
+
+
+def print_unknowns(unknowns, title="Unknown entries"):
+    print(f"{title}: {len(unknowns)}\n")
+    print(f"{'#':<5} {'Week':<6} {'Player':<26} {'PREV deck (week)':<40} {'NEXT deck (week)'}")
+    print("-" * 110)
+    for idx, entry in enumerate(unknowns, 1):
+        print(f"{idx:<5} {format_unknown(entry)}")
+
+
+def print_changes(changes):
+    print(f"Applied {len(changes)} replacements:")
+    for entry, new_deck, label in changes:
+        print(f"  week-{entry['week_num']:<4} {entry['player']:<26} [{label}] -> {new_deck}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or fill in unknown deck entries.")
+    parser.add_argument("--apply", choices=sorted(STRATEGIES),
+                        help="Apply a strategy instead of only listing.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="With --apply: print the diff instead of writing.")
+    args = parser.parse_args()
+
+    unknowns = find_unknowns()
+    if not args.apply:
+        print_unknowns(unknowns)
+        return
+
+    changes, skipped = resolve(unknowns, STRATEGIES[args.apply])
+    if args.dry_run:
+        tx = WeekTransaction()
+        apply_changes(changes, tx)
+        print(tx.diff(), end="")
+        return
+    apply_changes(changes)
+    print_changes(changes)
+    if skipped:
+        print()
+        print_unknowns(skipped, title="Remaining unknown entries")
+
+
+if __name__ == "__main__":
+    main()
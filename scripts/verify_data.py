@@ -6,6 +6,9 @@ Usage:
     python verify_data.py                  # runs against newest week-*.json
     python verify_data.py week-85.json     # runs against a specific file
     python verify_data.py 85               # shorthand: week number only
+
+    from verify_data import verify
+    verify(85)["status"]                   # "saved", "unchanged", "discarded" or "error"
 """
 
 import os
@@ -14,18 +17,25 @@ import re
 import json
 import glob
 import argparse
+from collections import OrderedDict
 
+import numpy as np
 from rapidfuzz import fuzz, process
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.shortcuts import CompleteStyle
 
+import deck_timeline
+from name_index import NameIndex
+from week_tx import WeekTransaction
+
 # ── Paths ───────────────────────────────────────────────────────────────────
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 RAW_DIR = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "raw")
 PLAYERS_FILE = os.path.join(SCRIPT_DIR, "Players.txt")
 DECKLIST_FILE = os.path.join(SCRIPT_DIR, "Decklist.txt")
+ALIASES_FILE = os.path.join(SCRIPT_DIR, "Aliases.json")
 
 # ── Styling (ANSI escape codes) ─────────────────────────────────────────────
 os.system("")  # enable ANSI escape processing on Windows
@@ -43,15 +53,63 @@ COLORS  = {
 
 FUZZY_THRESHOLD = 70        # minimum score to consider a fuzzy match
 FUZZY_TOP_N = 5             # how many suggestions to show
+BATCH_FUZZY_SCORE = 95      # --batch auto-accepts fuzzy matches at or above this score…
+BATCH_FUZZY_MARGIN = 5      # …if they beat the runner-up by at least this much
+
+EXIT_DISCARDED = 2          # user chose not to save
+EXIT_NEEDS_REVIEW = 3       # --batch left names or decks for a human
 
 
 class RapidFuzzyCompleter(Completer):
-    """Dropdown completer powered by rapidfuzz – matches full multi-word entries."""
+    """
+    Dropdown completer powered by rapidfuzz – matches full multi-word entries.
+
+    Build one per list and reuse it for every prompt in a session: lowercased
+    forms and word-prefix tables are computed once, substring candidates narrow
+    incrementally from the previous keystroke, and ranked results are cached
+    per query so backspacing is free.
+    """
+
+    WORD_PREFIX_LEN = 3     # word prefixes up to this length are precomputed
+    CACHE_SIZE = 256        # queries whose candidates / rankings are kept
 
     def __init__(self, items, min_score=40, limit=10):
-        self.items = list(items)
         self.min_score = min_score
         self.limit = limit
+        self.items = []
+        self._lower = []
+        self._index = {}         # item → position (dedupes add())
+        self._word_prefix = {}   # short word prefix → {positions}
+        self._subs = OrderedDict()    # query → positions whose text contains it
+        self._ranked = OrderedDict()  # query → [(position, score), ...]
+        self.add(*items)
+
+    def add(self, *items):
+        """Add new entries (e.g. a player created mid-session) and drop cached rankings."""
+        for item in items:
+            if item in self._index:
+                continue
+            pos = len(self.items)
+            lower = item.lower()
+            self.items.append(item)
+            self._lower.append(lower)
+            self._index[item] = pos
+            for word in lower.split():
+                for n in range(1, min(len(word), self.WORD_PREFIX_LEN) + 1):
+                    self._word_prefix.setdefault(word[:n], set()).add(pos)
+        self._subs.clear()
+        self._ranked.clear()
+
+    def truncate(self, size):
+        """Drop every entry added after the completer held *size* items (undoes add())."""
+        for item in self.items[size:]:
+            del self._index[item]
+        for word_positions in self._word_prefix.values():
+            word_positions.difference_update(range(size, len(self.items)))
+        del self.items[size:]
+        del self._lower[size:]
+        self._subs.clear()
+        self._ranked.clear()
 
     @staticmethod
     def _score(query, candidate):
@@ -80,6 +138,68 @@ class RapidFuzzyCompleter(Completer):
         # over-weighting partial matches on very different-length strings
         return fuzz.ratio(q, c)
 
+    @staticmethod
+    def _remember(cache, key, value, size):
+        cache[key] = value
+        if len(cache) > size:
+            cache.popitem(last=False)
+
+    def _substring_hits(self, q):
+        """Positions whose lowercased text contains *q*, narrowed from the longest cached prefix."""
+        hits = self._subs.get(q)
+        if hits is not None:
+            self._subs.move_to_end(q)
+            return hits
+        pool = None
+        for n in range(len(q) - 1, 0, -1):
+            pool = self._subs.get(q[:n])
+            if pool is not None:
+                break
+        lower = self._lower
+        if pool is None:
+            hits = [i for i, c in enumerate(lower) if q in c]
+        else:
+            hits = [i for i in pool if q in lower[i]]
+        self._remember(self._subs, q, hits, self.CACHE_SIZE)
+        return hits
+
+    def rank(self, text):
+        """Return [(item, score), ...] best first, same ordering as scoring every item with _score()."""
+        q = text.lower()
+        ranked = self._ranked.get(q)
+        if ranked is None:
+            lower = self._lower
+            word_hits = self._word_prefix.get(q, ()) if len(q) <= self.WORD_PREFIX_LEN else None
+
+            scores = {}
+            for i in self._substring_hits(q):
+                c = lower[i]
+                if c == q:
+                    scores[i] = 100
+                elif c.startswith(q):
+                    scores[i] = 95
+                elif (i in word_hits) if word_hits is not None else any(w.startswith(q) for w in c.split()):
+                    scores[i] = 90
+                else:
+                    scores[i] = 85
+
+            # Fuzzy scores only matter if they can reach the top *limit*
+            if len(scores) >= self.limit:
+                cutoff = max(self.min_score, sorted(scores.values(), reverse=True)[self.limit - 1])
+                fuzzy = process.extract(q, lower, scorer=fuzz.ratio, processor=None,
+                                        score_cutoff=cutoff, limit=None)
+            else:
+                fuzzy = process.extract(q, lower, scorer=fuzz.ratio, processor=None,
+                                        score_cutoff=self.min_score, limit=self.limit + len(scores))
+            for _c, score, i in fuzzy:
+                scores.setdefault(i, score)
+
+            ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:self.limit]
+            self._remember(self._ranked, q, ranked, self.CACHE_SIZE)
+        else:
+            self._ranked.move_to_end(q)
+        return [(self.items[i], score) for i, score in ranked]
+
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor.strip()
         if not text:
@@ -87,10 +207,7 @@ class RapidFuzzyCompleter(Completer):
                 yield Completion(item, start_position=-len(document.text_before_cursor))
             return
 
-        scored = [(item, self._score(text, item)) for item in self.items]
-        scored.sort(key=lambda x: x[1], reverse=True)
-
-        for match_text, score in scored[:self.limit]:
+        for match_text, score in self.rank(text):
             if score >= self.min_score:
                 yield Completion(
                     match_text,
@@ -130,6 +247,47 @@ def save_lines(filepath, header, lines):
     os.replace(tmp, filepath)
 
 
+def load_aliases(filepath=ALIASES_FILE):
+    """Load the alias table {raw name: canonical player}."""
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_aliases(aliases, filepath=ALIASES_FILE):
+    """Write the alias table sorted by alias (atomic write)."""
+    tmp = filepath + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(aliases.items())), f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, filepath)
+
+
+def learn_aliases(aliases, rename_map):
+    """Record confirmed renames as aliases. Returns True if the table changed."""
+    changed = False
+    for old, new in rename_map.items():
+        if old != new and aliases.get(old) != new:
+            aliases[old] = new
+            changed = True
+    return changed
+
+
+def apply_renames(data, rename_map):
+    """Rename players in standings and in both sides of every match."""
+    for entry in data.get("standings", []):
+        if entry["name"] in rename_map:
+            entry["name"] = rename_map[entry["name"]]
+
+    for rnd in data.get("rounds", []):
+        for match in rnd.get("matches", []):
+            if match.get("p1") in rename_map:
+                match["p1"] = rename_map[match["p1"]]
+            if match.get("p2") in rename_map:
+                match["p2"] = rename_map[match["p2"]]
+
+
 def find_newest_week_file():
     """Return the path to the week-*.json with the highest week number."""
     pattern = os.path.join(RAW_DIR, "week-*.json")
@@ -169,56 +327,38 @@ def fuzzy_match(name, known_names, threshold=FUZZY_THRESHOLD, top_n=FUZZY_TOP_N)
     return [(match, score) for match, score, _ in results if score >= threshold]
 
 
-def load_deck_history(exclude_file=None):
-    """Scan all raw week-*.json files and return {player_name: [(week, deck), ...]} sorted newest-first."""
-    pattern = os.path.join(RAW_DIR, "week-*.json")
-    files = glob.glob(pattern)
-
-    def _week_num_from_path(fpath):
-        """Extract week number from filename (e.g. week-89.json → 89)."""
-        m = re.search(r"week-(\d+)\.json$", fpath)
-        return int(m.group(1)) if m else 0
-
-    history = {}  # name → [(week_number, deck)]
-    for fpath in files:
-        if exclude_file and os.path.abspath(fpath) == os.path.abspath(exclude_file):
-            continue
-        try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                week_data = json.load(f)
-            # Prefer week_number field, fall back to parsing filename
-            wk = week_data.get("week_number") or _week_num_from_path(fpath)
-            for entry in week_data.get("standings", []):
-                deck = entry.get("deck", "").strip()
-                name = entry.get("name", "")
-                if name and deck:
-                    history.setdefault(name, []).append((wk, deck))
-        except (json.JSONDecodeError, KeyError):
-            continue
-
-    # Sort each player's history newest-first
-    for name in history:
-        history[name].sort(key=lambda x: x[0], reverse=True)
-    return history
-
-
-def get_recent_decks(player_name, deck_history, count=3):
+def fuzzy_match_batch(names, known_names, threshold=FUZZY_THRESHOLD, top_n=FUZZY_TOP_N):
+    """
+    Score every name in *names* against *known_names* in one multithreaded
+    rapidfuzz call. Returns {name: [(match, score), ...]} like fuzzy_match().
+    """
+    names = list(dict.fromkeys(names))
+    if not names or not known_names:
+        return {name: [] for name in names}
+
+    scores = process.cdist(names, known_names, scorer=fuzz.WRatio,
+                           score_cutoff=threshold, workers=-1)
+    # Stable sort keeps Players.txt order for ties, same as process.extract
+    top = np.argsort(-scores, axis=1, kind="stable")[:, :top_n]
+
+    results = {}
+    for row, name in enumerate(names):
+        results[name] = [
+            (known_names[col], float(scores[row, col]))
+            for col in top[row]
+            if scores[row, col] >= threshold
+        ]
+    return results
+
+
+def get_recent_decks(player_name, timeline, exclude_week=None, count=3):
     """Return up to *count* most recent distinct decks for a player."""
-    entries = deck_history.get(player_name, [])
-    seen = set()
-    recent = []
-    for _wk, deck in entries:
-        if deck not in seen:
-            seen.add(deck)
-            recent.append(deck)
-            if len(recent) >= count:
-                break
-    return recent
+    return timeline.recent_decks(player_name, count=count, exclude_week=exclude_week)
 
 
 # ── Interactive prompts ─────────────────────────────────────────────────────
 
-def prompt_select_name(session, original, suggestions, all_names):
+def prompt_select_name(session, original, suggestions, all_names, completer=None):
     """
     Let the user pick from fuzzy suggestions, search all names, or type a new one.
     Returns the chosen name and whether it's brand-new (needs adding to file).
@@ -239,7 +379,8 @@ def prompt_select_name(session, original, suggestions, all_names):
     pf("muted", "    • Press Enter with no input to KEEP the original name")
     print()
 
-    completer = RapidFuzzyCompleter(all_names)
+    if completer is None:
+        completer = RapidFuzzyCompleter(all_names)
 
     while True:
         answer = session.prompt(
@@ -291,20 +432,21 @@ def prompt_auto_accept(session, original, suggestion_name, score):
     return answer in ("", "y", "yes")
 
 
-def prompt_deck(session, player_name, current_deck, all_decks, deck_history):
+def prompt_deck(session, player_name, current_deck, all_decks, timeline, week=None, completer=None):
     """Prompt the user to assign / change a deck for a player."""
     display_deck = current_deck if current_deck else "(none)"
     pf("muted", f"  Current deck: {display_deck}")
 
     # Show recent decks as quick-pick options
-    recent = get_recent_decks(player_name, deck_history)
+    recent = get_recent_decks(player_name, timeline, exclude_week=week)
     if recent:
         pf("muted", "  Recent decks:")
         for i, deck in enumerate(recent, 1):
             pf("muted", f"    {i}. {deck}")
 
     pf("muted", "  Type to search, pick a number, or Enter to keep current.")
-    completer = RapidFuzzyCompleter(all_decks)
+    if completer is None:
+        completer = RapidFuzzyCompleter(all_decks)
     answer = session.prompt(
         f"  ➜  Deck for {player_name}: ",
         completer=completer,
@@ -338,32 +480,185 @@ def prompt_deck(session, player_name, current_deck, all_decks, deck_history):
     return answer, is_new
 
 
-# ── Main flow ───────────────────────────────────────────────────────────────
+# ── Batch mode ──────────────────────────────────────────────────────────────
 
-def main():
-    parser = argparse.ArgumentParser(description="Verify player names and assign decks.")
-    parser.add_argument("file", nargs="?", default=None,
-                        help="Week file to verify (number, filename, or path). "
-                             "Defaults to newest week-*.json.")
-    args = parser.parse_args()
+def auto_resolve_name(name, name_set, aliases, suggestions, name_index=None):
+    """
+    Resolve *name* without prompting. Returns (canonical, reason) or (None, None)
+    if a human needs to decide.
+    """
+    if name in name_set:
+        return name, "exact"
+    if aliases.get(name) in name_set:
+        return aliases[name], "alias"
+    folded = name_index.resolve(name) if name_index else None
+    if folded:
+        return folded, "normalised"
+    if suggestions:
+        best_name, best_score = suggestions[0]
+        runner_up = suggestions[1][1] if len(suggestions) > 1 else 0
+        if best_score >= BATCH_FUZZY_SCORE and best_score - runner_up >= BATCH_FUZZY_MARGIN:
+            return best_name, f"fuzzy {best_score:.0f}%"
+    return None, None
 
-    # Create interactive session – MULTI_COLUMN renders completions as text
-    # below the prompt (more reliable than floating popup on Windows)
-    session = PromptSession(complete_style=CompleteStyle.MULTI_COLUMN)
 
-    # Resolve file
-    filepath = resolve_file(args.file)
-    if not filepath or not os.path.exists(filepath):
-        pf("err", f"✗ File not found: {args.file or '(no week files)'}")
-        sys.exit(1)
+def run_batch(filepaths):
+    """
+    Verify one or more week files without prompting: apply aliases, exact and
+    high-confidence fuzzy matches, save, and list whatever still needs a human.
+    Returns the process exit code.
+    """
+    all_names = load_lines(PLAYERS_FILE)
+    name_set = set(all_names)
+    name_index = NameIndex(all_names)
+    aliases = load_aliases()
+    tx = WeekTransaction()
+    needs_review = 0
+    empty = 0
+
+    for filepath in filepaths:
+        filename = os.path.basename(filepath)
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        standings = data.get("standings", [])
+        if not standings:
+            pf("err", f"  ✗  {filename}: no standings found in file")
+            empty += 1
+            continue
+
+        unknown = [e["name"] for e in standings if e["name"] not in name_set]
+        # Only names that neither an alias nor the normalised index explains need fuzzy scoring
+        suggestions_by_name = fuzzy_match_batch(
+            [n for n in unknown if aliases.get(n) not in name_set and not name_index.resolve(n)],
+            all_names)
+
+        rename_map = {}
+        unresolved = []
+        for name in unknown:
+            suggestions = suggestions_by_name.get(name, [])
+            chosen, reason = auto_resolve_name(name, name_set, aliases, suggestions, name_index)
+            if chosen is None:
+                unresolved.append((name, suggestions))
+            else:
+                rename_map[name] = chosen
+                pf("ok", f"  ✓  {filename}: {name}  →  {chosen}  ({reason})")
+
+        if rename_map:
+            apply_renames(data, rename_map)
+            tx.stage(filepath, data)
+
+        missing_decks = [e["name"] for e in standings if not (e.get("deck") or "").strip()]
+
+        for name, suggestions in unresolved:
+            hint = f"best: {suggestions[0][0]} ({suggestions[0][1]:.0f}%)" if suggestions else "no close match"
+            pf("warn", f"  ?  {filename}: unknown player \"{name}\"  — {hint}")
+        if missing_decks:
+            pf("warn", f"  ?  {filename}: no deck for {', '.join(missing_decks)}")
+        if not unresolved and not missing_decks:
+            pf("ok", f"  ✓  {filename}: all players and decks verified")
+
+        needs_review += len(unresolved) + len(missing_decks)
+
+    # Resolved renames across all files are written together
+    saved = tx.commit()
+    if saved:
+        pf("ok", f"  ✓  Saved {len(saved)} file(s)")
 
-    filename = os.path.basename(filepath)
-    title = " Oslo Legacy League - Verify Tournament Data "
-    print()
-    pf("banner", f"  ╔{'═' * len(title)}╗")
-    pf("banner", f"  ║{title}║")
-    pf("banner", f"  ╚{'═' * len(title)}╝")
     print()
+    if empty:
+        pf("err", f"  {empty} file(s) have no standings — re-scrape them before verifying.")
+        return 1
+    if needs_review:
+        pf("warn", f"  {needs_review} item(s) need a human — run verify_data.py interactively on the files above.")
+        return EXIT_NEEDS_REVIEW
+    pf("ok", "  Nothing left to review.")
+    return 0
+
+
+# ── Session ─────────────────────────────────────────────────────────────────
+
+class VerifySession:
+    """
+    Reference data shared by every week verified in one process: player and
+    deck lists, aliases, completion indexes and the deck timeline are loaded
+    once and updated in memory as each week is confirmed. Confirmed weeks are
+    staged and written together by commit().
+    """
+
+    def __init__(self):
+        # MULTI_COLUMN renders completions as text below the prompt
+        # (more reliable than floating popup on Windows)
+        self.prompt = PromptSession(complete_style=CompleteStyle.MULTI_COLUMN)
+
+        self.all_names = load_lines(PLAYERS_FILE)
+        self.all_decks = load_lines(DECKLIST_FILE)
+        self.name_set = set(self.all_names)
+        self.name_index = NameIndex(self.all_names)
+        self.aliases = load_aliases()
+        self.timeline = deck_timeline.open_timeline()
+
+        # One completion index per list, shared by every prompt in this session
+        self.name_completer = RapidFuzzyCompleter(self.all_names)
+        self.deck_completer = RapidFuzzyCompleter(self.all_decks)
+
+        self.names_changed = False
+        self.aliases_changed = False
+        self.staged = {}  # filepath → data, confirmed but not yet written
+
+    def stage(self, filepath, data, rename_map):
+        """Accept a verified week: update in-memory history and queue it for writing."""
+        self.staged[filepath] = data
+        self.timeline.update_week(deck_timeline.week_of(filepath), data, os.path.abspath(filepath))
+        if learn_aliases(self.aliases, rename_map):
+            self.aliases_changed = True
+
+    def commit(self):
+        """Write every staged week plus the updated reference lists."""
+        # All week files are swapped in together (also updates the persisted timeline)
+        with WeekTransaction() as tx:
+            for filepath, data in self.staged.items():
+                tx.stage(filepath, data)
+        for filepath in self.staged:
+            pf("ok", f"  ✓ Saved {os.path.basename(filepath)}")
+
+        # Remember confirmed renames for next time
+        if self.aliases_changed:
+            save_aliases(self.aliases)
+            pf("ok", "  ✓ Updated Aliases.json")
+
+        # Write updated player list
+        if self.names_changed:
+            save_lines(PLAYERS_FILE, "Name", self.all_names)
+            pf("ok", "  ✓ Updated Players.txt")
+
+        # Write updated deck list
+        original_decks = set(load_lines(DECKLIST_FILE))
+        new_decks = [d for d in self.all_decks if d not in original_decks]
+        if new_decks:
+            full_list = list(original_decks | set(new_decks))
+            save_lines(DECKLIST_FILE, None, full_list)
+            pf("ok", f"  ✓ Updated Decklist.txt (+{len(new_decks)} new)")
+
+        self.staged.clear()
+
+
+def ask_yes_no(question):
+    while True:
+        confirm = input(f"  {question} (y/n): ").strip().lower()
+        if confirm in ("y", "yes"):
+            return True
+        if confirm in ("n", "no"):
+            return False
+        pf("warn", "  Please type 'y' or 'n'.")
+
+
+def verify_week(vs, filepath, confirm_prompt="Save changes?"):
+    """
+    Run both phases for one week file.
+    Returns "staged", "discarded", "unchanged" or "error" (no standings to verify).
+    """
+    session = vs.prompt
+    filename = os.path.basename(filepath)
     pf("highlight", f"  File: {filename}")
 
     # Load data
@@ -374,16 +669,13 @@ def main():
     rounds = data.get("rounds", [])
     if not standings:
         pf("err", "  ✗ No standings found in file.")
-        sys.exit(1)
+        return "error"
 
     pf("muted", f"  Players: {len(standings)}  |  Rounds: {len(rounds)}")
 
-    # Load reference lists
-    all_names = load_lines(PLAYERS_FILE)
-    all_decks = load_lines(DECKLIST_FILE)
-
-    name_set = set(all_names)
-    names_changed = False
+    # Snapshot so additions can be rolled back if this week is discarded
+    n_names, n_decks, names_changed = len(vs.all_names), len(vs.all_decks), vs.names_changed
+    n_name_items, n_deck_items = len(vs.name_completer.items), len(vs.deck_completer.items)
     rename_map = {}  # old name → new name
 
     # ── Phase 1: Verify player names ────────────────────────────────────
@@ -391,15 +683,35 @@ def main():
     pf("header", "  ── Phase 1: Verify Player Names ─────────────────────")
     print()
 
+    # Score every unknown name up front in one batched call, skipping names
+    # an alias or the normalised index resolves without fuzzy matching
+    unknown = [entry["name"] for entry in standings
+               if entry["name"] not in vs.name_set
+               and vs.aliases.get(entry["name"]) not in vs.name_set
+               and not vs.name_index.resolve(entry["name"])]
+    suggestions_by_name = fuzzy_match_batch(unknown, vs.all_names)
+
     for entry in standings:
         name = entry["name"]
 
-        if name in name_set:
+        if name in vs.name_set:
             pf("ok", f"  ✓  {name}")
             continue
 
-        # Try fuzzy match
-        suggestions = fuzzy_match(name, all_names)
+        # Previously confirmed alias
+        if vs.aliases.get(name) in vs.name_set:
+            rename_map[name] = vs.aliases[name]
+            pf("ok", f"  ✓  {name}  →  {vs.aliases[name]}  (alias)")
+            continue
+
+        # Same name up to accents, Nordic letters, case or spacing
+        folded = vs.name_index.resolve(name)
+        if folded:
+            rename_map[name] = folded
+            pf("ok", f"  ✓  {name}  →  {folded}  (normalised)")
+            continue
+
+        suggestions = suggestions_by_name.get(name, [])
 
         if suggestions:
             best_name, best_score = suggestions[0]
@@ -411,18 +723,20 @@ def main():
                 # User declined auto-match → fall through to full selection
 
             # Show full selection UI
-            chosen, is_new = prompt_select_name(session, name, suggestions, all_names)
+            chosen, is_new = prompt_select_name(session, name, suggestions, vs.all_names, vs.name_completer)
         else:
             # No suggestions at all
-            chosen, is_new = prompt_select_name(session, name, [], all_names)
+            chosen, is_new = prompt_select_name(session, name, [], vs.all_names, vs.name_completer)
 
         if chosen != name:
             rename_map[name] = chosen
 
         if is_new:
-            all_names.append(chosen)
-            name_set.add(chosen)
-            names_changed = True
+            vs.all_names.append(chosen)
+            vs.name_completer.add(chosen)
+            vs.name_index.add(chosen)
+            vs.name_set.add(chosen)
+            vs.names_changed = True
 
     # Apply renames to standings
     if rename_map:
@@ -431,18 +745,7 @@ def main():
         for old, new in rename_map.items():
             pf("muted", f"     {old}  →  {new}")
 
-        # Rename in standings
-        for entry in standings:
-            if entry["name"] in rename_map:
-                entry["name"] = rename_map[entry["name"]]
-
-        # Rename in rounds/matches
-        for rnd in rounds:
-            for match in rnd.get("matches", []):
-                if match.get("p1") in rename_map:
-                    match["p1"] = rename_map[match["p1"]]
-                if match.get("p2") in rename_map:
-                    match["p2"] = rename_map[match["p2"]]
+        apply_renames(data, rename_map)
     else:
         print()
         pf("ok", "  All player names verified — no changes needed.")
@@ -450,8 +753,7 @@ def main():
     # ── Phase 2: Assign decks ───────────────────────────────────────────
     print()
     pf("header", "  ── Phase 2: Assign Decks ────────────────────────────")
-    pf("muted", "  Loading deck history...")
-    deck_history = load_deck_history(exclude_file=filepath)
+    week = deck_timeline.week_of(filepath)
     print()
 
     decks_changed = False
@@ -460,67 +762,168 @@ def main():
         current_deck = entry.get("deck", "")
 
         pf("highlight", f"  [{entry['rank']}] {name}")
-        chosen_deck, is_new_deck = prompt_deck(session, name, current_deck, all_decks, deck_history)
+        chosen_deck, is_new_deck = prompt_deck(session, name, current_deck, vs.all_decks,
+                                               vs.timeline, week, vs.deck_completer)
 
         if chosen_deck != current_deck:
             entry["deck"] = chosen_deck
             decks_changed = True
 
         if is_new_deck:
-            all_decks.append(chosen_deck)
+            vs.all_decks.append(chosen_deck)
+            vs.deck_completer.add(chosen_deck)
         print()
 
-    # ── Save ────────────────────────────────────────────────────────────
-    any_changes = rename_map or decks_changed or names_changed
+    # ── Confirm ─────────────────────────────────────────────────────────
+    any_changes = rename_map or decks_changed or vs.names_changed != names_changed
 
-    if any_changes:
-        print()
-        pf("header", "  ── Summary ──────────────────────────────────────────")
-        print()
-        for entry in standings:
-            deck_display = entry.get("deck") or "(none)"
-            pf("muted", f"  {entry['rank']:>2}. {entry['name']:<30} {deck_display}")
+    if not any_changes:
         print()
+        pf("ok", "  No changes made.")
+        return "unchanged"
 
-        while True:
-            confirm = input(
-                "  Save changes? (y/n): "
-            ).strip().lower()
-            if confirm in ("y", "yes"):
-                break
-            elif confirm in ("n", "no"):
-                break
-            pf("warn", "  Please type 'y' or 'n'.")
+    print()
+    pf("header", "  ── Summary ──────────────────────────────────────────")
+    print()
+    for entry in standings:
+        deck_display = entry.get("deck") or "(none)"
+        pf("muted", f"  {entry['rank']:>2}. {entry['name']:<30} {deck_display}")
+    print()
+
+    if ask_yes_no(confirm_prompt):
+        vs.stage(filepath, data, rename_map)
+        return "staged"
+
+    # Roll back names/decks added while verifying this week
+    for added in vs.all_names[n_names:]:
+        vs.name_set.discard(added)
+    del vs.all_names[n_names:]
+    vs.name_index = NameIndex(vs.all_names)
+    del vs.all_decks[n_decks:]
+    vs.name_completer.truncate(n_name_items)
+    vs.deck_completer.truncate(n_deck_items)
+    vs.names_changed = names_changed
+    pf("warn", "  Changes discarded.")
+    return "discarded"
 
-        if confirm in ("y", "yes"):
-            # Write JSON
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            pf("ok", f"  ✓ Saved {filename}")
-
-            # Write updated player list
-            if names_changed:
-                save_lines(PLAYERS_FILE, "Name", all_names)
-                pf("ok", "  ✓ Updated Players.txt")
-
-            # Write updated deck list
-            original_decks = set(load_lines(DECKLIST_FILE))
-            new_decks = [d for d in all_decks if d not in original_decks]
-            if new_decks:
-                full_list = list(original_decks | set(new_decks))
-                save_lines(DECKLIST_FILE, None, full_list)
-                pf("ok", f"  ✓ Updated Decklist.txt (+{len(new_decks)} new)")
 
+def verify(filepath=None, session=None):
+    """
+    Verify one week file interactively and, if confirmed, write it together
+    with any new players, decks and aliases. *filepath* is anything the CLI
+    accepts (default: the newest week); pass a VerifySession to reuse
+    reference lists that are already loaded.
+    Returns {"path", "status", "new_players", "new_decks"}, where status is
+    "saved", "unchanged", "discarded" or "error" (the file has no standings).
+    """
+    path = resolve_file(None if filepath is None else str(filepath))
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(filepath or "no week files")
+
+    vs = session or VerifySession()
+    n_names, n_decks = len(vs.all_names), len(vs.all_decks)
+    status = verify_week(vs, path)
+    if status == "staged":
+        new_players, new_decks = vs.all_names[n_names:], vs.all_decks[n_decks:]
+        vs.commit()
+        return {"path": path, "status": "saved", "new_players": new_players, "new_decks": new_decks}
+    return {"path": path, "status": status, "new_players": [], "new_decks": []}
+
+
+def expand_week_args(args):
+    """Expand CLI arguments, turning ranges like "89-95" into one entry per week."""
+    expanded = []
+    for arg in args:
+        m = re.fullmatch(r"(\d+)-(\d+)", arg)
+        if m:
+            lo, hi = sorted((int(m.group(1)), int(m.group(2))))
+            for wk in range(lo, hi + 1):
+                if os.path.exists(os.path.join(RAW_DIR, f"week-{wk}.json")):
+                    expanded.append(str(wk))
+                else:
+                    pf("muted", f"  (skipping week {wk} — no file)")
+        else:
+            expanded.append(arg)
+    return expanded
+
+
+# ── Main flow ───────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify player names and assign decks.")
+    parser.add_argument("files", nargs="*", default=None,
+                        help="Week file(s) to verify (number, range like 89-95, filename, or path). "
+                             "Defaults to newest week-*.json.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Don't prompt: apply aliases, exact and high-confidence fuzzy "
+                             "matches, and list what still needs a human.")
+    args = parser.parse_args()
+
+    # Resolve files
+    week_args = expand_week_args(args.files) or [None]
+    filepaths = [resolve_file(arg) for arg in week_args]
+    for arg, filepath in zip(week_args, filepaths):
+        if not filepath or not os.path.exists(filepath):
+            pf("err", f"✗ File not found: {arg or '(no week files)'}")
+            sys.exit(1)
+
+    if args.batch:
+        sys.exit(run_batch(filepaths))
+
+    title = " Oslo Legacy League - Verify Tournament Data "
+    print()
+    pf("banner", f"  ╔{'═' * len(title)}╗")
+    pf("banner", f"  ║{title}║")
+    pf("banner", f"  ╚{'═' * len(title)}╝")
+    print()
+
+    pf("muted", "  Loading players, decks and deck history...")
+    vs = VerifySession()
+
+    # ── Single file: confirm and save right away ────────────────────────
+    if len(filepaths) == 1:
+        result = verify(filepaths[0], vs)
+        if result["status"] == "saved":
             print()
             pf("ok", "  Done! You can now run convert_data.py to rebuild db.json.")
-        else:
-            pf("warn", "  Changes discarded.")
-            sys.exit(2)
-    else:
+        elif result["status"] == "discarded":
+            sys.exit(EXIT_DISCARDED)
+        elif result["status"] == "error":
+            sys.exit(1)
         print()
-        pf("ok", "  No changes made.")
+        return
 
+    # ── Session: confirm each week, write everything at the end ─────────
+    pf("muted", f"  Session: {len(filepaths)} weeks — changes are written together at the end.")
+    results = {}
+    try:
+        for i, filepath in enumerate(filepaths, 1):
+            print()
+            pf("header", f"  ══ Week {i} / {len(filepaths)} ══════════════════════════════════════")
+            results[filepath] = verify_week(vs, filepath, confirm_prompt="Keep changes for this week?")
+    except (KeyboardInterrupt, EOFError):
+        print()
+        pf("warn", "  Session interrupted.")
+
+    print()
+    pf("header", "  ── Session summary ──────────────────────────────────")
+    for filepath in filepaths:
+        pf("muted", f"  {os.path.basename(filepath):<16} {results.get(filepath, 'not reached')}")
+    print()
+    failed = "error" in results.values()
+
+    if not vs.staged:
+        pf("ok", "  Nothing to save.")
+    elif ask_yes_no(f"Write {len(vs.staged)} week file(s)?"):
+        vs.commit()
+        print()
+        pf("ok", "  Done! You can now run convert_data.py to rebuild db.json.")
+    else:
+        pf("warn", "  Changes discarded.")
+        sys.exit(EXIT_DISCARDED)
     print()
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
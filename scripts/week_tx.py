@@ -0,0 +1,209 @@
+"""
+week_tx.py – Transactional, batched writes to the raw week-*.json files.
+
+Bulk fixes stage their edits in a WeekTransaction and commit once. On commit,
+every touched file is serialised to a temp file next to it and synced to disk.
+A journal listing the temp files is then written to `.cache/week_tx.journal`,
+and the temps are swapped in with os.replace. A crash before the journal
+exists leaves the originals untouched. A crash after it is rolled forward by
+recover(), which runs automatically the next time a transaction is opened; a
+torn journal (the crash hit while it was written) is rolled back instead, and
+the transaction's temp files are deleted.
+No reader ever sees half-written JSON, and each file is written at most once
+per transaction.
+
+Usage:
+    from week_tx import WeekTransaction
+    with WeekTransaction() as tx:
+        data = tx.load(path)
+        data["standings"][0]["deck"] = "Dreadnought"
+        tx.stage(path, data)
+    # committed here (discarded if the block raised)
+
+    tx.diff()      # unified diff of all staged changes (dry run)
+
+    python week_tx.py --recover   # finish an interrupted commit by hand
+"""
+
+import os
+import glob
+import json
+import difflib
+import argparse
+
+from corpus_cache import CACHE_DIR, RAW_DIR
+from deck_timeline import record_weeks
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+JOURNAL_PATH = os.path.join(CACHE_DIR, "week_tx.journal")
+TMP_SUFFIX = ".tx-tmp"
+
+
+def _write_synced(path, text):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def recover(journal_path=JOURNAL_PATH, data_dir=RAW_DIR):
+    """
+    Finish a commit that was interrupted after its journal was written.
+    Returns the list of files that were rolled forward.
+    """
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            journal = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError):
+        # A torn journal means the crash happened before any file was replaced;
+        # it can't say which temps it wrote, so drop every one in *data_dir*
+        for tmp in glob.glob(os.path.join(glob.escape(data_dir), "*" + TMP_SUFFIX)):
+            os.remove(tmp)
+        os.remove(journal_path)
+        return []
+
+    rolled = []
+    for path in journal.get("files", []):
+        tmp = path + TMP_SUFFIX
+        if os.path.exists(tmp):
+            os.replace(tmp, path)
+            rolled.append(path)
+    record_weeks((path, None) for path in journal.get("files", []) if os.path.exists(path))
+    os.remove(journal_path)
+    return rolled
+
+
+class WeekTransaction:
+    """Staged edits to one or more week files, committed together."""
+
+    def __init__(self, journal_path=JOURNAL_PATH, data_dir=RAW_DIR):
+        self.journal_path = journal_path
+        self.original = {}  # path → text on disk when first loaded/staged
+        self.staged = {}    # path → (new text, data or None)
+        recover(journal_path, data_dir)
+
+    # ── Staging ─────────────────────────────────────────────────────────
+
+    def _original_text(self, path):
+        if path not in self.original:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.original[path] = f.read()
+            except FileNotFoundError:
+                self.original[path] = None
+        return self.original[path]
+
+    def load(self, path):
+        """Parsed content of *path*, including any edits already staged in this transaction."""
+        path = os.path.abspath(path)
+        if path in self.staged:
+            text, _data = self.staged[path]
+        else:
+            text = self._original_text(path)
+        if text is None:
+            raise FileNotFoundError(path)
+        return json.loads(text)
+
+    def stage(self, path, data, ensure_ascii=None):
+        """
+        Queue *data* as the new content of *path* (indent=2, like every other writer).
+        By default the file keeps its current style: \\u-escaped if it is pure
+        ASCII on disk (as aetherhub.py writes it), literal UTF-8 otherwise.
+        """
+        if ensure_ascii is None:
+            original = self._original_text(os.path.abspath(path))
+            ensure_ascii = original is not None and original.isascii()
+        self.stage_text(path, json.dumps(data, indent=2, ensure_ascii=ensure_ascii), data)
+
+    def stage_text(self, path, text, data=None):
+        """Queue raw *text* as the new content of *path*."""
+        path = os.path.abspath(path)
+        self._original_text(path)
+        self.staged[path] = (text, data)
+
+    @property
+    def changed(self):
+        """Paths whose staged content differs from what is on disk."""
+        return [p for p, (text, _data) in self.staged.items() if text != self.original[p]]
+
+    def diff(self, context=1):
+        """Unified diff of every staged change, for dry runs."""
+        out = []
+        for path in sorted(self.changed):
+            before = (self.original[path] or "").splitlines(keepends=True)
+            after = self.staged[path][0].splitlines(keepends=True)
+            name = os.path.basename(path)
+            out.extend(difflib.unified_diff(before, after, f"a/{name}", f"b/{name}", n=context))
+        return "".join(line if line.endswith("\n") else line + "\n" for line in out)
+
+    # ── Commit ──────────────────────────────────────────────────────────
+
+    def commit(self):
+        """Write every changed file once, atomically. Returns the written paths."""
+        paths = sorted(self.changed)
+        if not paths:
+            self.staged.clear()
+            return []
+
+        tmps = []
+        try:
+            for path in paths:
+                tmps.append(path + TMP_SUFFIX)
+                _write_synced(tmps[-1], self.staged[path][0])
+        except BaseException:
+            for tmp in tmps:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            raise
+
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        _write_synced(self.journal_path, json.dumps({"files": paths}))
+
+        for path in paths:
+            os.replace(path + TMP_SUFFIX, path)
+        record_weeks((path, self.staged[path][1]) for path in paths)
+        os.remove(self.journal_path)
+
+        for path in paths:
+            self.original[path] = self.staged[path][0]
+        self.staged.clear()
+        return paths
+
+    def discard(self):
+        self.staged.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Week file transaction tools.")
+    parser.add_argument("--recover", action="store_true",
+                        help="Roll forward a commit that was interrupted.")
+    args = parser.parse_args()
+
+    if args.recover:
+        rolled = recover()
+        if rolled:
+            print(f"Recovered {len(rolled)} file(s):")
+            for path in rolled:
+                print(f"  {os.path.basename(path)}")
+        else:
+            print("Nothing to recover.")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
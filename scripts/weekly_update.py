@@ -8,8 +8,33 @@ Runs all steps of the weekly update in sequence:
   4. Rebuild database (db.json)
   5. Build & publish website to GitHub Pages
 
+Each step starts with a quick integrity check of the raw files (check_data.py).
+Only errors missing from check_data_baseline.json stop the update, and the
+Players.txt / Decklist.txt checks wait until the new week is verified.
+Before publishing, every week's standings are re-derived from its rounds
+(audit_standings.py); differences missing from audit_baseline.json stop it too.
+A scraped week with no standings stops the update at the verify step.
+
+The scrape, verify and rebuild run in this process through aetherhub.scrape,
+verify_data.verify and convert_data.rebuild, which share one loaded corpus and
+one copy of the Players.txt / Decklist.txt lists; only the website build and
+git run as separate processes.
+
+Verify, the database rebuild and the website build declare their input and
+output files (stages.py). A stage whose inputs and outputs hash the same as
+when it last completed is skipped, so re-running after e.g. a failed push
+goes straight to publishing.
+
+The run itself (TO, tournament, week, non-payer count and completed stages)
+is saved as it goes, so an update that crashed, lost the network or was
+interrupted can be continued with --resume without scraping or pulling again.
+The week is chosen after the pull, and a week file the run didn't scrape
+itself stops the update rather than being overwritten.
+
 Usage:
     python weekly_update.py
+    python weekly_update.py --resume   # continue an interrupted update
+    python weekly_update.py --force    # run every stage, even if unchanged
 """
 
 import os
@@ -18,14 +43,23 @@ import subprocess
 import re
 import glob
 import json
-import math
+import argparse
+
+import payouts
+import aetherhub
+import check_data
+import audit_standings
+import convert_data
+import verify_data
+from corpus_cache import load_corpus
+from stages import Stage, StageCache
+from week_tx import WeekTransaction
 
 # ── Paths ──────────────────────────────────────────────────────────────────
 SCRIPT_DIR   = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 WEBAPP_DIR   = os.path.join(PROJECT_ROOT, "webapp")
 RAW_DIR      = os.path.join(PROJECT_ROOT, "webapp", "public", "data", "raw")
-PYTHON       = sys.executable  # same interpreter that launched this script
 
 # ── ANSI colours ───────────────────────────────────────────────────────────
 os.system("")  # enable ANSI escape processing on Windows
@@ -44,6 +78,33 @@ C = {
 
 TOTAL_STEPS = 5
 
+# ── Stages (paths relative to the project root) ────────────────────────────
+REFERENCE_FILES = ["scripts/Players.txt", "scripts/Decklist.txt", "scripts/Aliases.json"]
+# Stages list every scripts/ module they import, directly or not, so a code change re-runs them
+VERIFY_MODULES = ["scripts/verify_data.py", "scripts/corpus_cache.py", "scripts/deck_timeline.py",
+                  "scripts/name_index.py", "scripts/week_tx.py"]
+
+CONVERT_STAGE = Stage(
+    "convert",
+    inputs=["webapp/public/data/raw", "scripts/convert_data.py", "scripts/corpus_cache.py",
+            "scripts/ratings.py", "scripts/win_rates.py", "scripts/analytics.py", "scripts/models.py"],
+    outputs=["webapp/public/data/db.json", "webapp/public/data/ratings.json",
+             "webapp/public/data/stats.json"],
+)
+BUILD_STAGE = Stage(
+    "build",
+    inputs=["webapp/src", "webapp/public", "webapp/index.html", "webapp/package.json",
+            "webapp/package-lock.json", "webapp/vite.config.js", "webapp/tailwind.config.js",
+            "webapp/postcss.config.js"],
+    outputs=["docs"],
+)
+
+
+def verify_stage(week_file):
+    """Verify edits the week file and reference lists in place, so they are both in and out."""
+    files = [os.path.relpath(week_file, PROJECT_ROOT)] + REFERENCE_FILES
+    return Stage("verify", inputs=files + VERIFY_MODULES, outputs=files)
+
 
 # ── UI helpers ─────────────────────────────────────────────────────────────
 
@@ -105,12 +166,116 @@ def require(success, label):
         blank()
         if not ask_yn("Something went wrong. Continue anyway?", default="n"):
             blank()
-            pf("err", "  Update aborted. Fix the issue above and try again.")
+            pf("err", "  Update aborted. Fix the issue above, then run with --resume.")
             blank()
             sys.exit(1)
         pf("warn", "  Continuing despite error...")
 
 
+# ── Shared data ────────────────────────────────────────────────────────────
+# Loaded once and handed to every in-process step. A step that rewrites raw
+# files or reference lists calls forget() so the next one reloads them.
+
+_shared = {}
+
+
+def shared_corpus():
+    if "corpus" not in _shared:
+        _shared["corpus"] = load_corpus(RAW_DIR)
+    return _shared["corpus"]
+
+
+def shared_references():
+    """(players, decks) as sets."""
+    if "references" not in _shared:
+        _shared["references"] = (check_data.load_reference(check_data.PLAYERS_FILE),
+                                 check_data.load_reference(check_data.DECKLIST_FILE))
+    return _shared["references"]
+
+
+def forget(*keys):
+    for key in keys:
+        _shared.pop(key, None)
+
+
+# ── Data check ─────────────────────────────────────────────────────────────
+
+# Known errors (check_data_baseline.json) plus any the user chose to continue past
+_accepted_errors = check_data.load_baseline()
+
+
+def data_check(references):
+    """
+    Run check_data over the corpus before a step. Errors that aren't in the
+    baseline and are new in this run are listed and go through require(), so
+    the update can stop there. *references*=False skips Players.txt /
+    Decklist.txt, which only hold the new week's names once it is verified.
+    """
+    players, decks = shared_references() if references else (None, None)
+    report = check_data.check(shared_corpus(), references=references, players=players, decks=decks)
+    new = [e for e in report["errors"] if check_data.issue_key(e) not in _accepted_errors]
+    if not new:
+        pf("muted", f"  Data check: {report['weeks']} weeks OK ({report['elapsed_ms']:.0f} ms)")
+        blank()
+        return
+
+    pf("warn", f"  Data check found {len(new)} problem(s):")
+    for e in new[:15]:
+        pf("warn", f"    week-{e['week']:<4} {e['check']:<12} {e['message']}")
+    if len(new) > 15:
+        pf("muted", f"    … and {len(new) - 15} more (run: python scripts/check_data.py)")
+    require(False, "Data check")
+    _accepted_errors.update(check_data.issue_key(e) for e in new)
+    blank()
+
+
+# Known differences (audit_baseline.json) plus any the user chose to continue past
+_accepted_differences = audit_standings.load_baseline()
+
+
+def audit_check():
+    """
+    Re-derive every week's standings from its rounds before publishing.
+    Players/results differences that aren't in the baseline go through require().
+    """
+    report = audit_standings.audit(shared_corpus())
+    new = audit_standings.new_errors(report, _accepted_differences)
+    if not new:
+        pf("muted", f"  Standings audit: {report['weeks']} weeks OK ({report['elapsed_ms']:.0f} ms)")
+        blank()
+        return
+
+    pf("warn", f"  Standings audit found {len(new)} difference(s) from the rounds:")
+    for week, d in new[:15]:
+        pf("warn", f"    week-{week:<4} {d['name']:<26} {d['field']:<7} stored {d['stored']!s:<10} "
+                   f"computed {d['computed']}")
+    if len(new) > 15:
+        pf("muted", f"    … and {len(new) - 15} more (run: python scripts/audit_standings.py)")
+    require(False, "Standings audit")
+    _accepted_differences.update(audit_standings.difference_key(week, d) for week, d in new)
+    blank()
+
+
+# ── Stage cache ────────────────────────────────────────────────────────────
+
+_stage_cache = StageCache()
+
+
+def skip_if_fresh(stage, label):
+    """True (after saying so) if *stage* already ran on exactly the current inputs."""
+    if not _stage_cache.is_fresh(stage):
+        return False
+    pf("ok", f"  ✓  {label} — inputs unchanged since the last run, skipped.")
+    return True
+
+
+def finish_stage(stage, success, label):
+    """require() the result; a successful stage is recorded so an unchanged re-run skips it."""
+    require(success, label)
+    if success:
+        _stage_cache.record(stage)
+
+
 # ── Week number helpers ────────────────────────────────────────────────────
 
 def scan_week_numbers():
@@ -126,18 +291,60 @@ def scan_week_numbers():
 
 # ── Main ───────────────────────────────────────────────────────────────────
 
-def main():
-    current_week = scan_week_numbers()
-    next_week    = current_week + 1
+TO_OPTIONS = {
+    "1": ("Anders",  "Fydun"),
+    "2": ("Tormod",  "BlindFlip"),
+    "3": ("Viktor",  "Anonym_from_north"),
+}
 
-    # ── Banner ────────────────────────────────────────────────────────────
+
+def banner():
     title = "  Oslo Legacy League — Weekly Update  "
     blank()
     pf("banner", f"  ╔{'═' * len(title)}╗")
     pf("banner", f"  ║{title}║")
     pf("banner", f"  ╚{'═' * len(title)}╝")
     blank()
-    pf("info",  f"  Last recorded week: {current_week}   →   Will scrape: Week {next_week}")
+
+
+def already_done(step, label):
+    """True (after saying so) if *step* completed earlier in the run being resumed."""
+    if not _stage_cache.done(step):
+        return False
+    pf("ok", f"  ✓  {label} — already done in this run, skipped.")
+    return True
+
+
+def run_week_label(run):
+    return f"week {run['week']}" if run.get("week") else "the next week"
+
+
+def choose_run(resume):
+    """
+    Resume the interrupted run (with --resume, or if the user says so) or start
+    a new one. A new run's week is chosen after the pull (choose_week).
+    Returns the run dict.
+    """
+    previous = _stage_cache.run
+    if previous and not resume:
+        done = ", ".join(previous["completed"]) or "nothing yet"
+        pf("warn", f"  The update for {run_week_label(previous)} didn't finish (done: {done}).")
+        resume = ask_yn("Resume it?")
+        blank()
+    elif resume and not previous:
+        pf("warn", "  There is no unfinished update to resume — starting a new one.")
+        blank()
+        resume = False
+
+    if resume:
+        done = ", ".join(previous["completed"]) or "nothing yet"
+        pf("info", f"  Resuming {run_week_label(previous)}   (TO: {previous.get('to_name', '?')}, done: {done})")
+        blank()
+        return previous
+
+    current_week = scan_week_numbers()
+    next_week    = current_week + 1
+    pf("info",  f"  Last recorded week: {current_week}   →   Will scrape: Week {next_week}  (checked again after the pull)")
     blank()
     pf("muted", "  This script will:")
     pf("muted", "    1.  Pull the latest data from GitHub")
@@ -151,127 +358,172 @@ def main():
         pf("muted", "  No changes made. Goodbye.")
         blank()
         sys.exit(0)
+    _stage_cache.start_run(week=None)
+    return _stage_cache.run
+
+
+def choose_week(state):
+    """
+    The run's week: recorded the first time this is called, after the pull, so
+    a week another organiser pushed in the meantime counts as already recorded.
+    """
+    if state.get("week") is None:
+        week = scan_week_numbers() + 1
+        _stage_cache.update_run(week=week)
+        pf("info", f"  Last recorded week after the pull: {week - 1}   →   Scraping week {week}")
+        blank()
+    return state["week"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the weekly tournament update.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted update from its first unfinished stage.")
+    parser.add_argument("--force", action="store_true",
+                        help="Run every stage, even those whose inputs haven't changed.")
+    args = parser.parse_args()
+    if args.force:
+        _stage_cache.forget()
+
+    banner()
+    state = choose_run(args.resume)
 
     # ── Step 1: git pull ──────────────────────────────────────────────────
     step_header(1, "Pull latest from GitHub")
-    pf("muted", "  Downloading any changes made since your last update...\n")
-    ok = run(["git", "pull"], cwd=PROJECT_ROOT)
-    require(ok, "git pull")
+    data_check(references=False)
+    if not already_done("pull", "git pull"):
+        pf("muted", "  Downloading any changes made since your last update...\n")
+        ok = run(["git", "pull"], cwd=PROJECT_ROOT)
+        require(ok, "git pull")
+        if ok:
+            _stage_cache.complete("pull")
 
     # ── Step 2: Scrape ────────────────────────────────────────────────────
     step_header(2, "Scrape Tournament")
+    data_check(references=False)
+    week = choose_week(state)
+    week_file = os.path.join(RAW_DIR, f"week-{week}.json")
+
+    if _stage_cache.done("scrape") and not os.path.exists(week_file):
+        pf("warn", f"  {os.path.basename(week_file)} is gone — scraping it again.")
+        state["completed"].remove("scrape")
+
+    if not already_done("scrape", "Scrape"):
+        # 2a — Who ran the tournament?
+        if "target" in state:
+            to_name, aetherhub_target = state["to_name"], state["target"]
+            pf("ok", f"  ✓  TO: {to_name}")
+        else:
+            pf("muted", "  Who was the Tournament Organizer this week?\n")
+            for key, (name, user) in TO_OPTIONS.items():
+                pf("muted", f"    {key}.  {name:<10}  (aetherhub.com/User/{user})")
+            pf("muted", f"    4.  Someone else / enter manually")
+            blank()
 
-    # 2a — Who ran the tournament?
-    TO_OPTIONS = {
-        "1": ("Anders",  "Fydun"),
-        "2": ("Tormod",  "BlindFlip"),
-        "3": ("Viktor",  "Anonym_from_north"),
-    }
-
-    pf("muted", "  Who was the Tournament Organizer this week?\n")
-    for key, (name, user) in TO_OPTIONS.items():
-        pf("muted", f"    {key}.  {name:<10}  (aetherhub.com/User/{user})")
-    pf("muted", f"    4.  Someone else / enter manually")
-    blank()
-
-    to_choice = ask_input("Pick a number", default="1")
+            to_choice = ask_input("Pick a number", default="1")
 
-    if to_choice in TO_OPTIONS:
-        to_name, aetherhub_target = TO_OPTIONS[to_choice]
-        pf("ok", f"  ✓  TO: {to_name}")
-    else:
-        blank()
-        pf("muted", "  Enter an AetherHub username, tournament ID, or full URL:")
-        aetherhub_target = ask_input("Target", default="")
-        if not aetherhub_target:
-            pf("err", "  No target provided — cannot scrape.")
+            if to_choice in TO_OPTIONS:
+                to_name, aetherhub_target = TO_OPTIONS[to_choice]
+                pf("ok", f"  ✓  TO: {to_name}")
+            else:
+                blank()
+                pf("muted", "  Enter an AetherHub username, tournament ID, or full URL:")
+                aetherhub_target = ask_input("Target", default="")
+                if not aetherhub_target:
+                    pf("err", "  No target provided — cannot scrape.")
+                    sys.exit(1)
+                to_name = aetherhub_target
+            _stage_cache.update_run(to_name=to_name, target=aetherhub_target)
+
+        # 2b — Scrape (no prize pool yet), into the week chosen for this run.
+        # aetherhub.scrape overwrites, so a file this run didn't scrape stops it.
+        if os.path.exists(week_file):
+            blank()
+            pf("err", f"  ✗  {os.path.basename(week_file)} already exists, but this run didn't scrape it")
+            pf("err", "     (it came with the pull, or an earlier scrape was interrupted).")
+            pf("err", "  Update aborted. Check the file; delete it to scrape it again, or")
+            pf("err", "  run `python scripts/stages.py --clear` to start a new update.")
+            blank()
             sys.exit(1)
-        to_name = aetherhub_target
-
-    # 2b — Scrape (no prize pool yet)
-    blank()
-    pf("muted", f"  Scraping latest tournament from '{to_name}' (week {next_week})...\n")
-
-    ok = run(
-        [PYTHON, os.path.join(SCRIPT_DIR, "aetherhub.py"), aetherhub_target],
-        cwd=PROJECT_ROOT,
-    )
-    require(ok, "Scrape")
-
-    # re-detect in case week number shifted (e.g. file already existed)
-    scraped_week = scan_week_numbers()
+        blank()
+        pf("muted", f"  Scraping latest tournament from '{to_name}' (week {week})...\n")
+
+        try:
+            scraped = aetherhub.scrape(aetherhub_target, week)
+        except ValueError as e:
+            pf("err", f"  {e}")
+            scraped = None
+        forget("corpus")
+        require(scraped is not None, "Scrape")
+        if scraped:
+            _stage_cache.update_run(tournament_id=scraped["tournament_id"])
+            _stage_cache.complete("scrape")
 
-    # 2c — Calculate prize pool from scraped data
-    week_file = os.path.join(RAW_DIR, f"week-{scraped_week}.json")
     with open(week_file, "r", encoding="utf-8") as f:
         week_data = json.load(f)
 
-    player_count = week_data["metadata"]["players"]
-    default_non_payers = "1" if player_count >= 9 else "0"
+    # 2c — Calculate prize pool from scraped data
+    if not already_done("prize_pool", "Prize pool"):
+        player_count = week_data["metadata"]["players"]
+        default_non_payers = "1" if player_count >= 9 else "0"
 
-    blank()
-    pf("muted", f"  {player_count} players detected in this tournament.")
-    pf("muted", "  How many people are NOT paying into the prize pool?")
-    pf("muted", f"  (Default: {default_non_payers})")
-    pf("muted", "  Use 0 if the TO also paid, or 2 if two people didn't pay.\n")
-    to_val = ask_input("Non-paying players", default=default_non_payers)
-    try:
-        to_val = int(to_val)
-    except ValueError:
-        pf("warn", f"  Couldn't read that — defaulting to {default_non_payers}.")
-        to_val = int(default_non_payers)
-
-    # Apply prize pool and payouts
-    week_num = week_data["week_number"]
-    entry_fee = 110 if week_num >= 104 else 105
-    pool_players = max(0, player_count - to_val)
-    prize_pool = entry_fee * pool_players
-
-    standings = week_data["standings"]
-    total_shares = 0
-    eligible = []
-    total_rounds = week_data["metadata"].get("rounds", 4)
-    for i, s in enumerate(standings):
-        shares = 0
-        if s["wins"] == total_rounds:
-            shares = 4
-        elif s["wins"] == total_rounds - 1:
-            if s.get("draws", 0) > 0:
-                shares = 3
-            elif s.get("losses", 0) > 0:
-                shares = 2
-        total_shares += shares
-        eligible.append((i, shares))
-
-    per_share = prize_pool / total_shares if total_shares > 0 else 0
-    for i, shares in eligible:
-        standings[i]["payout"] = math.floor(shares * per_share) if shares > 0 else 0
-
-    week_data["metadata"]["prize_pool"] = prize_pool
-    week_data["metadata"]["to_playing"] = to_val
-
-    with open(week_file, "w", encoding="utf-8") as f:
-        json.dump(week_data, f, indent=2)
-
-    pf("ok", f"  ✓  Prize pool: {prize_pool} kr  ({pool_players} paying × {entry_fee} kr)")
+        blank()
+        pf("muted", f"  {player_count} players detected in this tournament.")
+        pf("muted", "  How many people are NOT paying into the prize pool?")
+        pf("muted", f"  (Default: {default_non_payers})")
+        pf("muted", "  Use 0 if the TO also paid, or 2 if two people didn't pay.\n")
+        to_val = ask_input("Non-paying players", default=default_non_payers)
+        try:
+            to_val = int(to_val)
+        except ValueError:
+            pf("warn", f"  Couldn't read that — defaulting to {default_non_payers}.")
+            to_val = int(default_non_payers)
+
+        # Apply prize pool and payouts
+        week_num = week_data["week_number"]
+        pool_players = max(0, player_count - to_val)
+        prize_pool = payouts.prize_pool(week_num, pool_players)
+
+        standings = week_data["standings"]
+        for entry, payout in zip(standings, payouts.week_payouts(week_data, prize_pool, week_num)):
+            entry["payout"] = payout
+
+        week_data["metadata"]["prize_pool"] = prize_pool
+        week_data["metadata"]["to_playing"] = to_val
+
+        # Same encoding aetherhub.py wrote the file with
+        with WeekTransaction() as tx:
+            tx.stage(week_file, week_data, ensure_ascii=True)
+        forget("corpus")
+
+        _stage_cache.update_run(non_payers=to_val)
+        _stage_cache.complete("prize_pool")
+        pf("ok", f"  ✓  Prize pool: {prize_pool} kr  ({pool_players} paying × {payouts.entry_fee(week_num)} kr)")
 
     # ── Step 3: Verify ────────────────────────────────────────────────────
     step_header(3, "Verify Player Names & Decks")
-    pf("muted", "  The tool below will walk you through confirming each player's name")
-    pf("muted", "  and assigning their deck. Follow the on-screen prompts.\n")
-
-    while True:
-        result = subprocess.run(
-            [PYTHON, os.path.join(SCRIPT_DIR, "verify_data.py")],
-            cwd=PROJECT_ROOT,
-        )
-
-        if result.returncode == 0:
+    data_check(references=False)
+    stage = verify_stage(week_file)
+    verified = already_done("verify", "Verify") or skip_if_fresh(stage, "Verify")
+    if not verified:
+        pf("muted", "  The tool below will walk you through confirming each player's name")
+        pf("muted", "  and assigning their deck. Follow the on-screen prompts.\n")
+        session = verify_data.VerifySession()
+
+    while not verified:
+        try:
+            result = verify_data.verify(week_file, session)
+        except Exception as e:
+            pf("err", f"  {type(e).__name__}: {e}")
+            result = {"status": "failed"}
+
+        if result["status"] in ("saved", "unchanged"):
             # Saved successfully (or no changes needed)
-            blank()
-            pf("ok", "  ✓  Verify — done.")
-            break
-        elif result.returncode == 2:
+            forget("corpus")
+            _shared["references"] = (set(session.all_names), set(session.all_decks))
+            finish_stage(stage, True, "Verify")
+            verified = True
+        elif result["status"] == "discarded":
             # User chose not to save
             blank()
             pf("warn", "  Changes were discarded.")
@@ -283,60 +535,92 @@ def main():
             choice = ask_input("Pick a number", default="1")
             if choice == "2":
                 blank()
-                pf("err", "  Update aborted.")
+                pf("err", "  Update aborted. Run with --resume to pick up from here.")
                 blank()
                 sys.exit(1)
             # otherwise loop back and re-run verify
             blank()
             pf("muted", "  Re-running verify...\n")
+        elif result["status"] == "error":
+            # Nothing to verify: the scraped file has no standings
+            blank()
+            pf("err", f"  ✗  Verify — {os.path.basename(week_file)} has no standings.")
+            pf("err", "  Update aborted. Re-scrape the tournament, then run with --resume.")
+            blank()
+            sys.exit(1)
         else:
             # Some other error
             require(False, "Verify")
             break
+    if verified:
+        _stage_cache.complete("verify")
 
     # ── Step 4: Rebuild DB ────────────────────────────────────────────────
+    # Rebuild and build are skipped by content hash alone, so a resumed run
+    # still redoes them if anything changed since they completed.
     step_header(4, "Rebuild Database")
-    pf("muted", "  Aggregating all tournament data into db.json...\n")
-
-    ok = run(
-        [PYTHON, os.path.join(SCRIPT_DIR, "convert_data.py")],
-        cwd=PROJECT_ROOT,
-    )
-    require(ok, "Rebuild database")
+    data_check(references=verified)
+    if not skip_if_fresh(CONVERT_STAGE, "Rebuild database"):
+        pf("muted", "  Aggregating all tournament data into db.json...\n")
+        try:
+            rebuilt = convert_data.rebuild(corpus=shared_corpus())
+            pf("muted", f"  {rebuilt['tournaments']} tournaments in {len(rebuilt['leagues'])} leagues.")
+        except Exception as e:
+            pf("err", f"  {type(e).__name__}: {e}")
+            rebuilt = None
+        forget("corpus")  # build_db fills in defaults on the corpus entries
+        finish_stage(CONVERT_STAGE, rebuilt is not None, "Rebuild database")
 
     # ── Step 5: Build & Publish ───────────────────────────────────────────
     step_header(5, "Build & Publish Website")
+    data_check(references=verified)
+    audit_check()
 
     # 5a — npm build
-    pf("muted", "  Compiling the website...\n")
-    ok = run("npm run build", cwd=WEBAPP_DIR, shell=True)
-    require(ok, "Website build")
+    if not skip_if_fresh(BUILD_STAGE, "Website build"):
+        pf("muted", "  Compiling the website...\n")
+        ok = run("npm run build", cwd=WEBAPP_DIR, shell=True)
+        finish_stage(BUILD_STAGE, ok, "Website build")
 
     # 5b — commit message
-    blank()
-    default_msg = f"Week {scraped_week} results"
-    commit_msg  = ask_input("Commit message", default=default_msg)
-    blank()
+    if not already_done("commit", "Commit"):
+        blank()
+        default_msg = f"Week {week} results"
+        commit_msg  = ask_input("Commit message", default=default_msg)
+        blank()
 
-    # 5c — git add + commit + push
-    pf("muted", "  Staging all changed files...")
-    run(["git", "add", "."], cwd=PROJECT_ROOT)
+        # 5c — git add + commit
+        pf("muted", "  Staging all changed files...")
+        ok = run(["git", "add", "."], cwd=PROJECT_ROOT)
 
-    pf("muted", f"  Committing: \"{commit_msg}\"...")
-    run(["git", "commit", "-m", commit_msg], cwd=PROJECT_ROOT)
+        if ok:
+            pf("muted", f"  Committing: \"{commit_msg}\"...")
+            ok = run(["git", "commit", "-m", commit_msg], cwd=PROJECT_ROOT)
+        require(ok, "git commit")
+        if ok:
+            _stage_cache.complete("commit")
 
+    # 5d — push
     pf("muted", "  Pushing to GitHub...")
     ok = run(["git", "push"], cwd=PROJECT_ROOT)
     require(ok, "Publish")
+    if ok:
+        _stage_cache.end_run()
 
     # ── Done ─────────────────────────────────────────────────────────────
     blank()
     rule("═", style="ok")
-    pf("ok", f"  ✓  Week {scraped_week} published successfully!")
+    pf("ok", f"  ✓  Week {week} published successfully!")
     pf("muted", "     The website will refresh on GitHub Pages within 1–2 minutes.")
     rule("═", style="ok")
     blank()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except KeyboardInterrupt:
+        blank()
+        pf("warn", "  Interrupted. Run  python weekly_update.py --resume  to continue.")
+        blank()
+        sys.exit(130)
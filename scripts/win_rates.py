@@ -0,0 +1,216 @@
+"""
+win_rates.py – Win rates with confidence intervals and shrinkage, precomputed.
+
+Raw win rates of decks and players with a handful of matches are mostly noise.
+For every deck, every player and every deck-vs-deck matchup, per league and
+all-time, this module computes from the match rows of analytics.py:
+
+    win_rate   (wins + ½ draws) / matches, byes excluded
+    ci_low/ci_high  the 95 % Wilson score interval
+    shrunk     an empirical-Bayes estimate: the raw rate pulled toward the
+               scope's average by a beta prior whose strength is fitted (method
+               of moments) to how much the rates really spread
+
+All of it is computed in a few grouped, vectorised passes and written to
+`stats.json` next to db.json (convert_data.py does this whenever it writes
+db.json), so the web app can rank decks by `shrunk` instead of applying
+minimum-match cutoffs to raw ratios.
+
+Usage:
+    from win_rates import compute_stats, records
+    stats = compute_stats(LeagueFrames.from_corpus(load_models()))
+    records(stats, "spring-2026", "decks")
+
+    python win_rates.py                       # write stats.json, print all-time decks
+    python win_rates.py --league spring-2026 --kind players
+"""
+
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from corpus_cache import RAW_DIR
+from models import load_models
+
+# ── Paths ───────────────────────────────────────────────────────────────────
+STATS_PATH = os.path.join(os.path.dirname(RAW_DIR), "stats.json")
+
+ALL_TIME = "all-time"
+Z = 1.959964            # 95 % two-sided
+MAX_PRIOR_MATCHES = 100  # cap on the prior's weight when the rates barely spread
+
+KINDS = {
+    "decks": ["deck"],
+    "players": ["player"],
+    "matchups": ["deck", "opp_deck"],
+}
+
+
+# ── Estimators ──────────────────────────────────────────────────────────────
+
+def wilson_interval(score, n, z=Z):
+    """Vectorised Wilson score interval for *score* successes out of *n*."""
+    n = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(n > 0, score / n, 0.0)
+        denom = 1 + z * z / n
+        centre = (p + z * z / (2 * n)) / denom
+        half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return np.where(n > 0, centre - half, 0.0), np.where(n > 0, centre + half, 1.0)
+
+
+def beta_prior(score, n):
+    """
+    Fit a beta prior (mean, strength in matches) to one scope's groups by the
+    method of moments: the spread of the observed rates minus the spread that
+    binomial noise alone would produce.
+    """
+    total = n.sum()
+    if total == 0:
+        return 0.5, 0.0
+    mean = score.sum() / total
+    noise = mean * (1 - mean)
+    observed = (n * (score / n - mean) ** 2).sum() / total
+    true_var = observed - noise * len(n) / total
+    if true_var <= 0 or noise == 0:
+        return mean, float(MAX_PRIOR_MATCHES)
+    return mean, float(np.clip(noise / true_var - 1, 0, MAX_PRIOR_MATCHES))
+
+
+# ── Aggregation ─────────────────────────────────────────────────────────────
+
+def _match_rows(frames):
+    """Match sides with known decks on both sides marked, draws as half a win."""
+    m = frames.matches
+    deck = m["deck"].astype(str).str.strip()
+    opp_deck = m["opp_deck"].astype(str).str.strip()
+    return pd.DataFrame({
+        "league": m["league"].astype(str),
+        "player": m["player"].astype(str),
+        "deck": deck,
+        "opp_deck": opp_deck,
+        "win": m["win"].to_numpy(np.int64),
+        "loss": m["loss"].to_numpy(np.int64),
+        "draw": m["draw"].to_numpy(np.int64),
+        "score": m["win"].to_numpy(np.float64) + 0.5 * m["draw"].to_numpy(np.float64),
+        "deck_known": ~deck.str.lower().isin(["", "unknown"]),
+        "opp_known": ~opp_deck.str.lower().isin(["", "unknown"]),
+    })
+
+
+def _grouped(rows, keys):
+    """Per-league and all-time totals for *keys*, in one frame with a `scope` column."""
+    sums = dict(matches=("win", "size"), wins=("win", "sum"), losses=("loss", "sum"),
+                draws=("draw", "sum"), score=("score", "sum"))
+    per_league = rows.groupby(["league"] + keys, sort=False).agg(**sums).reset_index()
+    all_time = rows.groupby(keys, sort=False).agg(**sums).reset_index()
+    all_time.insert(0, "league", ALL_TIME)
+    return pd.concat([per_league, all_time], ignore_index=True).rename(columns={"league": "scope"})
+
+
+def _estimate(table):
+    """Add win_rate, Wilson bounds and the shrunk rate (prior fitted per scope)."""
+    score = table["score"].to_numpy()
+    n = table["matches"].to_numpy(np.float64)
+    table["win_rate"] = score / n
+    table["ci_low"], table["ci_high"] = wilson_interval(score, n)
+
+    priors = {}
+    codes, scopes = pd.factorize(table["scope"])
+    prior_mean = np.empty(len(table))
+    prior_n = np.empty(len(table))
+    for code, scope in enumerate(scopes):
+        mask = codes == code
+        mean, strength = beta_prior(score[mask], n[mask])
+        prior_mean[mask], prior_n[mask] = mean, strength
+        priors[scope] = {"mean": round(mean, 4), "strength": round(strength, 1)}
+    table["shrunk"] = (score + prior_n * prior_mean) / (n + prior_n)
+    return table.drop(columns="score"), priors
+
+
+def compute_stats(frames):
+    """
+    Return the stats.json structure: {"confidence", "columns": {kind: [names]},
+    "scopes": {scope: {kind: [row, ...]}}, "priors": {kind: {scope: {"mean", "strength"}}}}.
+    Rows are lists in `columns` order, best shrunk rate first.
+    """
+    rows = _match_rows(frames)
+    scopes, priors, columns = {}, {}, {}
+    for kind, keys in KINDS.items():
+        subset = rows
+        if "deck" in keys:
+            subset = subset[subset["deck_known"]]
+        if kind == "matchups":
+            subset = subset[subset["opp_known"] & (subset["deck"] != subset["opp_deck"])]
+        subset = subset[subset[keys[0]] != ""]
+
+        table, priors[kind] = _estimate(_grouped(subset, keys))
+        table = table.sort_values(["scope", "shrunk", "matches"], ascending=[True, False, False])
+        for col in ("win_rate", "ci_low", "ci_high", "shrunk"):
+            table[col] = table[col].round(4)
+        if kind == "matchups":
+            table = table.rename(columns={"opp_deck": "opponent"})
+        columns[kind] = [c for c in table.columns if c != "scope"]
+        for scope, group in table.groupby("scope", sort=False):
+            scopes.setdefault(scope, {})[kind] = group.drop(columns="scope").to_numpy().tolist()
+    return {"confidence": 0.95, "columns": columns, "scopes": scopes, "priors": priors}
+
+
+def records(stats, scope, kind):
+    """Rows of one scope and kind as dicts (stats.json stores them as column lists)."""
+    cols = stats["columns"][kind]
+    return [dict(zip(cols, row)) for row in stats["scopes"].get(scope, {}).get(kind, [])]
+
+
+def write_stats(stats, path=STATS_PATH):
+    """Write stats.json atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as out:
+        json.dump(stats, out, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def update(path=STATS_PATH, raw_dir=RAW_DIR, corpus=None):
+    """Recompute the statistics from the raw files (or a loaded *corpus*) and rewrite stats.json."""
+    # Imported here: analytics imports convert_data, which calls update()
+    from analytics import LeagueFrames
+    if corpus is None:
+        corpus = load_models(raw_dir)
+    stats = compute_stats(LeagueFrames.from_corpus(corpus))
+    write_stats(stats, path)
+    return stats
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Write stats.json and print win rates with intervals.")
+    parser.add_argument("--league", default=ALL_TIME, help="Scope to print (league id or all-time).")
+    parser.add_argument("--kind", choices=sorted(KINDS), default="decks")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    stats = update()
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    rows = records(stats, args.league, args.kind)
+    prior = stats["priors"][args.kind].get(args.league)
+    print(f"Wrote {os.path.relpath(STATS_PATH)} in {elapsed:.0f} ms\n")
+    if not rows:
+        print(f"No {args.kind} for '{args.league}'.")
+        return
+    print(f"{args.kind.capitalize()} — {args.league} — prior {prior['mean']:.1%} "
+          f"worth {prior['strength']:.0f} matches\n")
+    for r in rows[:args.top]:
+        label = f"{r['deck']} vs {r['opponent']}" if args.kind == "matchups" else r[KINDS[args.kind][0]]
+        print(f"  {label:<44} {r['matches']:>4}  raw {r['win_rate']:6.1%}  "
+              f"[{r['ci_low']:6.1%} – {r['ci_high']:6.1%}]  shrunk {r['shrunk']:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
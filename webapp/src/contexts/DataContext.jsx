@@ -4,6 +4,7 @@ const DataContext = createContext(null);
 
 export function DataProvider({ children }) {
   const [data, setData] = useState(null);
+  const [stats, setStats] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -30,15 +31,32 @@ export function DataProvider({ children }) {
         setError(err.message);
         setLoading(false);
       });
+
+    // Precomputed win rates (scripts/win_rates.py). Optional: pages fall back
+    // to deriving raw rates from db.json when it's missing.
+    fetch(`${baseUrl}data/stats.json`)
+      .then((res) => (res.ok ? res.json() : null))
+      .then((s) => setStats(s))
+      .catch((err) => console.warn("Stats Load Error:", err));
   }, []);
 
   return (
-    <DataContext.Provider value={{ data, loading, error }}>
+    <DataContext.Provider value={{ data, stats, loading, error }}>
       {children}
     </DataContext.Provider>
   );
 }
 
+// Rows of one stats.json scope ("all-time" or a league id) and kind
+// ("decks" | "players" | "matchups") as objects.
+export function statRows(stats, scope, kind) {
+  if (!stats || !stats.scopes[scope] || !stats.scopes[scope][kind]) return [];
+  const cols = stats.columns[kind];
+  return stats.scopes[scope][kind].map((row) =>
+    Object.fromEntries(cols.map((c, i) => [c, row[i]])),
+  );
+}
+
 export function useData() {
   return useContext(DataContext);
 }
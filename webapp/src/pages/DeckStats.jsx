@@ -1,6 +1,6 @@
 import { useState, useMemo } from "react";
 import { Link, useSearchParams } from "react-router-dom";
-import { useData } from "../contexts/DataContext";
+import { useData, statRows } from "../contexts/DataContext";
 import {
   PieChart,
   Pie,
@@ -51,7 +51,7 @@ const DARK_TOOLTIP = {
 };
 
 export default function DeckStats() {
-  const { data, loading, error } = useData();
+  const { data, stats, loading, error } = useData();
   const [searchParams, setSearchParams] = useSearchParams();
 
   const selectedDeck = searchParams.get("deck") || null;
@@ -297,7 +297,36 @@ export default function DeckStats() {
     return result;
   }, [deckList]);
 
+  // Precomputed deck win rates for the current filter, keyed by deck name
+  const deckRates = useMemo(() => {
+    const scope =
+      leagueFilter === "All"
+        ? "all-time"
+        : (availableLeagues.find((l) => l.name === leagueFilter) || {}).id;
+    const map = {};
+    statRows(stats, scope, "decks").forEach((r) => (map[r.deck] = r));
+    return map;
+  }, [stats, leagueFilter, availableLeagues]);
+  const hasRates = Object.keys(deckRates).length > 0;
+
   const winRateBarData = useMemo(() => {
+    if (hasRates) {
+      // Ranked by the shrunk rate, so thinly played decks can't top the chart
+      const listed = new Set(deckList.map((d) => d.name));
+      return Object.values(deckRates)
+        .filter((r) => listed.has(r.deck))
+        .sort((a, b) => b.shrunk - a.shrunk)
+        .slice(0, 15)
+        .map((r) => ({
+          name: r.deck.length > 18 ? r.deck.slice(0, 16) + "…" : r.deck,
+          fullName: r.deck,
+          winRate: parseFloat((r.shrunk * 100).toFixed(1)),
+          raw: (r.win_rate * 100).toFixed(1),
+          ciLow: (r.ci_low * 100).toFixed(0),
+          ciHigh: (r.ci_high * 100).toFixed(0),
+          matches: r.matches,
+        }));
+    }
     return [...deckList]
       .filter((d) => d.matches >= 8)
       .sort((a, b) => parseFloat(b.winRate) - parseFloat(a.winRate))
@@ -308,7 +337,7 @@ export default function DeckStats() {
         winRate: parseFloat(d.winRate),
         matches: d.matches,
       }));
-  }, [deckList]);
+  }, [deckList, deckRates, hasRates]);
 
   const popularityOverTimeData = useMemo(() => {
     if (!data || !data.tournaments) return [];
@@ -348,6 +377,16 @@ export default function DeckStats() {
   }, [deckList]);
 
   const winRateVsPopData = useMemo(() => {
+    if (hasRates) {
+      return deckList
+        .filter((d) => deckRates[d.name])
+        .map((d) => ({
+          name: d.name,
+          x: d.count,
+          y: parseFloat((deckRates[d.name].shrunk * 100).toFixed(1)),
+          z: deckRates[d.name].matches,
+        }));
+    }
     return deckList
       .filter((d) => d.matches >= 4)
       .map((d) => ({
@@ -356,7 +395,7 @@ export default function DeckStats() {
         y: parseFloat(d.winRate),
         z: d.matches,
       }));
-  }, [deckList]);
+  }, [deckList, deckRates, hasRates]);
 
   // --- Chart data for deck detail ---
   const detailPerformanceOverTime = useMemo(() => {
@@ -893,7 +932,7 @@ export default function DeckStats() {
             <h3 className="text-sm font-semibold text-slate-200 mb-3">
               Win Rate by Deck
               <span className="text-xs text-slate-500 ml-2 font-normal">
-                (min 8 matches)
+                {hasRates ? "(adjusted for sample size)" : "(min 8 matches)"}
               </span>
             </h3>
             <ResponsiveContainer width="100%" height={320}>
@@ -916,7 +955,9 @@ export default function DeckStats() {
                 <Tooltip
                   {...DARK_TOOLTIP}
                   formatter={(v, name, props) => [
-                    `${v}% (${props.payload.matches} games)`,
+                    props.payload.raw !== undefined
+                      ? `${v}% (raw ${props.payload.raw}%, 95% CI ${props.payload.ciLow}–${props.payload.ciHigh}%, ${props.payload.matches} games)`
+                      : `${v}% (${props.payload.matches} games)`,
                     props.payload.fullName,
                   ]}
                 />